@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -9,15 +10,92 @@ class Settings(BaseSettings):
     request_timeout_seconds: int = 20
     request_delay_seconds: float = 1.0
     max_pages_per_run: int = 200
+    async_ingest_enabled: bool = True
+    fetch_concurrency: int = 16
+    host_burst: int = 1
+    http2_enabled: bool = True
+    extract_workers: int = max(1, (os.cpu_count() or 2) - 1)
+    pipeline_queue_size: int = 64
+    upsert_batch_size: int = 50
+    near_duplicate_enabled: bool = True
+    near_duplicate_max_distance: int = 3
+    version_keyframe_interval: int = 20
+    frontier_discovered_priority: int = 1
+    frontier_default_revisit_hours: float = 72
+    frontier_min_revisit_hours: float = 6
+    frontier_max_revisit_hours: float = 720
+    frontier_retry_base_minutes: float = 30
     use_playwright_render: bool = True
     render_service_url: str = "http://localhost:9000/render"
     render_timeout_seconds: int = 45
+    render_batch_size: int = 8
+    render_batch_concurrency: int = 2
+    render_host_concurrency: int = 2
+    render_wait_until: str = "domcontentloaded"
+    render_wait_for_selector: str | None = None
+    render_idle_ms: int = 500
+    render_idle_timeout_ms: int = 5000
+    render_block_resource_types: list[str] = ["image", "media", "font", "stylesheet"]
+    render_block_url_patterns: list[str] = [
+        "google-analytics.com",
+        "googletagmanager.com",
+        "doubleclick.net",
+        "mc.yandex.ru",
+        "hotjar.com",
+    ]
+    render_min_text_chars: int = 400
+    render_min_text_density: float = 0.02
+    render_prefix_depth: int = 1
+    render_decision_min_samples: int = 3
+    render_decision_ttl_hours: float = 168
     use_unstructured_fallback: bool = True
     data_dir: str = str(Path(__file__).resolve().parents[1] / "data")
     storm_discovered_urls_file: str = str(Path(data_dir) / "stormcrawler" / "discovered_urls.txt")
+    storm_state_dir: str = str(Path(data_dir) / "state")
+    storm_bloom_capacity: int = 5_000_000
+    storm_bloom_error_rate: float = 0.001
     database_url: str = f"sqlite:///{(Path(data_dir) / 'regulations.db').as_posix()}"
-    raw_output_dir: str = str(Path(data_dir) / "raw")
-    processed_output_dir: str = str(Path(data_dir) / "processed")
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_mmap_size_mb: int = 256
+    sqlite_cache_size_mb: int = 64
+    sqlite_read_pool_size: int = 8
+    heartbeat_busy_timeout_ms: int = 1000
+    heartbeat_retries: int = 3
+    heartbeat_retry_seconds: float = 0.2
+    artifact_dir: str = str(Path(data_dir) / "artifacts")
+    artifact_segment_size_mb: int = 256
+    artifact_zstd_level: int = 10
+    chunk_index_enabled: bool = True
+    chunk_max_chars: int = 3000
+    embedding_backend: str = "hashing"
+    embedding_model: str = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
+    embedding_dim: int = 384
+    embedding_batch_size: int = 32
+    vector_dir: str = str(Path(data_dir) / "vectors")
+    vector_ivf_min_rows: int = 5000
+    vector_ivf_nprobe: int = 8
+    vector_ivf_iterations: int = 10
+    ingest_trace_dir: str | None = None
+    job_lease_seconds: int = 300
+    job_heartbeat_seconds: float = 5.0
+    job_poll_seconds: float = 2.0
+    response_cache_enabled: bool = True
+    response_cache_max_mb: int = 64
+    response_cache_generation_ttl_seconds: float = 0.25
+    response_cache_redis_url: str | None = None
+    response_cache_shared_ttl_seconds: int = 3600
+    change_feed_poll_seconds: float = 1.0
+    change_feed_buffer_size: int = 1000
+    change_feed_heartbeat_seconds: float = 15.0
+    change_feed_max_wait_seconds: int = 60
+    crawl_shards: int = 256
+    crawl_ring_replicas: int = 64
+    crawl_batch_size: int = 100
+    crawl_lease_seconds: int = 300
+    crawl_worker_ttl_seconds: int = 30
+    crawl_heartbeat_seconds: float = 5.0
+    crawl_poll_seconds: float = 2.0
+    crawl_writer_batch: int = 8
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
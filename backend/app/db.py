@@ -1,21 +1,107 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy import Engine, create_engine, event, inspect
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
 from app.config import settings
 
 
+READ_STATEMENTS = ("SELECT", "PRAGMA", "EXPLAIN")
+
+
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(settings.database_url, future=True)
+def _apply_sqlite_pragmas(engine: Engine, *, read_only: bool, busy_timeout_ms: int | None = None) -> None:
+    busy_timeout_ms = settings.sqlite_busy_timeout_ms if busy_timeout_ms is None else busy_timeout_ms
+
+    @event.listens_for(engine, "connect")
+    def set_pragmas(dbapi_connection, _connection_record) -> None:
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.sqlite_mmap_size_mb) * 1024 * 1024}")
+        cursor.execute(f"PRAGMA cache_size=-{int(settings.sqlite_cache_size_mb) * 1024}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        if read_only:
+            cursor.execute("PRAGMA query_only=ON")
+        cursor.close()
+
+    if read_only:
+
+        @event.listens_for(engine, "begin")
+        def begin(connection) -> None:
+            connection.exec_driver_sql("BEGIN")
+
+        return
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def begin_on_write(_connection, cursor, statement, _parameters, _context, _executemany) -> None:
+        if not cursor.connection.in_transaction and not statement.lstrip().upper().startswith(READ_STATEMENTS):
+            cursor.execute("BEGIN IMMEDIATE")
+
+
+def _create_engines() -> tuple[Engine, Engine, Engine]:
+    if not settings.database_url.startswith("sqlite"):
+        engine = create_engine(settings.database_url, future=True)
+        return engine, engine, engine
+
+    connect_args = {"check_same_thread": False, "timeout": settings.sqlite_busy_timeout_ms / 1000}
+    write_engine = create_engine(
+        settings.database_url,
+        future=True,
+        connect_args=connect_args,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=max(30, settings.sqlite_busy_timeout_ms / 1000),
+    )
+    read_engine = create_engine(
+        settings.database_url,
+        future=True,
+        connect_args=connect_args,
+        pool_size=settings.sqlite_read_pool_size,
+        max_overflow=settings.sqlite_read_pool_size,
+    )
+    heartbeat_engine = create_engine(
+        settings.database_url,
+        future=True,
+        connect_args={"check_same_thread": False, "timeout": settings.heartbeat_busy_timeout_ms / 1000},
+        poolclass=NullPool,
+    )
+    _apply_sqlite_pragmas(write_engine, read_only=False)
+    _apply_sqlite_pragmas(read_engine, read_only=True)
+    _apply_sqlite_pragmas(heartbeat_engine, read_only=False, busy_timeout_ms=settings.heartbeat_busy_timeout_ms)
+    return write_engine, read_engine, heartbeat_engine
+
+
+engine, read_engine, heartbeat_engine = _create_engines()
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+ReadSessionLocal = sessionmaker(bind=read_engine, autoflush=False, autocommit=False)
 
 
 def init_db() -> None:
     from app import models
+    from app.services.search_index import ensure_search_index
 
     Base.metadata.create_all(bind=engine)
+    _upgrade_schema(engine)
+    ensure_search_index(engine)
+
+
+def _upgrade_schema(bind: Engine) -> None:
+    with bind.begin() as connection:
+        inspector = inspect(connection)
+        for table in Base.metadata.sorted_tables:
+            existing = {column["name"] for column in inspector.get_columns(table.name)}
+            missing = [column for column in table.columns if column.name not in existing]
+            for column in missing:
+                column_type = column.type.compile(dialect=bind.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}")
+            for index in table.indexes:
+                index.create(connection, checkfirst=True)
 
 
 def get_db():
@@ -24,3 +110,26 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def begin_write(db: Session) -> None:
+    connection = db.connection()
+    if connection.dialect.name != "sqlite":
+        return
+    dbapi_connection = connection.connection.dbapi_connection
+    if not dbapi_connection.in_transaction:
+        dbapi_connection.execute("BEGIN IMMEDIATE")
+
+
+def dialect_insert(db: Session, model: type[Base]) -> postgresql.Insert | sqlite.Insert:
+    if db.get_bind().dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
@@ -1,9 +1,13 @@
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request, Response
 from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
 
 from app.db import init_db
 from app.routers import changes, ops, regulations, search
+from app.services.change_feed import stop_change_feed
+from app.services.metrics import API_REQUEST_SECONDS, export_metrics
 
 app = FastAPI(
     title="Regülasyon Bilgi Platformu API",
@@ -20,11 +24,35 @@ def on_startup() -> None:
     init_db()
 
 
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await stop_change_feed()
+
+
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    response = await call_next(request)
+    route = request.scope.get("route")
+    API_REQUEST_SECONDS.labels(
+        method=request.method,
+        route=getattr(route, "path", "unmatched"),
+        status=str(response.status_code),
+    ).observe(time.perf_counter() - started)
+    return response
+
+
 @app.get("/health")
 def health() -> dict[str, str]:
     return {"status": "ok"}
 
 
+@app.get("/metrics", include_in_schema=False)
+def metrics() -> Response:
+    payload, content_type = export_metrics()
+    return Response(payload, media_type=content_type)
+
+
 @app.get("/")
 def dashboard() -> FileResponse:
     return FileResponse(f"{static_dir}/index.html")
@@ -32,5 +60,6 @@ def dashboard() -> FileResponse:
 
 app.include_router(regulations.router, prefix="/regulations", tags=["regulations"])
 app.include_router(search.router, prefix="/search", tags=["search"])
+app.include_router(changes.feed_router, prefix="/changes", tags=["changes"])
 app.include_router(changes.router, prefix="/changes", tags=["changes"])
 app.include_router(ops.router, prefix="/ops", tags=["ops"])
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import DateTime, ForeignKey, Integer, String, Text
+from sqlalchemy import JSON, BigInteger, Boolean, DateTime, ForeignKey, Index, Integer, LargeBinary, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db import Base
@@ -8,6 +8,7 @@ from app.db import Base
 
 class Regulation(Base):
     __tablename__ = "regulations"
+    __table_args__ = (Index("ix_regulations_listing", "duplicate_of_id", "last_seen_at", "id"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     title: Mapped[str] = mapped_column(String(1024), nullable=False, index=True)
@@ -17,10 +18,15 @@ class Regulation(Base):
     instrument_type: Mapped[str | None] = mapped_column(String(255), nullable=True)
     institution: Mapped[str | None] = mapped_column(String(255), nullable=True)
     article_no: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    instrument_number: Mapped[str | None] = mapped_column(String(32), nullable=True, index=True)
+    gazette_number: Mapped[str | None] = mapped_column(String(32), nullable=True)
     published_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
-    content_markdown: Mapped[str | None] = mapped_column(Text, nullable=True)
-    content_text: Mapped[str | None] = mapped_column(Text, nullable=True)
+    content_markdown: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
+    content_text: Mapped[str | None] = mapped_column(Text, nullable=True, deferred=True)
     content_hash: Mapped[str | None] = mapped_column(String(128), nullable=True, index=True)
+    normalized_hash: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    simhash: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    duplicate_of_id: Mapped[int | None] = mapped_column(ForeignKey("regulations.id"), nullable=True)
     version: Mapped[int] = mapped_column(Integer, default=1, nullable=False)
     last_seen_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
@@ -34,4 +40,175 @@ class RegulationVersion(Base):
     content_hash: Mapped[str] = mapped_column(String(128), nullable=False, index=True)
     version: Mapped[int] = mapped_column(Integer, nullable=False)
     summary: Mapped[str | None] = mapped_column(String(1024), nullable=True)
+    payload_kind: Mapped[str | None] = mapped_column(String(16), nullable=True)
+    payload: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ChangeEvent(Base):
+    __tablename__ = "change_events"
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
+    regulation_id: Mapped[int] = mapped_column(ForeignKey("regulations.id"), nullable=False, index=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    title: Mapped[str] = mapped_column(String(1024), nullable=False)
+    url: Mapped[str] = mapped_column(String(2048), nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(128), nullable=False)
+    summary: Mapped[str | None] = mapped_column(String(1024), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class SimhashBand(Base):
+    __tablename__ = "regulation_simhash_bands"
+    __table_args__ = (Index("ix_regulation_simhash_bands_lookup", "band", "value"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    regulation_id: Mapped[int] = mapped_column(ForeignKey("regulations.id"), nullable=False, index=True)
+    band: Mapped[int] = mapped_column(Integer, nullable=False)
+    value: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class RegulationArticle(Base):
+    __tablename__ = "regulation_articles"
+    __table_args__ = (Index("ix_regulation_articles_lookup", "number", "regulation_id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    regulation_id: Mapped[int] = mapped_column(ForeignKey("regulations.id"), nullable=False, index=True)
+    ordinal: Mapped[int] = mapped_column(Integer, nullable=False)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    number: Mapped[str] = mapped_column(String(16), nullable=False)
+    position: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
+class RegulationChunk(Base):
+    __tablename__ = "regulation_chunks"
+    __table_args__ = (
+        Index("ix_regulation_chunks_document", "regulation_id", "ordinal"),
+        Index("ix_regulation_chunks_cluster", "cluster", "vector_row"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    regulation_id: Mapped[int] = mapped_column(ForeignKey("regulations.id"), nullable=False)
+    ordinal: Mapped[int] = mapped_column(Integer, nullable=False)
+    article: Mapped[str] = mapped_column(String(64), nullable=False)
+    content: Mapped[str] = mapped_column(Text, nullable=False)
+    content_hash: Mapped[str] = mapped_column(String(128), nullable=False)
+    vector_row: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    cluster: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class CacheGeneration(Base):
+    __tablename__ = "cache_generation"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class Artifact(Base):
+    __tablename__ = "artifacts"
+    __table_args__ = (Index("ix_artifacts_kind_digest", "kind", "digest", unique=True),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    kind: Mapped[str] = mapped_column(String(16), nullable=False)
+    digest: Mapped[str] = mapped_column(String(128), nullable=False)
+    segment: Mapped[int] = mapped_column(Integer, nullable=False)
+    offset: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    length: Mapped[int] = mapped_column(Integer, nullable=False)
+    codec: Mapped[str] = mapped_column(String(16), nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class FetchState(Base):
+    __tablename__ = "fetch_states"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    url: Mapped[str] = mapped_column(String(2048), nullable=False, unique=True)
+    etag: Mapped[str | None] = mapped_column(String(512), nullable=True)
+    last_modified: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    raw_hash: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class RenderDecision(Base):
+    __tablename__ = "render_decisions"
+    __table_args__ = (Index("ix_render_decisions_scope", "host", "prefix", unique=True),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    host: Mapped[str] = mapped_column(String(255), nullable=False)
+    prefix: Mapped[str] = mapped_column(String(512), nullable=False)
+    mode: Mapped[str] = mapped_column(String(16), nullable=False)
+    static_pages: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    render_pages: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class FrontierEntry(Base):
+    __tablename__ = "crawl_frontier"
+    __table_args__ = (
+        Index("ix_crawl_frontier_due", "next_due_at", "priority"),
+        Index("ix_crawl_frontier_shard_due", "shard", "next_due_at"),
+        Index("ix_crawl_frontier_lease", "lease_expires_at", "host"),
+        Index("ix_crawl_frontier_fetched", "last_fetched_at", "host"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    url: Mapped[str] = mapped_column(String(2048), nullable=False, unique=True)
+    host: Mapped[str] = mapped_column(String(255), nullable=False, index=True)
+    priority: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_due_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    revisit_interval_seconds: Mapped[int] = mapped_column(Integer, nullable=False)
+    failure_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    last_fetched_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_changed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    discovered_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    shard: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    leased_by: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+
+class CrawlWorker(Base):
+    __tablename__ = "crawl_workers"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    worker_id: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    started_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    heartbeat_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    expires_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, index=True)
+
+
+class CrawlResult(Base):
+    __tablename__ = "crawl_results"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    worker_id: Mapped[str] = mapped_column(String(255), nullable=False)
+    codec: Mapped[str] = mapped_column(String(16), nullable=False)
+    payload: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class IngestJob(Base):
+    __tablename__ = "ingest_jobs"
+    __table_args__ = (Index("ix_ingest_jobs_status", "status", "id"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
+    kind: Mapped[str] = mapped_column(String(32), nullable=False)
+    status: Mapped[str] = mapped_column(String(16), nullable=False)
+    params: Mapped[dict] = mapped_column(JSON, nullable=False)
+    progress: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    result: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    error: Mapped[str | None] = mapped_column(Text, nullable=True)
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, default=False, nullable=False)
+    worker_id: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    lease_expires_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    heartbeat_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, nullable=False)
+    started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
@@ -1,25 +1,71 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select
+import difflib
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.config import settings
+from app.db import get_read_db
 from app.models import Regulation, RegulationVersion
+from app.services.change_feed import format_sse, get_change_feed
+from app.services.pagination import keyset_page, split_page
+from app.services.response_cache import CachedRoute
+from app.services.version_store import VersionStore
+
+router = APIRouter(route_class=CachedRoute)
+feed_router = APIRouter()
 
-router = APIRouter()
+
+@feed_router.get("/stream")
+async def change_stream(
+    request: Request,
+    cursor: int | None = Query(default=None, ge=0),
+    limit: int = Query(default=100, ge=1, le=500),
+    wait: float = Query(default=25, ge=0, le=settings.change_feed_max_wait_seconds),
+    last_event_id: str | None = Header(default=None),
+):
+    if last_event_id:
+        try:
+            cursor = int(last_event_id)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail="Geçersiz imleç") from exc
+    feed = get_change_feed()
+    if "text/event-stream" not in request.headers.get("accept", ""):
+        events, next_cursor = await feed.wait(cursor, limit, wait)
+        return {"events": events, "cursor": next_cursor}
+
+    async def events():
+        yield f"retry: {int(settings.change_feed_poll_seconds * 1000) + 1000}\n\n"
+        async for event in feed.stream(cursor):
+            if await request.is_disconnected():
+                return
+            yield format_sse(event)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/updated")
 def updated_regulations(
+    response: Response,
     limit: int = Query(default=50, ge=1, le=500),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(default=None),
+    db: Session = Depends(get_read_db),
 ):
-    stmt = (
-        select(Regulation)
-        .where(Regulation.version > 1)
-        .order_by(Regulation.last_seen_at.desc())
-        .limit(limit)
-    )
-    rows = list(db.scalars(stmt).all())
+    stmt = select(
+        Regulation.id, Regulation.title, Regulation.url, Regulation.version, Regulation.last_seen_at
+    ).where(Regulation.version > 1, Regulation.duplicate_of_id.is_(None))
+    try:
+        stmt = keyset_page(stmt, limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    rows, next_cursor = split_page(list(db.execute(stmt)), limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return [
         {
             "id": row.id,
@@ -33,19 +79,64 @@ def updated_regulations(
 
 
 @router.get("/{regulation_id}/versions")
-def regulation_versions(regulation_id: int, db: Session = Depends(get_db)):
+def regulation_versions(
+    regulation_id: int,
+    with_diff: bool = Query(default=False),
+    db: Session = Depends(get_read_db),
+):
     stmt = (
-        select(RegulationVersion)
+        select(
+            RegulationVersion.version,
+            RegulationVersion.content_hash,
+            RegulationVersion.summary,
+            RegulationVersion.payload_kind,
+            func.length(RegulationVersion.payload).label("stored_bytes"),
+            RegulationVersion.created_at,
+        )
         .where(RegulationVersion.regulation_id == regulation_id)
         .order_by(RegulationVersion.version.desc())
     )
-    versions = list(db.scalars(stmt).all())
-    return [
-        {
+    versions = list(db.execute(stmt))
+    texts: dict[int, str] = {}
+    if with_diff and versions:
+        texts = VersionStore(db).texts(regulation_id, versions[-1].version, versions[0].version)
+    results = []
+    for row in versions:
+        item = {
             "version": row.version,
             "content_hash": row.content_hash,
             "summary": row.summary,
+            "payload_kind": row.payload_kind,
+            "stored_bytes": row.stored_bytes,
             "created_at": row.created_at,
         }
-        for row in versions
-    ]
+        if with_diff:
+            current, previous = texts.get(row.version), texts.get(row.version - 1)
+            item["diff"] = (
+                list(difflib.unified_diff(previous.splitlines(), current.splitlines(), lineterm="", n=1))
+                if current is not None and previous is not None
+                else None
+            )
+        results.append(item)
+    return results
+
+
+@router.get("/{regulation_id}/versions/{version}")
+def regulation_version_content(regulation_id: int, version: int, db: Session = Depends(get_read_db)):
+    content = VersionStore(db).rebuild(regulation_id, version)
+    if content is None:
+        raise HTTPException(status_code=404, detail="Versiyon içeriği bulunamadı")
+    return {"regulation_id": regulation_id, "version": version, "content_markdown": content}
+
+
+@router.get("/{regulation_id}/diff")
+def regulation_diff(
+    regulation_id: int,
+    from_version: int = Query(ge=1),
+    to_version: int = Query(ge=1),
+    db: Session = Depends(get_read_db),
+):
+    diff = VersionStore(db).diff(regulation_id, from_version, to_version)
+    if diff is None:
+        raise HTTPException(status_code=404, detail="Versiyon içeriği bulunamadı")
+    return {"regulation_id": regulation_id, "from_version": from_version, "to_version": to_version, "diff": diff}
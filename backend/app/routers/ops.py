@@ -1,25 +1,23 @@
-from pathlib import Path
-
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy import func, select
+from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.db import SessionLocal
-from app.models import Regulation
-from app.services.scrape_pipeline import RegulationScrapePipeline
+from app.db import ReadSessionLocal, get_db, get_read_db
+from app.models import IngestJob, Regulation
+from app.schemas import JobOut
+from app.services.jobs import FINISHED_STATUSES, KIND_INGEST, KIND_REEXTRACT, JobQueue
+from app.services.storm_reader import count_storm_urls
 
 router = APIRouter()
 
 
 @router.get("/stats")
 def stats() -> dict[str, int | bool]:
-    with SessionLocal() as db:
+    with ReadSessionLocal() as db:
         total = db.scalar(select(func.count(Regulation.id))) or 0
         updated = db.scalar(select(func.count(Regulation.id)).where(Regulation.version > 1)) or 0
-    storm_count = 0
-    storm_path = Path(settings.storm_discovered_urls_file)
-    if storm_path.exists():
-        storm_count = len([line for line in storm_path.read_text(encoding="utf-8").splitlines() if line.strip()])
+    storm_count = count_storm_urls(settings.storm_discovered_urls_file)
     return {
         "total_regulations": int(total),
         "updated_regulations": int(updated),
@@ -28,17 +26,42 @@ def stats() -> dict[str, int | bool]:
     }
 
 
-@router.post("/ingest")
-def run_ingest(seed: str = Query(default="https://www.mevzuat.gov.tr/")) -> dict[str, int]:
-    extra: list[str] = []
-    storm_file = Path(settings.storm_discovered_urls_file)
-    if storm_file.exists():
-        extra = [
-            line.strip()
-            for line in storm_file.read_text(encoding="utf-8").splitlines()
-            if line.strip().startswith("http")
-        ]
-
-    with SessionLocal() as db:
-        result = RegulationScrapePipeline(db).run(seed_urls=[seed], extra_urls=extra)
-    return {"storm_urls": len(extra), **result}
+@router.post("/ingest", response_model=JobOut, status_code=202)
+def run_ingest(seed: str = Query(default="https://www.mevzuat.gov.tr/"), db: Session = Depends(get_db)):
+    return JobQueue(db).enqueue(KIND_INGEST, {"seed_urls": [seed]})
+
+
+@router.post("/reextract", response_model=JobOut, status_code=202)
+def run_reextract(limit: int | None = Query(default=None, ge=1), db: Session = Depends(get_db)):
+    return JobQueue(db).enqueue(KIND_REEXTRACT, {"limit": limit})
+
+
+@router.get("/jobs", response_model=list[JobOut])
+def list_jobs(limit: int = Query(default=20, ge=1, le=100), db: Session = Depends(get_read_db)):
+    return list(db.scalars(select(IngestJob).order_by(IngestJob.id.desc()).limit(limit)))
+
+
+@router.get("/jobs/{job_id}", response_model=JobOut)
+def get_job(job_id: int, db: Session = Depends(get_read_db)):
+    job = db.get(IngestJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return job
+
+
+@router.get("/jobs/{job_id}/result")
+def get_job_result(job_id: int, db: Session = Depends(get_read_db)) -> dict[str, object]:
+    job = db.get(IngestJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    if job.status not in FINISHED_STATUSES:
+        raise HTTPException(status_code=409, detail="İş henüz tamamlanmadı")
+    return {"id": job.id, "status": job.status, "result": job.result, "error": job.error}
+
+
+@router.post("/jobs/{job_id}/cancel", response_model=JobOut)
+def cancel_job(job_id: int, db: Session = Depends(get_db)):
+    job = JobQueue(db).cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="İş bulunamadı")
+    return job
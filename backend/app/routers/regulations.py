@@ -1,27 +1,56 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_read_db
 from app.models import Regulation
-from app.schemas import RegulationOut
+from app.schemas import ArticleOut, RegulationOut
+from app.services.metadata_engine import ArticleIndex
+from app.services.pagination import OFFSET_DEPRECATION, SUMMARY_COLUMNS, keyset_page, offset_page, split_page
+from app.services.response_cache import CachedRoute
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
 @router.get("", response_model=list[RegulationOut])
 def list_regulations(
+    response: Response,
     limit: int = Query(default=50, ge=1, le=500),
-    offset: int = Query(default=0, ge=0),
-    db: Session = Depends(get_db),
+    cursor: str | None = Query(default=None),
+    offset: int | None = Query(default=None, ge=0, deprecated=True),
+    db: Session = Depends(get_read_db),
 ):
-    stmt = select(Regulation).order_by(Regulation.last_seen_at.desc()).offset(offset).limit(limit)
-    return list(db.scalars(stmt).all())
+    stmt = select(*SUMMARY_COLUMNS).where(Regulation.duplicate_of_id.is_(None))
+    if offset is not None:
+        if cursor:
+            raise HTTPException(status_code=400, detail="offset ve cursor birlikte kullanılamaz; yalnızca cursor kullanın")
+        stmt = offset_page(stmt, limit, offset)
+        response.headers.update(OFFSET_DEPRECATION)
+    else:
+        try:
+            stmt = keyset_page(stmt, limit, cursor)
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+    rows, next_cursor = split_page(list(db.execute(stmt)), limit)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return rows
 
 
 @router.get("/{regulation_id}", response_model=RegulationOut)
-def get_regulation(regulation_id: int, db: Session = Depends(get_db)):
-    row = db.get(Regulation, regulation_id)
+def get_regulation(regulation_id: int, db: Session = Depends(get_read_db)):
+    row = db.execute(select(*SUMMARY_COLUMNS).where(Regulation.id == regulation_id)).first()
     if not row:
         raise HTTPException(status_code=404, detail="Kayıt bulunamadı")
     return row
+
+
+@router.get("/{regulation_id}/articles", response_model=list[ArticleOut])
+def get_regulation_articles(
+    regulation_id: int,
+    number: str | None = Query(default=None, min_length=1, max_length=16),
+    db: Session = Depends(get_read_db),
+):
+    if db.scalar(select(Regulation.id).where(Regulation.id == regulation_id)) is None:
+        raise HTTPException(status_code=404, detail="Kayıt bulunamadı")
+    return ArticleIndex(db).articles(regulation_id, number)
@@ -1,25 +1,82 @@
-from fastapi import APIRouter, Depends, Query
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy import or_, select
 from sqlalchemy.orm import Session
 
-from app.db import get_db
+from app.db import get_read_db
 from app.models import Regulation
-from app.schemas import RegulationOut
+from app.schemas import ArticleHitOut, SearchHitOut, SimilarHitOut
+from app.services.metadata_engine import ARTICLE_KINDS, ArticleIndex
+from app.services.pagination import SUMMARY_COLUMNS
+from app.services.response_cache import CachedRoute
+from app.services.search_index import search_index_supported, search_regulations_fts
+from app.services.embeddings import get_embedder
+from app.services.vector_index import VectorStoreMismatch, similarity_search
 
-router = APIRouter()
+router = APIRouter(route_class=CachedRoute)
 
 
-@router.get("", response_model=list[RegulationOut])
+@router.get("", response_model=list[SearchHitOut])
 def search_regulations(
     q: str = Query(..., min_length=2),
     limit: int = Query(default=25, ge=1, le=100),
-    db: Session = Depends(get_db),
+    order: Literal["relevance", "recent"] = Query(default="relevance"),
+    db: Session = Depends(get_read_db),
 ):
+    if search_index_supported(db):
+        return search_regulations_fts(db, q, limit, order)
+
     pattern = f"%{q}%"
     stmt = (
-        select(Regulation)
+        select(*SUMMARY_COLUMNS)
         .where(or_(Regulation.title.ilike(pattern), Regulation.content_text.ilike(pattern)))
+        .where(Regulation.duplicate_of_id.is_(None))
         .order_by(Regulation.last_seen_at.desc())
         .limit(limit)
     )
-    return list(db.scalars(stmt).all())
+    return list(db.execute(stmt))
+
+
+@router.get("/similar", response_model=list[SimilarHitOut])
+def search_similar(
+    response: Response,
+    q: str = Query(..., min_length=2),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+):
+    try:
+        hits = similarity_search(db, q, limit)
+    except VectorStoreMismatch as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+    response.headers["X-Embedding-Backend"] = get_embedder().identity
+    return hits
+
+
+@router.get("/semantic", response_model=list[SimilarHitOut], deprecated=True)
+def search_semantic(
+    response: Response,
+    q: str = Query(..., min_length=2),
+    limit: int = Query(default=10, ge=1, le=50),
+    db: Session = Depends(get_read_db),
+):
+    response.headers["Deprecation"] = "true"
+    response.headers["Link"] = '</search/similar>; rel="successor-version"'
+    return search_similar(response, q, limit, db)
+
+
+@router.get("/article", response_model=list[ArticleHitOut])
+def search_article(
+    number: str = Query(..., min_length=1, max_length=32),
+    article: str = Query(..., min_length=1, max_length=16),
+    kind: str = Query(default="madde"),
+    db: Session = Depends(get_read_db),
+):
+    if kind != "madde" and kind not in ARTICLE_KINDS.values():
+        raise HTTPException(status_code=400, detail="Geçersiz madde türü")
+    index = ArticleIndex(db)
+    hits = []
+    for regulation_id in index.find(number, article, kind):
+        row = db.execute(select(*SUMMARY_COLUMNS).where(Regulation.id == regulation_id)).mappings().one()
+        hits.extend({**row, **item} for item in index.articles(regulation_id, article) if item["kind"] == kind)
+    return hits
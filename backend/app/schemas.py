@@ -12,9 +12,55 @@ class RegulationOut(BaseModel):
     instrument_type: str | None = None
     institution: str | None = None
     article_no: str | None = None
+    instrument_number: str | None = None
+    gazette_number: str | None = None
     version: int
+    duplicate_of_id: int | None = None
     published_at: datetime | None = None
     last_seen_at: datetime
 
     class Config:
         from_attributes = True
+
+
+class SearchHitOut(RegulationOut):
+    snippet: str | None = None
+    score: float | None = None
+
+
+class SimilarHitOut(SearchHitOut):
+    chunk_id: int
+    article: str
+
+
+class ArticleOut(BaseModel):
+    ordinal: int
+    kind: str
+    number: str
+    content: str
+
+
+class ArticleHitOut(RegulationOut):
+    ordinal: int
+    kind: str
+    number: str
+    content: str
+
+
+class JobOut(BaseModel):
+    id: int
+    kind: str
+    status: str
+    params: dict
+    progress: dict | None = None
+    result: dict | None = None
+    error: str | None = None
+    cancel_requested: bool
+    worker_id: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    heartbeat_at: datetime | None = None
+    finished_at: datetime | None = None
+
+    class Config:
+        from_attributes = True
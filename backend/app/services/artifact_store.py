@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import zlib
+from collections.abc import Iterable
+from datetime import datetime
+from pathlib import Path
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import dialect_insert
+from app.models import Artifact
+
+RAW_HTML = "raw"
+MARKDOWN = "markdown"
+
+
+def default_codec() -> str:
+    return "zstd" if importlib.util.find_spec("zstandard") is not None else "zlib"
+
+
+def compress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        import zstandard
+
+        return zstandard.ZstdCompressor(level=settings.artifact_zstd_level).compress(data)
+    return zlib.compress(data, 6)
+
+
+def decompress(data: bytes, codec: str) -> bytes:
+    if codec == "zstd":
+        import zstandard
+
+        return zstandard.ZstdDecompressor().decompress(data)
+    return zlib.decompress(data)
+
+
+class ArtifactStore:
+    def __init__(self, db: Session, root: str | Path | None = None) -> None:
+        self.db = db
+        self.root = Path(root or settings.artifact_dir)
+        self.codec = default_codec()
+
+    def missing(self, items: Iterable[tuple[str, str, str]]) -> dict[tuple[str, str], str]:
+        pending = {(kind, digest): text for kind, digest, text in items if digest and text is not None}
+        keys = list(pending)
+        for start in range(0, len(keys), 500):
+            existing = self.db.execute(
+                select(Artifact.kind, Artifact.digest).where(
+                    tuple_(Artifact.kind, Artifact.digest).in_(keys[start : start + 500])
+                )
+            )
+            for row in existing:
+                pending.pop((row.kind, row.digest), None)
+        return pending
+
+    def append(self, pending: dict[tuple[str, str], str]) -> list[dict[str, object]]:
+        if not pending:
+            return []
+        rows = []
+        now = datetime.utcnow()
+        segment, path = self._active_segment()
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            for (kind, digest), text in pending.items():
+                payload = compress(text.encode("utf-8"), self.codec)
+                header = f"STORE/1 {kind} {digest} {self.codec} {len(payload)}\n".encode("ascii")
+                record = header + payload + b"\n\n"
+                os.write(fd, record)
+                end = os.lseek(fd, 0, os.SEEK_CUR)
+                rows.append(
+                    {
+                        "kind": kind,
+                        "digest": digest,
+                        "segment": segment,
+                        "offset": end - len(record) + len(header),
+                        "length": len(payload),
+                        "codec": self.codec,
+                        "size": len(text.encode("utf-8")),
+                        "created_at": now,
+                    }
+                )
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return rows
+
+    def record(self, rows: list[dict[str, object]]) -> int:
+        if rows:
+            stmt = dialect_insert(self.db, Artifact)
+            self.db.execute(stmt.on_conflict_do_nothing(index_elements=[Artifact.kind, Artifact.digest]), rows)
+        return len(rows)
+
+    def get(self, kind: str, digest: str) -> str | None:
+        row = self.db.execute(
+            select(Artifact.segment, Artifact.offset, Artifact.length, Artifact.codec).where(
+                Artifact.kind == kind, Artifact.digest == digest
+            )
+        ).first()
+        if row is None:
+            return None
+        with self._segment_path(row.segment).open("rb") as handle:
+            handle.seek(row.offset)
+            payload = handle.read(row.length)
+        return decompress(payload, row.codec).decode("utf-8")
+
+    def _active_segment(self) -> tuple[int, Path]:
+        self.root.mkdir(parents=True, exist_ok=True)
+        segments = sorted(int(path.stem.split("-")[1]) for path in self.root.glob("segment-*.pack"))
+        segment = segments[-1] if segments else 1
+        path = self._segment_path(segment)
+        if path.exists() and path.stat().st_size >= settings.artifact_segment_size_mb * 1024 * 1024:
+            segment += 1
+            path = self._segment_path(segment)
+        return segment, path
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.root / f"segment-{segment:06d}.pack"
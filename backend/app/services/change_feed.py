@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from collections import deque
+from collections.abc import AsyncIterator
+
+from sqlalchemy import func, select
+from starlette.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.db import ReadSessionLocal
+from app.models import ChangeEvent
+from app.services.metrics import CHANGE_FEED_EVENTS
+from app.services.response_cache import current_generation
+
+CHANGE_CREATED = "created"
+CHANGE_UPDATED = "updated"
+BACKLOG_PAGE_SIZE = 500
+SUBSCRIBER_QUEUE_SIZE = 1000
+LAGGED = object()
+
+
+def read_events(after: int, limit: int) -> list[dict[str, object]]:
+    with ReadSessionLocal() as db:
+        stmt = select(ChangeEvent).where(ChangeEvent.id > after).order_by(ChangeEvent.id).limit(limit)
+        return [_event(row) for row in db.scalars(stmt)]
+
+
+def latest_event_id() -> int:
+    with ReadSessionLocal() as db:
+        return db.scalar(select(func.max(ChangeEvent.id))) or 0
+
+
+def _event(row: ChangeEvent) -> dict[str, object]:
+    return {
+        "id": row.id,
+        "regulation_id": row.regulation_id,
+        "version": row.version,
+        "kind": row.kind,
+        "title": row.title,
+        "url": row.url,
+        "content_hash": row.content_hash,
+        "summary": row.summary,
+        "created_at": row.created_at.isoformat(),
+    }
+
+
+class ChangeFeed:
+    def __init__(self) -> None:
+        self.last_id = 0
+        self._recent: deque[dict[str, object]] = deque(maxlen=max(1, settings.change_feed_buffer_size))
+        self._subscribers: set[asyncio.Queue] = set()
+        self._generation: str | None = None
+        self._task: asyncio.Task | None = None
+        self._started: asyncio.Event | None = None
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._started = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        await self._started.wait()
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def subscribe(self) -> asyncio.Queue:
+        await self.start()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    async def events_after(self, cursor: int, limit: int) -> list[dict[str, object]]:
+        if cursor >= self.last_id:
+            return []
+        if self._recent and cursor >= self._recent[0]["id"] - 1:
+            return [event for event in self._recent if event["id"] > cursor][:limit]
+        return await run_in_threadpool(read_events, cursor, limit)
+
+    async def stream(self, cursor: int | None) -> AsyncIterator[dict[str, object] | None]:
+        queue = await self.subscribe()
+        try:
+            last = self.last_id if cursor is None else cursor
+            while True:
+                async for event in self._backlog(last):
+                    last = event["id"]
+                    yield event
+                while True:
+                    try:
+                        event = await asyncio.wait_for(queue.get(), settings.change_feed_heartbeat_seconds)
+                    except asyncio.TimeoutError:
+                        yield None
+                        continue
+                    if event is LAGGED:
+                        break
+                    if event["id"] > last:
+                        last = event["id"]
+                        yield event
+        finally:
+            self.unsubscribe(queue)
+
+    async def wait(self, cursor: int | None, limit: int, timeout: float) -> tuple[list[dict[str, object]], int]:
+        queue = await self.subscribe()
+        try:
+            cursor = self.last_id if cursor is None else cursor
+            events = await self.events_after(cursor, limit)
+            if not events and timeout > 0:
+                try:
+                    await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                else:
+                    events = await self.events_after(cursor, limit)
+        finally:
+            self.unsubscribe(queue)
+        return events, events[-1]["id"] if events else cursor
+
+    async def _backlog(self, cursor: int) -> AsyncIterator[dict[str, object]]:
+        while True:
+            events = await self.events_after(cursor, BACKLOG_PAGE_SIZE)
+            for event in events:
+                yield event
+            if len(events) < BACKLOG_PAGE_SIZE:
+                return
+            cursor = events[-1]["id"]
+
+    async def _run(self) -> None:
+        self._generation = current_generation()
+        self.last_id = await run_in_threadpool(latest_event_id)
+        self._started.set()
+        while True:
+            await asyncio.sleep(settings.change_feed_poll_seconds)
+            generation = current_generation()
+            if generation == self._generation:
+                continue
+            self._generation = generation
+            events = await run_in_threadpool(read_events, self.last_id, BACKLOG_PAGE_SIZE)
+            while events:
+                self._publish(events)
+                if len(events) < BACKLOG_PAGE_SIZE:
+                    break
+                events = await run_in_threadpool(read_events, self.last_id, BACKLOG_PAGE_SIZE)
+
+    def _publish(self, events: list[dict[str, object]]) -> None:
+        CHANGE_FEED_EVENTS.labels(result="published").inc(len(events))
+        for event in events:
+            self._recent.append(event)
+            self.last_id = event["id"]
+            for queue in self._subscribers:
+                if queue.full():
+                    continue
+                if queue.qsize() == queue.maxsize - 1:
+                    CHANGE_FEED_EVENTS.labels(result="lagged").inc()
+                    queue.put_nowait(LAGGED)
+                else:
+                    queue.put_nowait(event)
+
+
+def format_sse(event: dict[str, object] | None) -> str:
+    if event is None:
+        return ": ping\n\n"
+    return f"id: {event['id']}\nevent: change\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+_feeds: dict[asyncio.AbstractEventLoop, ChangeFeed] = {}
+
+
+def get_change_feed() -> ChangeFeed:
+    loop = asyncio.get_running_loop()
+    feed = _feeds.get(loop)
+    if feed is None:
+        feed = _feeds[loop] = ChangeFeed()
+    return feed
+
+
+async def stop_change_feed() -> None:
+    feed = _feeds.pop(asyncio.get_running_loop(), None)
+    if feed is not None:
+        await feed.stop()
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import hashlib
+import re
+
+from app.config import settings
+
+ARTICLE_PATTERN = re.compile(
+    r"^[ \t>*#_\-]*((?:(?:ek|ge[çc][iıİI]c[iıİI])\s+)?madde\s+\d+(?:/[a-z0-9]+)?)[*_\s]*(?:[-–—:.(]|$)",
+    re.IGNORECASE | re.MULTILINE,
+)
+PREAMBLE = "Giriş"
+
+
+def split_articles(markdown: str | None) -> list[dict[str, object]]:
+    if not markdown or not markdown.strip():
+        return []
+    matches = list(ARTICLE_PATTERN.finditer(markdown))
+    sections: list[tuple[str, str]] = []
+    if not matches or matches[0].start() > 0:
+        sections.append((PREAMBLE, markdown[: matches[0].start() if matches else len(markdown)]))
+    for index, match in enumerate(matches):
+        end = matches[index + 1].start() if index + 1 < len(matches) else len(markdown)
+        label = " ".join(match.group(1).split()).replace("i", "İ").upper()
+        sections.append((label, markdown[match.start() : end]))
+
+    chunks: list[dict[str, object]] = []
+    for article, text in sections:
+        for part in _split_long(text.strip(), max(200, settings.chunk_max_chars)):
+            chunks.append(
+                {
+                    "ordinal": len(chunks),
+                    "article": article,
+                    "content": part,
+                    "content_hash": hashlib.sha256(part.encode("utf-8")).hexdigest(),
+                }
+            )
+    return chunks
+
+
+def _split_long(text: str, limit: int) -> list[str]:
+    if not text:
+        return []
+    if len(text) <= limit:
+        return [text]
+    parts: list[str] = []
+    current = ""
+    for paragraph in re.split(r"\n\s*\n", text):
+        while len(paragraph) > limit:
+            cut = paragraph.rfind(" ", 0, limit)
+            cut = cut if cut > limit // 2 else limit
+            if current:
+                parts.append(current)
+                current = ""
+            parts.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+        if current and len(current) + len(paragraph) + 2 > limit:
+            parts.append(current)
+            current = ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+    if current:
+        parts.append(current)
+    return [part for part in parts if part]
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import asyncio
+import bisect
+import hashlib
+import json
+import time
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+
+import httpx
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import begin_write, dialect_insert, heartbeat_engine
+from app.models import CrawlResult, CrawlWorker
+from app.services.artifact_store import compress, decompress, default_codec
+from app.services.frontier import UrlFrontier
+from app.services.heartbeat import Heartbeat
+from app.services.metrics import STAGE_ERRORS
+from app.services.jobs import default_worker_id, schedule_vector_training
+from app.services.scrape_pipeline import RegulationScrapePipeline, create_extract_executor
+
+MAX_RESULT_ATTEMPTS = 3
+
+
+def _ring_hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    def __init__(self, members: Iterable[str], replicas: int) -> None:
+        points = sorted(
+            (_ring_hash(f"{member}#{replica}"), member) for member in set(members) for replica in range(max(1, replicas))
+        )
+        self._keys = [key for key, _ in points]
+        self._members = [member for _, member in points]
+
+    def owner(self, key: str) -> str | None:
+        if not self._keys:
+            return None
+        return self._members[bisect.bisect(self._keys, _ring_hash(key)) % len(self._keys)]
+
+
+class CrawlCluster:
+    def __init__(self, db: Session, worker_id: str) -> None:
+        self.db = db
+        self.worker_id = worker_id
+
+    def heartbeat(self, now: datetime | None = None) -> list[int]:
+        now = now or datetime.utcnow()
+        stmt = dialect_insert(self.db, CrawlWorker).values(
+            worker_id=self.worker_id,
+            started_at=now,
+            heartbeat_at=now,
+            expires_at=now + timedelta(seconds=settings.crawl_worker_ttl_seconds),
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CrawlWorker.worker_id],
+            set_={"heartbeat_at": stmt.excluded.heartbeat_at, "expires_at": stmt.excluded.expires_at},
+        )
+        self.db.execute(stmt)
+        self.db.execute(delete(CrawlWorker).where(CrawlWorker.expires_at <= now))
+        members = list(self.db.scalars(select(CrawlWorker.worker_id)))
+        self.db.commit()
+        ring = HashRing(members, settings.crawl_ring_replicas)
+        return [shard for shard in range(max(1, settings.crawl_shards)) if ring.owner(str(shard)) == self.worker_id]
+
+    def leave(self) -> None:
+        self.db.rollback()
+        self.db.execute(delete(CrawlWorker).where(CrawlWorker.worker_id == self.worker_id))
+        self.db.commit()
+
+
+class ResultSpool:
+    def __init__(self, db: Session, worker_id: str | None = None) -> None:
+        self.db = db
+        self.worker_id = worker_id
+        self.codec = default_codec()
+        self.backlog: list[dict[str, object]] = []
+
+    def put(self, result: dict[str, object]) -> None:
+        payload = json.dumps(result, ensure_ascii=False, default=_encode_value).encode("utf-8")
+        self.backlog.append(
+            {
+                "worker_id": self.worker_id,
+                "codec": self.codec,
+                "payload": compress(payload, self.codec),
+                "created_at": datetime.utcnow(),
+                "attempts": 0,
+            }
+        )
+        self.flush()
+
+    def flush(self) -> bool:
+        if not self.backlog:
+            return True
+        try:
+            self.db.execute(insert(CrawlResult), self.backlog)
+            self.db.commit()
+        except OperationalError as exc:
+            self.db.rollback()
+            STAGE_ERRORS.labels(stage="spool", error=type(exc.orig).__name__).inc()
+            return False
+        self.backlog.clear()
+        return True
+
+    def take(self, limit: int) -> list[tuple[int, dict[str, object]]]:
+        begin_write(self.db)
+        stmt = (
+            select(CrawlResult)
+            .where(CrawlResult.attempts < MAX_RESULT_ATTEMPTS)
+            .order_by(CrawlResult.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return [(row.id, _decode_result(decompress(row.payload, row.codec))) for row in self.db.scalars(stmt)]
+
+    def remove(self, ids: list[int]) -> int:
+        return self.db.execute(delete(CrawlResult).where(CrawlResult.id.in_(ids))).rowcount
+
+    def fail(self, result_id: int, error: str) -> None:
+        self.db.execute(
+            update(CrawlResult)
+            .where(CrawlResult.id == result_id)
+            .values(attempts=CrawlResult.attempts + 1, error=error)
+        )
+        self.db.commit()
+
+
+def _encode_value(value: object) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} JSON'a çevrilemez")
+
+
+def _decode_result(payload: bytes) -> dict[str, object]:
+    result = json.loads(payload)
+    for _, _, page in result["pages"]:
+        if page.get("published_at"):
+            page["published_at"] = datetime.fromisoformat(page["published_at"])
+    return result
+
+
+class DistributedCrawlWorker:
+    def __init__(
+        self,
+        db: Session,
+        worker_id: str | None = None,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.db = db
+        self.worker_id = worker_id or default_worker_id()
+        self.cluster = CrawlCluster(db, self.worker_id)
+        self.pipeline = RegulationScrapePipeline(db, transport=transport, async_transport=async_transport)
+        self.spool = ResultSpool(db, self.worker_id)
+        self.pipeline.result_sink = self.spool.put
+        self.shards: list[int] = []
+
+    def run_forever(self, once: bool = False) -> None:
+        self.pipeline.frontier.assign_shards()
+        self._heartbeat()
+        self.pipeline.executor = create_extract_executor()
+        try:
+            with Heartbeat(heartbeat_engine, settings.crawl_heartbeat_seconds, self._beat, "crawl"):
+                asyncio.run(self._run(once))
+        finally:
+            self.spool.flush()
+            if self.pipeline.executor is not None:
+                self.pipeline.executor.shutdown(cancel_futures=True)
+                self.pipeline.executor = None
+            self.cluster.leave()
+
+    async def _run(self, once: bool) -> None:
+        while True:
+            ran = await self.run_next()
+            if once and not ran:
+                return
+            if not ran:
+                await asyncio.sleep(settings.crawl_poll_seconds)
+
+    async def run_next(self) -> dict[str, int] | None:
+        if not self.spool.flush():
+            return None
+        try:
+            self._heartbeat()
+            entries = self.pipeline.frontier.claim(self.worker_id, self.shards, settings.crawl_batch_size)
+        except OperationalError as exc:
+            self.db.rollback()
+            STAGE_ERRORS.labels(stage="claim", error=type(exc.orig).__name__).inc()
+            return None
+        if not entries:
+            return None
+        return await self.pipeline.crawl_async(entries)
+
+    def _heartbeat(self) -> None:
+        self._beat(self.db)
+
+    def _beat(self, db: Session) -> None:
+        self.shards = CrawlCluster(db, self.worker_id).heartbeat()
+        UrlFrontier(db).renew(self.worker_id)
+
+
+class CrawlResultWriter:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        self.spool = ResultSpool(db)
+        self.pipeline = RegulationScrapePipeline(db)
+
+    def run_forever(self, once: bool = False) -> None:
+        while True:
+            written = self.run_next()
+            if once and written is None:
+                return
+            if written is None:
+                time.sleep(settings.crawl_poll_seconds)
+
+    def run_next(self) -> dict[str, int] | None:
+        taken = self.spool.take(max(1, settings.crawl_writer_batch))
+        if not taken:
+            self.db.commit()
+            return None
+        try:
+            written = self._apply(taken)
+        except Exception:
+            self.db.rollback()
+            written = self._apply_each(taken)
+        schedule_vector_training(self.db)
+        return written
+
+    def _apply_each(self, taken: list[tuple[int, dict[str, object]]]) -> dict[str, int]:
+        written = 0
+        for result_id, result in taken:
+            try:
+                self._apply([(result_id, result)])
+                written += 1
+            except Exception as exc:
+                self.db.rollback()
+                self.spool.fail(result_id, f"{type(exc).__name__}: {exc}")
+        return {"results": written, "failed_results": len(taken) - written}
+
+    def _apply(self, taken: list[tuple[int, dict[str, object]]]) -> dict[str, int]:
+        if self.spool.remove([result_id for result_id, _ in taken]) < len(taken):
+            self.db.rollback()
+            return {"results": 0}
+        return self.pipeline.apply_results([result for _, result in taken])
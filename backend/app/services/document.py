@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import html as html_lib
+import re
+from urllib.parse import urljoin
+
+from lxml.html import HtmlElement
+from trafilatura import load_html
+
+TITLE_PATTERN = re.compile(r"<title\b[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+
+
+class ParsedDocument:
+    def __init__(self, html: str, base_url: str | None = None) -> None:
+        self.html = html
+        self.base_url = base_url
+        self._tree: HtmlElement | None = None
+        self._parsed = False
+
+    @property
+    def tree(self) -> HtmlElement | None:
+        if not self._parsed:
+            self._tree = load_html(self.html)
+            self._parsed = True
+        return self._tree
+
+    def title(self) -> str | None:
+        match = TITLE_PATTERN.search(self.html)
+        if match and "<" not in match.group(1):
+            title = html_lib.unescape(match.group(1)).strip()
+            if title:
+                return title
+        if self.tree is None:
+            return None
+        title = self.tree.findtext(".//title")
+        if title and title.strip():
+            return title.strip()
+        h1 = self.tree.find(".//h1")
+        return h1.text_content().strip() if h1 is not None else None
+
+    def links(self) -> set[str]:
+        links: set[str] = set()
+        if self.tree is None:
+            return links
+        for anchor in self.tree.iter("a"):
+            href = anchor.get("href")
+            if href is None:
+                continue
+            absolute = urljoin(self.base_url or "", href.strip())
+            if absolute.startswith("http"):
+                links.add(absolute.split("#")[0])
+        return links
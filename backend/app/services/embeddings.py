@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import hashlib
+import importlib
+import math
+import re
+import unicodedata
+from collections import Counter
+from functools import lru_cache
+
+import numpy as np
+
+from app.config import settings
+
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+TURKISH_FOLD = str.maketrans({"İ": "i", "I": "i", "ı": "i"})
+STEM_LENGTH = 5
+
+
+class HashingEmbedder:
+    def __init__(self, dim: int) -> None:
+        self.dim = dim
+        self.identity = f"hashing:{dim}"
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            words = WORD_PATTERN.findall(_fold(text))
+            features = Counter(words)
+            features.update(f"{word[:STEM_LENGTH]}~" for word in words if len(word) > STEM_LENGTH)
+            features.update(f"{left} {right}" for left, right in zip(words, words[1:]))
+            for feature, count in features.items():
+                value = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+                weight = 1.0 + math.log(count)
+                matrix[row, value % self.dim] += weight if value >> 63 else -weight
+        return _normalize(matrix)
+
+
+class SentenceTransformerEmbedder:
+    def __init__(self, model_name: str) -> None:
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.dim = int(self.model.get_sentence_embedding_dimension())
+        self.identity = f"sentence-transformers:{model_name}"
+
+    def embed(self, texts: list[str]) -> np.ndarray:
+        vectors = self.model.encode(
+            texts,
+            batch_size=settings.embedding_batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False,
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+EMBEDDERS = {
+    "hashing": lambda: HashingEmbedder(settings.embedding_dim),
+    "sentence-transformers": lambda: SentenceTransformerEmbedder(settings.embedding_model),
+}
+
+
+@lru_cache(maxsize=1)
+def get_embedder():
+    backend = settings.embedding_backend
+    if backend in EMBEDDERS:
+        return EMBEDDERS[backend]()
+    module_name, _, attribute = backend.partition(":")
+    if not attribute:
+        raise ValueError(f"Bilinmeyen embedding backend: {backend}")
+    return getattr(importlib.import_module(module_name), attribute)()
+
+
+def _fold(text: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", text.translate(TURKISH_FOLD).lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import hashlib
+import re
+import time
+from urllib.parse import urlparse
+
+import trafilatura
+
+from app.config import settings
+from app.services.document import ParsedDocument
+from app.services.metadata_engine import extract_metadata
+from app.services.near_duplicate import normalized_hash, simhash
+from app.services.render_router import looks_dynamic
+from app.services.stage_timing import FALLBACK_HIT, FALLBACK_MISS
+
+
+def extract_page(url: str, html: str) -> dict[str, object]:
+    timings: dict[str, float] = {}
+    try:
+        return _extract_page(url, html, timings)
+    except Exception as exc:
+        return {"url": url, "error": type(exc).__name__, "timings": timings}
+
+
+def _extract_page(url: str, html: str, timings: dict[str, float]) -> dict[str, object]:
+    started = time.perf_counter()
+    document = ParsedDocument(html, base_url=url)
+    title = document.title() or url
+    extracted = extract_markdown(document)
+    timings["extract"] = time.perf_counter() - started
+    fallback = None
+    if not extracted and document.tree is not None and settings.use_unstructured_fallback:
+        fallback_started = time.perf_counter()
+        extracted = extract_with_unstructured(document.html)
+        timings["fallback"] = time.perf_counter() - fallback_started
+        fallback = FALLBACK_HIT if extracted else FALLBACK_MISS
+    if not extracted:
+        return {"url": url, "error": "empty_content", "fallback": fallback, "timings": timings}
+
+    plain_text = re.sub(r"\s+", " ", extracted).strip()
+    metadata_started = time.perf_counter()
+    metadata = extract_metadata(title=title, url=url, markdown=extracted)
+    simhash_value = simhash(plain_text) if settings.near_duplicate_enabled else None
+    timings["metadata"] = time.perf_counter() - metadata_started
+    return {
+        "title": title,
+        "url": url,
+        "canonical_url": canonicalize_url(url),
+        "source": urlparse(url).netloc,
+        "instrument_type": metadata["instrument_type"],
+        "institution": metadata["institution"],
+        "article_no": metadata["article_no"],
+        "instrument_number": metadata["instrument_number"],
+        "gazette_number": metadata["gazette_number"],
+        "published_at": metadata["published_at"],
+        "content_markdown": extracted,
+        "content_text": plain_text,
+        "content_hash": hashlib.sha256(plain_text.encode("utf-8")).hexdigest(),
+        "normalized_hash": normalized_hash(plain_text),
+        "simhash": simhash_value,
+        "articles": metadata["articles"],
+        "needs_render": looks_dynamic(html, plain_text),
+        "fallback": fallback,
+        "timings": timings,
+    }
+
+
+def extract_markdown(document: ParsedDocument) -> str | None:
+    if document.tree is None:
+        return None
+    return trafilatura.extract(
+        document.tree,
+        include_comments=False,
+        include_formatting=True,
+        output_format="markdown",
+    )
+
+
+def extract_with_unstructured(html: str) -> str | None:
+    try:
+        from unstructured.partition.html import partition_html
+    except Exception:
+        return None
+
+    try:
+        elements = partition_html(text=html)
+        lines = [str(element).strip() for element in elements if str(element).strip()]
+        if not lines:
+            return None
+        return "\n\n".join(lines)
+    except Exception:
+        return None
+
+
+def canonicalize_url(url: str) -> str:
+    parsed = urlparse(url)
+    path = parsed.path.rstrip("/") or "/"
+    return f"{parsed.scheme}://{parsed.netloc}{path}"
+
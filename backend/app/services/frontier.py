@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from itertools import islice
+from urllib.parse import urlparse
+
+from sqlalchemy import Row, case, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import dialect_insert
+from app.models import FrontierEntry, Regulation, RegulationVersion
+
+OUTCOME_FAILED = "failed"
+OUTCOME_CHANGED = "changed"
+
+
+def host_shard(host: str) -> int:
+    digest = hashlib.blake2b(host.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % max(1, settings.crawl_shards)
+
+
+class UrlFrontier:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def add(self, urls: Iterable[str], priority: int = 0) -> int:
+        stmt = dialect_insert(self.db, FrontierEntry)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[FrontierEntry.url],
+            set_={
+                "priority": case(
+                    (stmt.excluded.priority > FrontierEntry.priority, stmt.excluded.priority),
+                    else_=FrontierEntry.priority,
+                )
+            },
+        )
+        added = 0
+        iterator = iter(urls)
+        while chunk := list(dict.fromkeys(islice(iterator, 500))):
+            now = datetime.utcnow()
+            hosts = {url: urlparse(url).netloc.lower() for url in chunk}
+            self.db.execute(
+                stmt,
+                [
+                    {
+                        "url": url,
+                        "host": hosts[url],
+                        "shard": host_shard(hosts[url]),
+                        "priority": priority,
+                        "next_due_at": now,
+                        "revisit_interval_seconds": int(settings.frontier_default_revisit_hours * 3600),
+                        "failure_count": 0,
+                        "discovered_at": now,
+                    }
+                    for url in chunk
+                ],
+            )
+            added += len(chunk)
+        self.db.commit()
+        return added
+
+    def due(self, limit: int, now: datetime | None = None) -> list[Row]:
+        now = now or datetime.utcnow()
+        stmt = (
+            select(
+                FrontierEntry.id,
+                FrontierEntry.url,
+                FrontierEntry.revisit_interval_seconds,
+                FrontierEntry.failure_count,
+            )
+            .where(
+                FrontierEntry.next_due_at <= now,
+                or_(FrontierEntry.lease_expires_at.is_(None), FrontierEntry.lease_expires_at <= now),
+            )
+            .order_by(FrontierEntry.priority.desc(), FrontierEntry.next_due_at)
+            .limit(limit)
+        )
+        rows = list(self.db.execute(stmt))
+        self.db.commit()
+        return rows
+
+    def claim(self, worker_id: str, shards: list[int], limit: int, now: datetime | None = None) -> list[Row]:
+        if not shards:
+            return []
+        now = now or datetime.utcnow()
+        free = or_(FrontierEntry.lease_expires_at.is_(None), FrontierEntry.lease_expires_at <= now)
+        busy_hosts = select(FrontierEntry.host).where(
+            FrontierEntry.leased_by != worker_id,
+            or_(
+                FrontierEntry.lease_expires_at > now,
+                FrontierEntry.last_fetched_at > now - timedelta(seconds=settings.request_delay_seconds),
+            ),
+        )
+        ranked = (
+            select(
+                FrontierEntry.id,
+                FrontierEntry.priority,
+                FrontierEntry.next_due_at,
+                func.row_number()
+                .over(
+                    partition_by=FrontierEntry.host,
+                    order_by=(FrontierEntry.priority.desc(), FrontierEntry.next_due_at),
+                )
+                .label("host_rank"),
+            )
+            .where(
+                FrontierEntry.shard.in_(shards),
+                FrontierEntry.next_due_at <= now,
+                free,
+                FrontierEntry.host.not_in(busy_hosts),
+            )
+            .subquery()
+        )
+        candidates = (
+            select(ranked.c.id)
+            .order_by(ranked.c.host_rank, ranked.c.priority.desc(), ranked.c.next_due_at)
+            .limit(limit)
+        )
+        stmt = (
+            update(FrontierEntry)
+            .where(FrontierEntry.id.in_(candidates), free)
+            .values(leased_by=worker_id, lease_expires_at=now + timedelta(seconds=settings.crawl_lease_seconds))
+            .returning(
+                FrontierEntry.id,
+                FrontierEntry.url,
+                FrontierEntry.revisit_interval_seconds,
+                FrontierEntry.failure_count,
+            )
+        )
+        rows = list(self.db.execute(stmt))
+        self.db.commit()
+        return rows
+
+    def renew(self, worker_id: str, now: datetime | None = None) -> None:
+        now = now or datetime.utcnow()
+        self.db.execute(
+            update(FrontierEntry)
+            .where(FrontierEntry.leased_by == worker_id, FrontierEntry.lease_expires_at > now)
+            .values(lease_expires_at=now + timedelta(seconds=settings.crawl_lease_seconds))
+        )
+        self.db.commit()
+
+    def entries(self, urls: list[str]) -> dict[str, Row]:
+        found: dict[str, Row] = {}
+        for start in range(0, len(urls), 500):
+            stmt = select(
+                FrontierEntry.id,
+                FrontierEntry.url,
+                FrontierEntry.revisit_interval_seconds,
+                FrontierEntry.failure_count,
+            ).where(FrontierEntry.url.in_(urls[start : start + 500]))
+            for row in self.db.execute(stmt):
+                found[row.url] = row
+        return found
+
+    def assign_shards(self) -> int:
+        hosts = list(self.db.scalars(select(FrontierEntry.host).where(FrontierEntry.shard.is_(None)).distinct()))
+        for host in hosts:
+            self.db.execute(
+                update(FrontierEntry)
+                .where(FrontierEntry.host == host, FrontierEntry.shard.is_(None))
+                .values(shard=host_shard(host))
+            )
+        self.db.commit()
+        return len(hosts)
+
+    def record(self, entries: dict[str, Row], outcomes: dict[str, str], now: datetime | None = None) -> None:
+        now = now or datetime.utcnow()
+        finished = [(entries[url], outcome) for url, outcome in outcomes.items() if url in entries]
+        if not finished:
+            return
+        history = self._change_history([entry.url for entry, _ in finished])
+        updates = [self._schedule(entry, outcome, history.get(entry.url), now) for entry, outcome in finished]
+        self.db.execute(update(FrontierEntry), updates)
+
+    def _schedule(self, entry: Row, outcome: str, observed: float | None, now: datetime) -> dict[str, object]:
+        if outcome == OUTCOME_FAILED:
+            failures = entry.failure_count + 1
+            backoff = min(settings.frontier_retry_base_minutes * 60 * 2 ** (failures - 1), self._max_interval())
+            return {
+                "id": entry.id,
+                "failure_count": failures,
+                "last_fetched_at": now,
+                "next_due_at": now + timedelta(seconds=backoff),
+                "lease_expires_at": None,
+            }
+
+        interval = float(entry.revisit_interval_seconds)
+        interval = interval / 2 if outcome == OUTCOME_CHANGED else interval * 1.5
+        if observed:
+            interval = (interval + observed) / 2
+        interval = min(max(interval, settings.frontier_min_revisit_hours * 3600), self._max_interval())
+        values: dict[str, object] = {
+            "id": entry.id,
+            "failure_count": 0,
+            "revisit_interval_seconds": int(interval),
+            "last_fetched_at": now,
+            "next_due_at": now + timedelta(seconds=interval),
+            "lease_expires_at": None,
+        }
+        if outcome == OUTCOME_CHANGED:
+            values["last_changed_at"] = now
+        return values
+
+    def _change_history(self, urls: list[str]) -> dict[str, float]:
+        observed: dict[str, float] = {}
+        for start in range(0, len(urls), 500):
+            stmt = (
+                select(
+                    Regulation.url,
+                    func.count(RegulationVersion.id),
+                    func.min(RegulationVersion.created_at),
+                    func.max(RegulationVersion.created_at),
+                )
+                .join(RegulationVersion, RegulationVersion.regulation_id == Regulation.id)
+                .where(Regulation.url.in_(urls[start : start + 500]))
+                .group_by(Regulation.url)
+            )
+            for url, count, first_seen, last_seen in self.db.execute(stmt):
+                if count > 1 and first_seen and last_seen and last_seen > first_seen:
+                    observed[url] = (last_seen - first_seen).total_seconds() / (count - 1)
+        return observed
+
+    def _max_interval(self) -> float:
+        return settings.frontier_max_revisit_hours * 3600
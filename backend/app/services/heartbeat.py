@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable
+
+from sqlalchemy import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.services.metrics import HEARTBEAT_FAILURES
+
+
+class Heartbeat:
+    def __init__(
+        self,
+        bind: Engine,
+        interval_seconds: float,
+        beat: Callable[[Session], None],
+        kind: str,
+        stop_on: tuple[type[Exception], ...] = (),
+    ) -> None:
+        self.bind = bind
+        self.interval_seconds = max(0.01, interval_seconds)
+        self.beat = beat
+        self.kind = kind
+        self.stop_on = stop_on
+        self.retries = max(0, settings.heartbeat_retries)
+        self.retry_seconds = settings.heartbeat_retry_seconds
+        self.error: Exception | None = None
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def __enter__(self) -> Heartbeat:
+        self.start()
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.kind}-heartbeat", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval_seconds):
+            try:
+                self._beat_with_retry()
+            except Exception as exc:
+                HEARTBEAT_FAILURES.labels(kind=self.kind, error=type(exc).__name__).inc()
+                if isinstance(exc, self.stop_on):
+                    self.error = exc
+                    return
+
+    def _beat_with_retry(self) -> None:
+        for attempt in range(self.retries + 1):
+            try:
+                with Session(self.bind) as db:
+                    self.beat(db)
+                return
+            except OperationalError as exc:
+                if attempt == self.retries or self._stopped.wait(self.retry_seconds * 2**attempt):
+                    raise
+                HEARTBEAT_FAILURES.labels(kind=self.kind, error=type(exc).__name__).inc()
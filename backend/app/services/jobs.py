@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import os
+import socket
+import time
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import heartbeat_engine
+from app.models import IngestJob
+from app.services.heartbeat import Heartbeat
+from app.services.response_cache import bump_generation
+from app.services.scrape_pipeline import RegulationScrapePipeline
+from app.services.storm_reader import StormUrlReader
+from app.services.vector_index import ChunkIndexer
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+ACTIVE_STATUSES = (JOB_QUEUED, JOB_RUNNING)
+FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED, JOB_CANCELLED)
+
+KIND_INGEST = "ingest"
+KIND_REEXTRACT = "reextract"
+KIND_TRAIN_VECTORS = "train_vectors"
+
+
+class JobCancelled(Exception):
+    pass
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def enqueue(self, kind: str, params: dict[str, object]) -> IngestJob:
+        active = self.db.scalars(
+            select(IngestJob)
+            .where(IngestJob.kind == kind, IngestJob.status.in_(ACTIVE_STATUSES), IngestJob.cancel_requested.is_(False))
+            .order_by(IngestJob.id)
+        ).all()
+        job = next((job for job in active if job.params == params), None)
+        if job is not None:
+            self.db.commit()
+            return job
+        job = IngestJob(kind=kind, status=JOB_QUEUED, params=params, created_at=datetime.utcnow())
+        self.db.add(job)
+        self.db.commit()
+        return job
+
+    def cancel(self, job_id: int) -> IngestJob | None:
+        job = self.db.get(IngestJob, job_id)
+        if job is None:
+            return None
+        if job.status == JOB_QUEUED:
+            job.status = JOB_CANCELLED
+            job.finished_at = datetime.utcnow()
+        elif job.status == JOB_RUNNING:
+            job.cancel_requested = True
+        self.db.commit()
+        return job
+
+    def claim(self, worker_id: str) -> IngestJob | None:
+        now = datetime.utcnow()
+        self.db.execute(
+            update(IngestJob)
+            .where(IngestJob.status == JOB_RUNNING, IngestJob.lease_expires_at < now)
+            .values(status=JOB_FAILED, error="Worker lease süresi doldu", finished_at=now)
+        )
+        if self.db.scalar(select(IngestJob.id).where(IngestJob.status == JOB_RUNNING).limit(1)) is not None:
+            self.db.commit()
+            return None
+        job = self.db.scalars(
+            select(IngestJob).where(IngestJob.status == JOB_QUEUED).order_by(IngestJob.id).limit(1).with_for_update()
+        ).first()
+        if job is not None:
+            job.status = JOB_RUNNING
+            job.worker_id = worker_id
+            job.started_at = now
+            job.heartbeat_at = now
+            job.lease_expires_at = now + timedelta(seconds=settings.job_lease_seconds)
+        self.db.commit()
+        return job
+
+    def heartbeat(self, job_id: int, worker_id: str, progress: dict[str, int]) -> None:
+        now = datetime.utcnow()
+        cancel_requested = self.db.scalar(
+            update(IngestJob)
+            .where(IngestJob.id == job_id, IngestJob.status == JOB_RUNNING, IngestJob.worker_id == worker_id)
+            .values(
+                progress=progress,
+                heartbeat_at=now,
+                lease_expires_at=now + timedelta(seconds=settings.job_lease_seconds),
+            )
+            .returning(IngestJob.cancel_requested)
+        )
+        self.db.commit()
+        if cancel_requested is None:
+            raise JobCancelled("Worker lease'i kaybedildi")
+        if cancel_requested:
+            raise JobCancelled("İş iptal edildi")
+
+    def finish(
+        self,
+        job_id: int,
+        worker_id: str,
+        status: str,
+        result: dict[str, object] | None = None,
+        error: str | None = None,
+    ) -> None:
+        self.db.execute(
+            update(IngestJob)
+            .where(IngestJob.id == job_id, IngestJob.status == JOB_RUNNING, IngestJob.worker_id == worker_id)
+            .values(status=status, result=result, error=error, finished_at=datetime.utcnow(), lease_expires_at=None)
+        )
+        self.db.commit()
+
+
+class JobWorker:
+    def __init__(self, db: Session, worker_id: str | None = None) -> None:
+        self.db = db
+        self.worker_id = worker_id or default_worker_id()
+        self.queue = JobQueue(db)
+
+    def run_forever(self, once: bool = False) -> None:
+        while True:
+            ran = self.run_next()
+            if once and not ran:
+                return
+            if not ran:
+                time.sleep(settings.job_poll_seconds)
+
+    def run_next(self) -> bool:
+        job = self.queue.claim(self.worker_id)
+        if job is None:
+            return False
+        job_id, kind, params = job.id, job.kind, dict(job.params)
+        self.db.commit()
+        progress: dict[str, int] = {}
+
+        def beat(db: Session) -> None:
+            JobQueue(db).heartbeat(job_id, self.worker_id, dict(progress))
+
+        heartbeat = Heartbeat(heartbeat_engine, settings.job_heartbeat_seconds, beat, "job", stop_on=(JobCancelled,))
+
+        def report(current: dict[str, int]) -> None:
+            progress.update(current)
+            if heartbeat.error is not None:
+                raise heartbeat.error
+
+        try:
+            with heartbeat:
+                result = JOB_HANDLERS[kind](self.db, params, report)
+        except JobCancelled as exc:
+            self.db.rollback()
+            self.queue.finish(job_id, self.worker_id, JOB_CANCELLED, error=str(exc))
+        except (KeyboardInterrupt, SystemExit):
+            self.db.rollback()
+            self.queue.finish(job_id, self.worker_id, JOB_FAILED, error="Worker durduruldu")
+            raise
+        except Exception as exc:
+            self.db.rollback()
+            self.queue.finish(job_id, self.worker_id, JOB_FAILED, error=f"{type(exc).__name__}: {exc}")
+        else:
+            self.queue.finish(job_id, self.worker_id, JOB_SUCCEEDED, result=result)
+        return True
+
+
+def schedule_vector_training(db: Session) -> bool:
+    if not settings.chunk_index_enabled or not ChunkIndexer(db).needs_training():
+        return False
+    JobQueue(db).enqueue(KIND_TRAIN_VECTORS, {})
+    return True
+
+
+def _run_ingest(db: Session, params: dict[str, object], report: Callable[[dict[str, int]], None]) -> dict[str, object]:
+    pipeline = RegulationScrapePipeline(db)
+    pipeline.progress_hook = report
+    storm_urls = StormUrlReader(settings.storm_discovered_urls_file).feed(pipeline.frontier)
+    result = pipeline.ingest(seed_urls=params["seed_urls"])
+    schedule_vector_training(db)
+    return {"storm_urls": storm_urls, **result}
+
+
+def _run_reextract(db: Session, params: dict[str, object], report: Callable[[dict[str, int]], None]) -> dict[str, object]:
+    pipeline = RegulationScrapePipeline(db)
+    pipeline.progress_hook = report
+    result = pipeline.reextract(limit=params.get("limit"))
+    schedule_vector_training(db)
+    return result
+
+
+def _run_train_vectors(
+    db: Session, params: dict[str, object], report: Callable[[dict[str, int]], None]
+) -> dict[str, object]:
+    clusters = ChunkIndexer(db).train()
+    bump_generation(db)
+    db.commit()
+    return {"clusters": clusters}
+
+
+JOB_HANDLERS: dict[str, Callable[[Session, dict[str, object], Callable[[dict[str, int]], None]], dict[str, object]]] = {
+    KIND_INGEST: _run_ingest,
+    KIND_REEXTRACT: _run_reextract,
+    KIND_TRAIN_VECTORS: _run_train_vectors,
+}
@@ -0,0 +1,210 @@
+from __future__ import annotations
+
+import re
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import Regulation, RegulationArticle
+
+ASCII_FOLD = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+I = "[ıi]"
+G = "[ğg]"
+S = "[şs]"
+DATE = r"\d{1,2}[./]\d{1,2}[./]\d{4}"
+
+INSTRUMENT_TYPES = {
+    "cumhurbaskanligi kararnamesi": "cumhurbaşkanlığı kararnamesi",
+    "anayasa": "anayasa",
+    "kanun": "kanun",
+    "yonetmeli": "yönetmelik",
+    "teblig": "tebliğ",
+    "genelge": "genelge",
+    "yonerge": "yönerge",
+    "tuzu": "tüzük",
+    "karar": "karar",
+}
+ARTICLE_KINDS = {"e": "ek madde", "g": "geçici madde"}
+
+METADATA_RULES = [
+    (
+        "article",
+        "\n",
+        rf"[ \t>*#_\-]*(?:(?P<article_kind>ek|ge[çc]{I}c{I})\s+)?madde\s+(?P<article_number>\d+(?:/[a-zçğıöşü])?)"
+        r"[*_ \t]*(?:[-–—:.(]|(?=\n)|$)",
+    ),
+    (
+        "gazette_header",
+        "r",
+        rf"(?:esm[îiı]\s*|\.\s*)gazete\s*:?\s*tarih\s*:\s*(?P<header_date>{DATE})\s*say{I}\s*:\s*(?P<header_number>\d+)",
+    ),
+    ("gazette_date", "r", rf"esm[îiı]\s+gazete\s+tarih{I}\s*:?\s*(?P<gazette_date_value>{DATE})"),
+    ("gazette_number", "r", rf"esm[îiı]\s+gazete\s+say{I}s{I}\s*:?\s*(?P<gazette_number_value>\d+)"),
+    ("gazette_citation", "t", rf"arihli\s+ve\s+(?P<citation_number>\d+)\s+say{I}l{I}\s+resm[îiı]\s+gazete"),
+    (
+        "instrument_number",
+        "k",
+        rf"(?:anun|ararname|arar)\s+(?:numaras{I}|no|say{I}s{I})\s*:?\s*(?P<instrument_number_value>\d+(?:/\d+)?)",
+    ),
+    ("instrument", "c", rf"umhurba{S}kanl{I}{G}{I}\s+kararnamesi"),
+    ("instrument", "a", "nayasa"),
+    ("instrument", "k", "anun|arar"),
+    ("instrument", "y", "önetmeli|önerge"),
+    ("instrument", "t", rf"ebli{G}|üzü"),
+    ("instrument", "g", "enelge"),
+    ("institution", "c", rf"umhurba{S}kanl{I}{G}{I}"),
+    ("institution", "t", r"[üu]rkiye\s+b[üu]y[üu]k\s+millet\s+meclisi|bmm"),
+    ("institution", "b", rf"akanl{I}{G}{I}"),
+]
+RULE_KINDS = {f"{kind}_{index}": kind for index, (kind, _, _) in enumerate(METADATA_RULES)}
+METADATA_PATTERN = re.compile(
+    "|".join(
+        f"{re.escape(first)}(?P<{kind}_{index}>{rest})" for index, (kind, first, rest) in enumerate(METADATA_RULES)
+    )
+)
+CITATION_DATE = re.compile(rf"({DATE})\s+$")
+MINISTRY_NAME = re.compile(r"(?:[A-ZÇĞİÖŞÜÂÎÛ][^\W\d_]*,?\s+(?:ve\s+)?){1,4}[^\W\d_]+$")
+MINISTRY_LOOKBEHIND = 80
+
+
+def extract_metadata(*, title: str, url: str, markdown: str) -> dict[str, object]:
+    prefix = f"\n{title}\n{url}\n"
+    source = prefix + markdown
+    folded = source.replace("İ", "I").lower()
+    if len(folded) != len(source):
+        folded = "".join(char.lower()[:1] for char in source)
+
+    found: dict[str, str] = {}
+    citation: tuple[str, str] | None = None
+    articles: list[dict[str, object]] = []
+    for match in METADATA_PATTERN.finditer(folded):
+        kind = RULE_KINDS[match.lastgroup]
+        if kind == "article":
+            position = match.start() + 1 - len(prefix)
+            if position >= 0:
+                articles.append(
+                    {
+                        "ordinal": len(articles),
+                        "kind": ARTICLE_KINDS.get((match.group("article_kind") or "")[:1], "madde"),
+                        "number": normalize_article_number(match.group("article_number")),
+                        "position": position,
+                    }
+                )
+        elif kind == "gazette_header":
+            found.setdefault("gazette_date", match.group("header_date"))
+            found.setdefault("gazette_number", match.group("header_number"))
+        elif kind == "gazette_date":
+            found.setdefault("gazette_date", match.group("gazette_date_value"))
+        elif kind == "gazette_number":
+            found.setdefault("gazette_number", match.group("gazette_number_value"))
+        elif kind == "gazette_citation":
+            date = CITATION_DATE.search(folded, max(0, match.start() - 16), match.start())
+            if citation is None and date is not None:
+                citation = (date.group(1), match.group("citation_number"))
+        elif kind == "instrument_number":
+            found.setdefault("instrument_number", match.group("instrument_number_value"))
+        elif kind == "instrument" and "instrument_type" not in found:
+            key = " ".join(match.group().translate(ASCII_FOLD).split())
+            found["instrument_type"] = INSTRUMENT_TYPES[key]
+        elif kind == "institution" and "institution" not in found:
+            found["institution"] = _institution(source, folded, match)
+
+    if citation and "gazette_date" not in found and "gazette_number" not in found:
+        found["gazette_date"], found["gazette_number"] = citation
+    return {
+        "instrument_type": found.get("instrument_type"),
+        "institution": found.get("institution"),
+        "instrument_number": found.get("instrument_number"),
+        "gazette_number": found.get("gazette_number"),
+        "published_at": _parse_date(found.get("gazette_date")),
+        "article_no": articles[0]["number"] if articles else None,
+        "articles": articles,
+    }
+
+
+def _institution(source: str, folded: str, match: re.Match[str]) -> str:
+    value = match.group()
+    if value.startswith("cumhurba"):
+        return "cumhurbaşkanlığı"
+    if not value.startswith("bakanl"):
+        return "tbmm"
+    start = max(0, match.start() - MINISTRY_LOOKBEHIND, folded.rfind("\n", 0, match.start()) + 1)
+    name = MINISTRY_NAME.search(source, start, match.end())
+    if name is None:
+        return "bakanlığı"
+    return " ".join(name.group().split())
+
+
+def _parse_date(value: str | None) -> datetime | None:
+    if value is None:
+        return None
+    day, month, year = re.split(r"[./]", value)
+    try:
+        return datetime(int(year), int(month), int(day))
+    except ValueError:
+        return None
+
+
+class ArticleIndex:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def replace(self, entries: dict[int, list[dict[str, object]]]) -> None:
+        if not entries:
+            return
+        ids = list(entries)
+        for start in range(0, len(ids), 500):
+            self.db.execute(delete(RegulationArticle).where(RegulationArticle.regulation_id.in_(ids[start : start + 500])))
+        rows = [
+            {"regulation_id": regulation_id, **article}
+            for regulation_id, articles in entries.items()
+            for article in articles
+        ]
+        if rows:
+            self.db.execute(insert(RegulationArticle), rows)
+
+    def articles(self, regulation_id: int, number: str | None = None) -> list[dict[str, object]]:
+        stmt = select(RegulationArticle).where(RegulationArticle.regulation_id == regulation_id)
+        if number is not None:
+            stmt = stmt.where(RegulationArticle.number == normalize_article_number(number))
+        rows = list(self.db.scalars(stmt.order_by(RegulationArticle.ordinal)))
+        if not rows:
+            return []
+        ordinals = [row.ordinal for row in rows]
+        ends = dict(
+            self.db.execute(
+                select(RegulationArticle.ordinal, RegulationArticle.position).where(
+                    RegulationArticle.regulation_id == regulation_id,
+                    RegulationArticle.ordinal.in_([ordinal + 1 for ordinal in ordinals]),
+                )
+            ).all()
+        )
+        markdown = self.db.scalar(select(Regulation.content_markdown).where(Regulation.id == regulation_id)) or ""
+        return [
+            {
+                "ordinal": row.ordinal,
+                "kind": row.kind,
+                "number": row.number,
+                "content": markdown[row.position : ends.get(row.ordinal + 1, len(markdown))].strip(),
+            }
+            for row in rows
+        ]
+
+    def find(self, instrument_number: str, number: str, kind: str = "madde") -> list[int]:
+        stmt = (
+            select(RegulationArticle.regulation_id)
+            .join(Regulation, Regulation.id == RegulationArticle.regulation_id)
+            .where(
+                RegulationArticle.number == normalize_article_number(number),
+                RegulationArticle.kind == kind,
+                Regulation.instrument_number == instrument_number.strip(),
+                Regulation.duplicate_of_id.is_(None),
+            )
+            .distinct()
+        )
+        return list(self.db.scalars(stmt))
+
+
+def normalize_article_number(number: str) -> str:
+    return "".join(number.split()).replace("i", "İ").upper()
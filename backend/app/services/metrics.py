@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import os
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+STAGE_SECONDS = Histogram(
+    "ingest_stage_seconds",
+    "Ingest aşaması süresi (saniye)",
+    ["stage", "host"],
+    buckets=STAGE_BUCKETS,
+)
+STAGE_ERRORS = Counter("ingest_errors_total", "Ingest aşaması hataları", ["stage", "error"])
+FALLBACK_RESULTS = Counter("ingest_fallback_total", "Unstructured fallback denemeleri", ["result"])
+PAGE_OUTCOMES = Counter("ingest_pages_total", "Ingest sayfa sonuçları", ["outcome"])
+HEARTBEAT_FAILURES = Counter("worker_heartbeat_failures_total", "Başarısız worker heartbeat denemeleri", ["kind", "error"])
+RENDER_ROUTES = Counter("ingest_render_routes_total", "Statik/render yönlendirme kararları", ["route"])
+API_REQUEST_SECONDS = Histogram(
+    "api_request_seconds",
+    "API istek süresi (saniye)",
+    ["method", "route", "status"],
+    buckets=STAGE_BUCKETS,
+)
+
+API_CACHE_RESULTS = Counter("api_cache_total", "API yanıt önbelleği sonuçları", ["result"])
+CHANGE_FEED_EVENTS = Counter("api_change_feed_events_total", "Değişiklik akışı olayları", ["result"])
+
+
+def export_metrics() -> tuple[bytes, str]:
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from collections import Counter
+
+import numpy as np
+from sqlalchemy import and_, delete, insert, or_, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Regulation, SimhashBand
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3
+WORD_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def normalized_hash(text: str) -> str:
+    return hashlib.sha256(" ".join(WORD_PATTERN.findall(text.casefold())).encode("utf-8")).hexdigest()
+
+
+def simhash(text: str) -> int:
+    words = WORD_PATTERN.findall(text.lower())
+    shingles = Counter(
+        " ".join(words[index : index + SHINGLE_SIZE]) for index in range(max(1, len(words) - SHINGLE_SIZE + 1))
+    )
+    digests = b"".join(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest() for shingle in shingles)
+    bits = np.unpackbits(np.frombuffer(digests, dtype=np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    counts = np.fromiter(shingles.values(), dtype=np.int64, count=len(shingles))
+    weights = 2 * (counts @ bits) - counts.sum()
+    unsigned = int(np.packbits(weights > 0, bitorder="little").view("<u8")[0])
+    return unsigned - (1 << SIMHASH_BITS) if unsigned >= 1 << (SIMHASH_BITS - 1) else unsigned
+
+
+def hamming_distance(left: int, right: int) -> int:
+    return ((left ^ right) & ((1 << SIMHASH_BITS) - 1)).bit_count()
+
+
+def simhash_bands(value: int) -> list[int]:
+    count = settings.near_duplicate_max_distance + 1
+    width = SIMHASH_BITS // count
+    unsigned = value & ((1 << SIMHASH_BITS) - 1)
+    bands = []
+    for band in range(count):
+        bits = width if band < count - 1 else SIMHASH_BITS - width * band
+        bands.append(unsigned >> (band * width) & ((1 << bits) - 1))
+    return bands
+
+
+def is_near_duplicate(left: int | None, right: int | None) -> bool:
+    if left is None or right is None:
+        return False
+    return hamming_distance(left, right) <= settings.near_duplicate_max_distance
+
+
+class NearDuplicateIndex:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def find(self, value: int, exclude_id: int | None = None) -> int | None:
+        bands = simhash_bands(value)
+        stmt = (
+            select(Regulation.id, Regulation.simhash)
+            .join(SimhashBand, SimhashBand.regulation_id == Regulation.id)
+            .where(or_(*(and_(SimhashBand.band == band, SimhashBand.value == bucket) for band, bucket in enumerate(bands))))
+            .where(Regulation.duplicate_of_id.is_(None))
+            .distinct()
+        )
+        if exclude_id is not None:
+            stmt = stmt.where(Regulation.id != exclude_id)
+        best: tuple[int, int] | None = None
+        for candidate_id, candidate_hash in self.db.execute(stmt):
+            if candidate_hash is None:
+                continue
+            distance = hamming_distance(value, candidate_hash)
+            if distance <= settings.near_duplicate_max_distance and (best is None or distance < best[0]):
+                best = (distance, candidate_id)
+        return best[1] if best else None
+
+    def replace(self, entries: dict[int, int | None]) -> None:
+        if not entries:
+            return
+        ids = list(entries)
+        for start in range(0, len(ids), 500):
+            self.db.execute(delete(SimhashBand).where(SimhashBand.regulation_id.in_(ids[start : start + 500])))
+        rows = [
+            {"regulation_id": regulation_id, "band": band, "value": bucket}
+            for regulation_id, value in entries.items()
+            if value is not None
+            for band, bucket in enumerate(simhash_bands(value))
+        ]
+        if rows:
+            self.db.execute(insert(SimhashBand), rows)
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import base64
+from datetime import datetime
+
+from sqlalchemy import Row, Select, tuple_
+
+from app.models import Regulation
+
+SUMMARY_COLUMNS = (
+    Regulation.id,
+    Regulation.title,
+    Regulation.url,
+    Regulation.canonical_url,
+    Regulation.source,
+    Regulation.instrument_type,
+    Regulation.institution,
+    Regulation.article_no,
+    Regulation.instrument_number,
+    Regulation.gazette_number,
+    Regulation.version,
+    Regulation.duplicate_of_id,
+    Regulation.published_at,
+    Regulation.last_seen_at,
+)
+OFFSET_DEPRECATION = {
+    "Deprecation": "true",
+    "Warning": '299 - "offset is deprecated; pass the X-Next-Cursor value as cursor"',
+}
+
+
+def encode_cursor(last_seen_at: datetime, regulation_id: int) -> str:
+    raw = f"{last_seen_at.isoformat()}|{regulation_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("utf-8")
+        timestamp, regulation_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(regulation_id)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Geçersiz cursor") from exc
+
+
+def keyset_page(stmt: Select, limit: int, cursor: str | None) -> Select:
+    if cursor:
+        last_seen_at, regulation_id = decode_cursor(cursor)
+        stmt = stmt.where(tuple_(Regulation.last_seen_at, Regulation.id) < tuple_(last_seen_at, regulation_id))
+    return stmt.order_by(Regulation.last_seen_at.desc(), Regulation.id.desc()).limit(limit + 1)
+
+
+def offset_page(stmt: Select, limit: int, offset: int) -> Select:
+    return stmt.order_by(Regulation.last_seen_at.desc(), Regulation.id.desc()).offset(offset).limit(limit + 1)
+
+
+def split_page(rows: list[Row], limit: int) -> tuple[list[Row], str | None]:
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last.last_seen_at, last.id)
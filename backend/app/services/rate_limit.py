@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    def __init__(self, interval_seconds: float, burst: int = 1) -> None:
+        self.interval_seconds = max(0.0, interval_seconds)
+        self.capacity = float(max(1, burst))
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.interval_seconds <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) / self.interval_seconds)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * self.interval_seconds)
+
+
+class HostRateLimiter:
+    def __init__(self, interval_seconds: float, burst: int = 1) -> None:
+        self.interval_seconds = interval_seconds
+        self.burst = burst
+        self._buckets: dict[str, TokenBucket] = {}
+
+    async def acquire(self, url: str) -> None:
+        host = urlparse(url).netloc.lower()
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = TokenBucket(self.interval_seconds, self.burst)
+        await bucket.acquire()
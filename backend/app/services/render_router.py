@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from datetime import datetime, timedelta
+from urllib.parse import urlparse
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import dialect_insert
+from app.models import RenderDecision
+
+MODE_STATIC = "static"
+MODE_RENDER = "render"
+HOST_SCOPE = ""
+RENDER_GAIN_RATIO = 1.2
+RENDER_GAIN_CHARS = 200
+DECISION_WINDOW = 50
+
+APP_ROOT_PATTERN = re.compile(
+    r"<(?:div|main|section)\b[^>]*\bid\s*=\s*[\"'](?:root|app|__next|__nuxt|application)[\"'][^>]*>\s*</(?:div|main|section)>"
+    r"|<app-root\b[^>]*>\s*</app-root>"
+    r"|<noscript\b[^>]*>[^<]*(?:javascript|js)[^<]*</noscript>",
+    re.IGNORECASE,
+)
+
+
+def looks_dynamic(html: str, text: str | None) -> bool:
+    if not text:
+        return True
+    if len(text) >= settings.render_min_text_chars:
+        return False
+    return bool(APP_ROOT_PATTERN.search(html)) or len(text) / max(1, len(html)) < settings.render_min_text_density
+
+
+def render_gained(static_text: str | None, rendered_text: str | None) -> bool:
+    static_length = len(static_text or "")
+    return len(rendered_text or "") > static_length * RENDER_GAIN_RATIO + RENDER_GAIN_CHARS
+
+
+def scopes(url: str) -> list[tuple[str, str]]:
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    segments = [segment for segment in parsed.path.split("/") if segment][: max(0, settings.render_prefix_depth)]
+    if not segments:
+        return [(host, HOST_SCOPE)]
+    return [(host, "/" + "/".join(segments)), (host, HOST_SCOPE)]
+
+
+class RenderRouter:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+        self._decisions: dict[tuple[str, str], dict[str, object]] = {}
+        self._observed: dict[tuple[str, str], list[int]] = {}
+
+    def load(self, urls: Iterable[str]) -> None:
+        self.load_hosts(urlparse(url).netloc.lower() for url in urls)
+
+    def load_hosts(self, hosts: Iterable[str]) -> None:
+        hosts = sorted(set(hosts) - {host for host, _ in self._decisions})
+        for start in range(0, len(hosts), 500):
+            stmt = select(
+                RenderDecision.host,
+                RenderDecision.prefix,
+                RenderDecision.mode,
+                RenderDecision.static_pages,
+                RenderDecision.render_pages,
+                RenderDecision.expires_at,
+            ).where(RenderDecision.host.in_(hosts[start : start + 500]))
+            for row in self.db.execute(stmt):
+                self._decisions[(row.host, row.prefix)] = dict(row._mapping)
+
+    def decision(self, url: str, now: datetime | None = None) -> str | None:
+        now = now or datetime.utcnow()
+        for scope in scopes(url):
+            decision = self._decisions.get(scope)
+            if decision is None or decision["expires_at"] <= now:
+                continue
+            if decision["static_pages"] + decision["render_pages"] >= settings.render_decision_min_samples:
+                return decision["mode"]
+        return None
+
+    def observe(self, url: str, needed: bool) -> None:
+        for scope in scopes(url):
+            counts = self._observed.setdefault(scope, [0, 0])
+            counts[1 if needed else 0] += 1
+
+    def drain(self) -> list[list[object]]:
+        observed, self._observed = self._observed, {}
+        return [[host, prefix, static_pages, render_pages] for (host, prefix), (static_pages, render_pages) in observed.items()]
+
+    def merge(self, observed: list[list[object]]) -> None:
+        self.load_hosts(host for host, _, _, _ in observed)
+        for host, prefix, static_pages, render_pages in observed:
+            counts = self._observed.setdefault((host, prefix), [0, 0])
+            counts[0] += static_pages
+            counts[1] += render_pages
+
+    def flush(self, now: datetime) -> None:
+        if not self._observed:
+            return
+        observed, self._observed = self._observed, {}
+        expires_at = now + timedelta(hours=settings.render_decision_ttl_hours)
+        rows = []
+        for (host, prefix), (static_pages, render_pages) in observed.items():
+            previous = self._decisions.get((host, prefix))
+            if previous is not None and previous["expires_at"] > now:
+                static_pages += previous["static_pages"]
+                render_pages += previous["render_pages"]
+            if static_pages + render_pages > DECISION_WINDOW:
+                static_pages, render_pages = (static_pages + 1) // 2, (render_pages + 1) // 2
+            row = {
+                "host": host,
+                "prefix": prefix,
+                "mode": MODE_RENDER if render_pages > static_pages else MODE_STATIC,
+                "static_pages": static_pages,
+                "render_pages": render_pages,
+                "updated_at": now,
+                "expires_at": expires_at,
+            }
+            self._decisions[(host, prefix)] = row
+            rows.append(row)
+        stmt = dialect_insert(self.db, RenderDecision)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[RenderDecision.host, RenderDecision.prefix],
+            set_={
+                "mode": stmt.excluded.mode,
+                "static_pages": stmt.excluded.static_pages,
+                "render_pages": stmt.excluded.render_pages,
+                "updated_at": stmt.excluded.updated_at,
+                "expires_at": stmt.excluded.expires_at,
+            },
+        )
+        self.db.execute(stmt, rows)
@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Coroutine
+from datetime import datetime
+from functools import lru_cache
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import dialect_insert, read_engine
+from app.models import CacheGeneration
+from app.services.metrics import API_CACHE_RESULTS
+
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+CACHE_NOT_MODIFIED = "not_modified"
+SKIPPED_HEADERS = {"content-length", "etag", "cache-control"}
+GENERATION_ROW = 1
+
+_generation: tuple[float, str | None] = (0.0, None)
+
+
+def current_generation() -> str:
+    global _generation
+    checked_at, value = _generation
+    now = time.monotonic()
+    if value is not None and now - checked_at < settings.response_cache_generation_ttl_seconds:
+        return value
+    with read_engine.connect() as connection:
+        stored = connection.scalar(select(CacheGeneration.value).where(CacheGeneration.id == GENERATION_ROW))
+    _generation = (now, str(stored or 0))
+    return _generation[1]
+
+
+def bump_generation(db: Session) -> None:
+    global _generation
+    stmt = dialect_insert(db, CacheGeneration).values(id=GENERATION_ROW, value=1, updated_at=datetime.utcnow())
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CacheGeneration.id],
+        set_={"value": CacheGeneration.value + 1, "updated_at": stmt.excluded.updated_at},
+    )
+    db.execute(stmt)
+    _generation = (0.0, None)
+
+
+class ResponseCache:
+    def __init__(self, max_bytes: int, shared: RedisResponseCache | None = None) -> None:
+        self.max_bytes = max_bytes
+        self.shared = shared
+        self.size = 0
+        self._entries: OrderedDict[str, tuple[str, dict[str, object]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, generation: str) -> dict[str, object] | None:
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                if cached[0] == generation:
+                    self._entries.move_to_end(key)
+                    return cached[1]
+                self._discard(key)
+        entry = self.shared.get(key, generation) if self.shared is not None else None
+        if entry is not None:
+            self._store(key, generation, entry)
+        return entry
+
+    def put(self, key: str, generation: str, body: bytes, headers: dict[str, str]) -> dict[str, object]:
+        entry = {"etag": f'"{hashlib.sha256(body).hexdigest()[:32]}"', "body": body, "headers": headers}
+        self._store(key, generation, entry)
+        if self.shared is not None:
+            self.shared.put(key, generation, entry)
+        return entry
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def _store(self, key: str, generation: str, entry: dict[str, object]) -> None:
+        size = _entry_size(key, entry)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._discard(key)
+            self._entries[key] = (generation, entry)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._discard(next(iter(self._entries)))
+
+    def _discard(self, key: str) -> None:
+        cached = self._entries.pop(key, None)
+        if cached is not None:
+            self.size -= _entry_size(key, cached[1])
+
+
+class RedisResponseCache:
+    def __init__(self, url: str, ttl_seconds: int) -> None:
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key: str, generation: str) -> dict[str, object] | None:
+        try:
+            payload = self.client.get(f"response:{generation}:{key}")
+        except Exception:
+            return None
+        if payload is None:
+            return None
+        header, _, body = payload.partition(b"\n")
+        meta = json.loads(header)
+        return {"etag": meta["etag"], "body": body, "headers": meta["headers"]}
+
+    def put(self, key: str, generation: str, entry: dict[str, object]) -> None:
+        header = json.dumps({"etag": entry["etag"], "headers": entry["headers"]}).encode("utf-8")
+        try:
+            self.client.set(f"response:{generation}:{key}", header + b"\n" + entry["body"], ex=self.ttl_seconds)
+        except Exception:
+            pass
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+    shared = None
+    if settings.response_cache_redis_url:
+        shared = RedisResponseCache(settings.response_cache_redis_url, settings.response_cache_shared_ttl_seconds)
+    return ResponseCache(settings.response_cache_max_mb * 1024 * 1024, shared)
+
+
+class CachedRoute(APIRoute):
+    def get_route_handler(self) -> Callable[[Request], Coroutine[object, object, Response]]:
+        handler = super().get_route_handler()
+
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET" or not settings.response_cache_enabled:
+                return await handler(request)
+            cache = get_response_cache()
+            key = _cache_key(request)
+            generation = current_generation()
+            entry = cache.get(key, generation)
+            result = CACHE_HIT
+            if entry is None:
+                response = await handler(request)
+                body = getattr(response, "body", None)
+                if response.status_code != 200 or not isinstance(body, bytes):
+                    return response
+                headers = {name: value for name, value in response.headers.items() if name not in SKIPPED_HEADERS}
+                entry = cache.put(key, generation, body, headers)
+                result = CACHE_MISS
+            if _matches(request.headers.get("if-none-match"), entry["etag"]):
+                API_CACHE_RESULTS.labels(result=CACHE_NOT_MODIFIED).inc()
+                return Response(status_code=304, headers={"ETag": entry["etag"], "Cache-Control": "no-cache"})
+            API_CACHE_RESULTS.labels(result=result).inc()
+            return Response(
+                entry["body"],
+                headers={**entry["headers"], "ETag": entry["etag"], "Cache-Control": "no-cache"},
+            )
+
+        return cached_handler
+
+
+def _cache_key(request: Request) -> str:
+    return f"{request.url.path}?{sorted(request.query_params.multi_items())}"
+
+
+def _matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def _entry_size(key: str, entry: dict[str, object]) -> int:
+    return len(key) + len(entry["body"]) + sum(len(name) + len(value) for name, value in entry["headers"].items())
@@ -1,274 +1,963 @@
 from __future__ import annotations
 
-import difflib
+import asyncio
 import hashlib
-import re
+import importlib.util
+import json
+import multiprocessing
 import time
+from collections import Counter
+from collections.abc import AsyncIterator, Callable
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urlparse
 
 import httpx
-import trafilatura
-from bs4 import BeautifulSoup
-from sqlalchemy import select
+from sqlalchemy import Row, and_, case, func, insert, select, update
 from sqlalchemy.orm import Session
 
 from app.config import settings
-from app.models import Regulation, RegulationVersion
+from app.db import begin_write, dialect_insert
+from app.models import ChangeEvent, FetchState, Regulation, RegulationVersion
+from app.services.artifact_store import MARKDOWN, RAW_HTML, ArtifactStore
+from app.services.change_feed import CHANGE_CREATED, CHANGE_UPDATED
+from app.services.document import ParsedDocument
+from app.services.extraction import extract_page
+from app.services.frontier import OUTCOME_CHANGED, OUTCOME_FAILED, UrlFrontier
+from app.services.metadata_engine import ArticleIndex
+from app.services.metrics import PAGE_OUTCOMES, RENDER_ROUTES
+from app.services.near_duplicate import NearDuplicateIndex, is_near_duplicate
+from app.services.rate_limit import HostRateLimiter
+from app.services.render_router import MODE_RENDER, MODE_STATIC, RenderRouter, render_gained
+from app.services.response_cache import bump_generation
+from app.services.stage_timing import StageTimings
+from app.services.vector_index import ChunkIndexer
+from app.services.version_store import encode_version
+
+PAGE_CHANGED = OUTCOME_CHANGED
+PAGE_UNCHANGED = "unchanged"
+PAGE_SKIPPED = "skipped"
+PAGE_FAILED = OUTCOME_FAILED
+PAGE_DUPLICATE = "duplicate"
+PAGE_MISSING = "missing"
+REEXTRACT_CHUNK_SIZE = 100
+ROUTE_STATIC = "static"
+ROUTE_PLANNED = "planned"
+ROUTE_ESCALATED = "escalated"
+ROUTE_UNNEEDED = "escalation_unneeded"
 
 
 class RegulationScrapePipeline:
-    def __init__(self, db: Session) -> None:
+    def __init__(
+        self,
+        db: Session,
+        transport: httpx.BaseTransport | None = None,
+        async_transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
         self.db = db
         self.client = httpx.Client(
             headers={"User-Agent": settings.user_agent},
             timeout=settings.request_timeout_seconds,
             follow_redirects=True,
+            transport=transport,
         )
+        self.async_transport = async_transport
+        self.timings = StageTimings()
+        self.frontier = UrlFrontier(db)
+        self.artifacts = ArtifactStore(db)
+        self.chunks = ChunkIndexer(db)
+        self.render_router = RenderRouter(db)
+        self.render_routes: Counter[str] = Counter()
+        self._chunk_documents: dict[int, str | None] = {}
+        self._frontier_entries: dict[str, Row] = {}
+        self._finished: dict[str, str] = {}
+        self._run_started = datetime.utcnow()
+        self._scheduled = 0
+        self._completed = 0
+        self._last_progress = time.monotonic()
+        self.progress_hook: Callable[[dict[str, int]], None] | None = None
+        self.result_sink: Callable[[dict[str, object]], None] | None = None
+        self.rate_limiter: HostRateLimiter | None = None
+        self.executor: ProcessPoolExecutor | None = None
+        self._fetch_states: dict[str, Row] = {}
+        self._validators: dict[str, tuple[str | None, str | None]] = {}
+        self._not_modified: set[str] = set()
+        self._pending_pages: list[tuple[str | None, str | None, dict[str, object]]] = []
+        self._pending_touches: list[tuple[str, str | None]] = []
+        self.outcomes: Counter[str] = Counter()
+
+    def ingest(self, seed_urls: list[str], extra_urls: list[str] | None = None) -> dict[str, int]:
+        if settings.async_ingest_enabled:
+            return asyncio.run(self.run_async(seed_urls, extra_urls))
+        return self.run(seed_urls, extra_urls)
 
     def run(self, seed_urls: list[str], extra_urls: list[str] | None = None) -> dict[str, int]:
-        Path(settings.raw_output_dir).mkdir(parents=True, exist_ok=True)
-        Path(settings.processed_output_dir).mkdir(parents=True, exist_ok=True)
-
         discovered = self._discover_links(seed_urls)
-        if extra_urls:
-            discovered = sorted(set(discovered).union(set(extra_urls)))
+        urls = self._schedule_urls(discovered, extra_urls)
 
-        processed = 0
-        upserted = 0
-        changed = 0
+        self.render_router.load(urls)
+        self.db.commit()
+        for url in urls:
+            html, rendered = self._download_html(url)
+            self._process_page(url, html, rendered)
+            time.sleep(settings.request_delay_seconds)
 
-        for url in discovered[: settings.max_pages_per_run]:
-            html = self._download_html(url)
-            if not html:
-                continue
+        self._flush()
+        return self._finish_run("ingest", self._summary(discovered, extra_urls, urls))
+
+    async def run_async(self, seed_urls: list[str], extra_urls: list[str] | None = None) -> dict[str, int]:
+        self.rate_limiter = HostRateLimiter(settings.request_delay_seconds, settings.host_burst)
+        async with self._async_client() as client:
+            discovered = await self._discover_links_async(client, seed_urls)
+            urls = self._schedule_urls(discovered, extra_urls)
+            await self._crawl_async(client, urls)
+
+        self._flush()
+        return self._finish_run("ingest", self._summary(discovered, extra_urls, urls))
+
+    async def crawl_async(self, entries: list[Row]) -> dict[str, int]:
+        urls = self._start_run(entries)
+        if self.rate_limiter is None:
+            self.rate_limiter = HostRateLimiter(settings.request_delay_seconds, settings.host_burst)
+        async with self._async_client() as client:
+            await self._crawl_async(client, urls)
+        self._flush()
+        return self._finish_run(
+            "crawl",
+            {
+                "scheduled": len(urls),
+                "completed": self._completed,
+                "failed": self.outcomes[PAGE_FAILED],
+                "rendered": self.render_routes[ROUTE_PLANNED] + self.render_routes[ROUTE_ESCALATED],
+            },
+        )
 
-            extracted = self._extract_markdown(html)
-            if not extracted:
-                continue
+    async def _crawl_async(self, client: httpx.AsyncClient, urls: list[str]) -> None:
+        ordered = self._interleave_by_host(urls)
+        self.render_router.load(ordered)
+        self.db.commit()
+        render_urls = [url for url in ordered if self._render_first(url)]
+        render_set = set(render_urls)
+        url_queue: asyncio.Queue[str] = asyncio.Queue()
+        for url in ordered:
+            if url not in render_set:
+                url_queue.put_nowait(url)
+        render_queue: asyncio.Queue[list[str]] = asyncio.Queue()
+        for batch in self._render_batches(render_urls):
+            render_queue.put_nowait(batch)
+        page_queue: asyncio.Queue[tuple[str, str | None, bool]] = asyncio.Queue(maxsize=settings.pipeline_queue_size)
+        persist_queue: asyncio.Queue[tuple[str, str | None, str | None, str | dict[str, object]]] = asyncio.Queue(
+            maxsize=settings.pipeline_queue_size
+        )
+        loop = asyncio.get_running_loop()
+        render_slots = asyncio.Semaphore(max(1, settings.render_batch_concurrency))
+
+        async def fetch_into_queue(url: str) -> None:
+            await page_queue.put((url, await self._safe_get_async(client, url, conditional=True), False))
+
+        async def fetch_worker() -> None:
+            while not url_queue.empty():
+                await fetch_into_queue(url_queue.get_nowait())
+
+        async def render_worker() -> None:
+            while not render_queue.empty():
+                async for url, html in self._render_batch_async(client, render_queue.get_nowait()):
+                    if html:
+                        self.render_routes[ROUTE_PLANNED] += 1
+                        await page_queue.put((url, html, True))
+                    else:
+                        workers.create_task(fetch_into_queue(url))
+
+        async def render_one(url: str) -> str | None:
+            async with render_slots:
+                rendered = [html async for _, html in self._render_batch_async(client, [url])]
+            return rendered[0] if rendered else None
+
+        async def extract_worker(executor: ProcessPoolExecutor | None) -> None:
+            while True:
+                url, html, rendered = await page_queue.get()
+                raw_hash, outcome = self._precheck(url, html)
+                if outcome is not None:
+                    await persist_queue.put((url, raw_hash, None, outcome))
+                    continue
+                page = await loop.run_in_executor(executor, extract_page, url, html)
+                if not rendered and self._should_escalate(url, page):
+                    rendered_html = await render_one(url)
+                    rendered_page = None
+                    if rendered_html:
+                        rendered_page = await loop.run_in_executor(executor, extract_page, url, rendered_html)
+                    if self._accept_render(url, page, rendered_page):
+                        html, page = rendered_html, rendered_page
+                        raw_hash, outcome = self._precheck(url, html)
+                        if outcome is not None:
+                            await persist_queue.put((url, raw_hash, None, outcome))
+                            continue
+                await persist_queue.put((url, raw_hash, html, page))
+
+        with self._extract_executor() as executor:
+            try:
+                async with asyncio.TaskGroup() as workers:
+                    for _ in range(max(1, settings.fetch_concurrency)):
+                        workers.create_task(fetch_worker())
+                    for _ in range(max(1, settings.render_batch_concurrency)):
+                        workers.create_task(render_worker())
+                    extractors = [
+                        workers.create_task(extract_worker(executor))
+                        for _ in range(max(1, settings.extract_workers) * 2)
+                    ]
+                    for _ in range(len(urls)):
+                        url, raw_hash, html, result = await persist_queue.get()
+                        if isinstance(result, str):
+                            self._persist_skip(url, raw_hash, result)
+                        else:
+                            self._persist_page(url, raw_hash, html, result)
+                    for extractor in extractors:
+                        extractor.cancel()
+            except ExceptionGroup as group:
+                raise group.exceptions[0] from group
+
+    def seed(self, seed_urls: list[str], extra_urls: list[str] | None = None) -> int:
+        discovered = self._discover_links(seed_urls)
+        self._add_to_frontier(discovered, extra_urls)
+        return len(set(discovered).union(extra_urls or []))
 
-            title = self._extract_title(html) or url
-            plain_text = re.sub(r"\s+", " ", extracted).strip()
-            content_hash = hashlib.sha256(plain_text.encode("utf-8")).hexdigest()
-            metadata = self._extract_metadata(title=title, url=url, plain_text=plain_text)
-            canonical_url = self._canonicalize_url(url)
-
-            has_changed = self._upsert_regulation(
-                title=title,
-                url=url,
-                canonical_url=canonical_url,
-                source=urlparse(url).netloc,
-                instrument_type=metadata["instrument_type"],
-                institution=metadata["institution"],
-                article_no=metadata["article_no"],
-                content_markdown=extracted,
-                content_text=plain_text,
-                content_hash=content_hash,
-            )
+    def _schedule_urls(self, discovered: list[str], extra_urls: list[str] | None) -> list[str]:
+        self._add_to_frontier(discovered, extra_urls)
+        return self._start_run(self.frontier.due(settings.max_pages_per_run))
 
-            self._write_processed(url, extracted)
-            processed += 1
-            upserted += 1
-            changed += int(has_changed)
-            time.sleep(settings.request_delay_seconds)
+    def _add_to_frontier(self, discovered: list[str], extra_urls: list[str] | None) -> None:
+        self.frontier.add(discovered, priority=settings.frontier_discovered_priority)
+        if extra_urls:
+            self.frontier.add(extra_urls)
+
+    def _start_run(self, entries: list[Row]) -> list[str]:
+        self._frontier_entries = {entry.url: entry for entry in entries}
+        urls = list(self._frontier_entries)
+        self._reset_run()
+        self._scheduled = len(urls)
+        self._load_fetch_states(urls)
+        return urls
+
+    def _reset_run(self) -> None:
+        self._finished.clear()
+        self.outcomes.clear()
+        self.render_routes.clear()
+        self.timings.clear()
+        self._run_started = datetime.utcnow()
+        self._scheduled = 0
+        self._completed = 0
+        self._last_progress = time.monotonic()
+
+    def progress(self) -> dict[str, int]:
+        return {"scheduled": self._scheduled, "completed": self._completed, **self.outcomes}
+
+    def _report_progress(self, force: bool = False) -> None:
+        if self.progress_hook is None:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_progress < settings.job_heartbeat_seconds:
+            return
+        self._last_progress = now
+        self.progress_hook(self.progress())
+
+    def _finish_run(self, kind: str, result: dict[str, int]) -> dict[str, int]:
+        self._report_progress(force=True)
+        for outcome, count in self.outcomes.items():
+            PAGE_OUTCOMES.labels(outcome=outcome).inc(count)
+        for route, count in self.render_routes.items():
+            RENDER_ROUTES.labels(route=route).inc(count)
+        if settings.ingest_trace_dir:
+            self._write_trace(kind, result)
+        return result
+
+    def _write_trace(self, kind: str, result: dict[str, int]) -> None:
+        finished_at = datetime.utcnow()
+        trace_dir = Path(settings.ingest_trace_dir)
+        trace_dir.mkdir(parents=True, exist_ok=True)
+        trace = {
+            "kind": kind,
+            "started_at": self._run_started.isoformat(),
+            "finished_at": finished_at.isoformat(),
+            "wall_s": round((finished_at - self._run_started).total_seconds(), 3),
+            "result": result,
+            "outcomes": dict(self.outcomes),
+            "render_routes": dict(self.render_routes),
+            **self.timings.trace(),
+        }
+        path = trace_dir / f"{kind}-{self._run_started:%Y%m%dT%H%M%S%f}.json"
+        path.write_text(json.dumps(trace, ensure_ascii=False, indent=2), encoding="utf-8")
+
+    def reextract(self, limit: int | None = None) -> dict[str, int]:
+        self._reset_run()
+        stmt = select(FetchState.url).where(FetchState.raw_hash.is_not(None)).order_by(FetchState.id)
+        if limit:
+            stmt = stmt.limit(limit)
+        urls = list(self.db.scalars(stmt))
+        self._scheduled = len(urls)
+        with self._extract_executor() as executor:
+            for start in range(0, len(urls), REEXTRACT_CHUNK_SIZE):
+                chunk = urls[start : start + REEXTRACT_CHUNK_SIZE]
+                self._load_fetch_states(chunk)
+                stored: list[tuple[str, str, str]] = []
+                for url in chunk:
+                    raw_hash = self._fetch_states[url].raw_hash
+                    html = self.artifacts.get(RAW_HTML, raw_hash)
+                    if html is None:
+                        self.outcomes[PAGE_MISSING] += 1
+                        self._completed += 1
+                    else:
+                        stored.append((url, raw_hash, html))
+                mapper = executor.map if executor is not None else map
+                extracted = mapper(extract_page, [url for url, _, _ in stored], [html for _, _, html in stored])
+                for (url, raw_hash, html), page in zip(stored, extracted):
+                    self._persist_page(url, raw_hash, html, page)
+                self._flush()
+        return self._finish_run(
+            "reextract",
+            {
+                "candidates": len(urls),
+                "changed": self.outcomes[PAGE_CHANGED],
+                "unchanged": self.outcomes[PAGE_UNCHANGED],
+                "near_duplicates": self.outcomes[PAGE_DUPLICATE],
+                "failed": self.outcomes[PAGE_FAILED],
+                "missing_raw": self.outcomes[PAGE_MISSING],
+            },
+        )
 
-        self.db.commit()
+    def _summary(self, discovered: list[str], extra_urls: list[str] | None, urls: list[str]) -> dict[str, int]:
+        processed = self.outcomes[PAGE_CHANGED] + self.outcomes[PAGE_UNCHANGED] + self.outcomes[PAGE_DUPLICATE]
         return {
-            "discovered": len(discovered),
+            "discovered": len(set(discovered).union(extra_urls or [])),
+            "scheduled": len(urls),
             "processed": processed,
-            "upserted": upserted,
-            "changed": changed,
+            "upserted": processed,
+            "changed": self.outcomes[PAGE_CHANGED],
+            "skipped_unchanged": self.outcomes[PAGE_SKIPPED],
+            "near_duplicates": self.outcomes[PAGE_DUPLICATE],
+            "rendered": self.render_routes[ROUTE_PLANNED] + self.render_routes[ROUTE_ESCALATED],
         }
 
+    def _interleave_by_host(self, urls: list[str]) -> list[str]:
+        by_host: dict[str, list[str]] = {}
+        for url in urls:
+            by_host.setdefault(_host(url), []).append(url)
+        queues = list(by_host.values())
+        ordered: list[str] = []
+        for index in range(max((len(queue) for queue in queues), default=0)):
+            ordered.extend(queue[index] for queue in queues if index < len(queue))
+        return ordered
+
+    def _render_batches(self, urls: list[str]) -> list[list[str]]:
+        batch_size = max(1, settings.render_batch_size)
+        per_host = max(1, settings.render_host_concurrency)
+        batches: list[list[str]] = []
+        host_counts: list[Counter[str]] = []
+        next_batch: dict[str, int] = {}
+        for url in urls:
+            host = _host(url)
+            index = next_batch.get(host, 0)
+            while index < len(batches) and len(batches[index]) >= batch_size:
+                index += 1
+            if index == len(batches):
+                batches.append([])
+                host_counts.append(Counter())
+            batches[index].append(url)
+            host_counts[index][host] += 1
+            next_batch[host] = index + 1 if host_counts[index][host] >= per_host else index
+        return batches
+
+    def _process_page(self, url: str, html: str | None, rendered: bool) -> None:
+        raw_hash, outcome = self._precheck(url, html)
+        if outcome is not None:
+            self._persist_skip(url, raw_hash, outcome)
+            return
+        page = extract_page(url, html)
+        if not rendered and self._should_escalate(url, page):
+            rendered_html = self._fetch_with_render_service(url)
+            rendered_page = extract_page(url, rendered_html) if rendered_html else None
+            if self._accept_render(url, page, rendered_page):
+                html, page = rendered_html, rendered_page
+                raw_hash, outcome = self._precheck(url, html)
+                if outcome is not None:
+                    self._persist_skip(url, raw_hash, outcome)
+                    return
+        self._persist_page(url, raw_hash, html, page)
+
+    def _render_first(self, url: str) -> bool:
+        return settings.use_playwright_render and self.render_router.decision(url) == MODE_RENDER
+
+    def _should_escalate(self, url: str, page: dict[str, object]) -> bool:
+        error = page.get("error")
+        if not settings.use_playwright_render or error not in (None, "empty_content"):
+            return False
+        if error or (page.get("needs_render") and self.render_router.decision(url) != MODE_STATIC):
+            return True
+        self.render_router.observe(url, needed=False)
+        self.render_routes[ROUTE_STATIC] += 1
+        return False
+
+    def _accept_render(self, url: str, page: dict[str, object], rendered_page: dict[str, object] | None) -> bool:
+        gained = (
+            rendered_page is not None
+            and not rendered_page.get("error")
+            and render_gained(page.get("content_text"), rendered_page.get("content_text"))
+        )
+        self.render_router.observe(url, needed=gained)
+        self.render_routes[ROUTE_ESCALATED if gained else ROUTE_UNNEEDED] += 1
+        discarded = page if gained else rendered_page
+        for stage, seconds in (discarded or {}).get("timings", {}).items():
+            self.timings.add(stage, seconds, _host(url))
+        if gained:
+            self._validators[url] = (None, None)
+        return gained
+
+    def _precheck(self, url: str, html: str | None) -> tuple[str | None, str | None]:
+        if url in self._not_modified:
+            return None, PAGE_SKIPPED
+        if not html:
+            return None, PAGE_FAILED
+
+        raw_hash = hashlib.sha256(html.encode("utf-8")).hexdigest()
+        state = self._fetch_states.get(url)
+        if state and state.raw_hash == raw_hash:
+            return raw_hash, PAGE_SKIPPED
+        return raw_hash, None
+
+    def _persist_skip(self, url: str, raw_hash: str | None, outcome: str) -> None:
+        self._finished[url] = outcome
+        self._completed += 1
+        if outcome == PAGE_SKIPPED:
+            self._pending_touches.append((url, raw_hash))
+        else:
+            self.outcomes[outcome] += 1
+        self._report_progress()
+
+    def _persist_page(self, url: str, raw_hash: str | None, html: str | None, page: dict[str, object]) -> None:
+        host = _host(url)
+        for stage, seconds in page.pop("timings", {}).items():
+            self.timings.add(stage, seconds, host)
+        page.pop("needs_render", None)
+        fallback = page.pop("fallback", None)
+        if fallback:
+            self.timings.fallback(fallback)
+        error = page.pop("error", None)
+        self._completed += 1
+        if error:
+            self.timings.error("extract", error)
+            self._finished[url] = PAGE_FAILED
+            self.outcomes[PAGE_FAILED] += 1
+        else:
+            self._pending_pages.append((raw_hash, html, page))
+            if len(self._pending_pages) + len(self._pending_touches) >= settings.upsert_batch_size:
+                self._flush()
+        self._report_progress()
+
+    def _flush(self) -> None:
+        if self.result_sink is not None:
+            self._send_pending()
+            return
+        try:
+            self._flush_pending()
+        except Exception as exc:
+            self.timings.error("upsert", exc)
+            raise
+
+    def _send_pending(self) -> None:
+        pages, self._pending_pages = self._pending_pages, []
+        touches, self._pending_touches = self._pending_touches, []
+        finished, self._finished = self._finished, {}
+        observed = self.render_router.drain()
+        if not (pages or touches or finished or observed):
+            return
+        urls = [page["url"] for _, _, page in pages] + [url for url, _ in touches]
+        with self.timings.measure("spool"):
+            self.result_sink(
+                {
+                    "pages": [[raw_hash, html, page] for raw_hash, html, page in pages],
+                    "touches": [[url, raw_hash] for url, raw_hash in touches],
+                    "finished": finished,
+                    "validators": {url: self._validator_fields(url) for url in urls},
+                    "not_modified": [url for url in urls if url in self._not_modified],
+                    "render_observed": observed,
+                }
+            )
+
+    def apply_results(self, results: list[dict[str, object]]) -> dict[str, int]:
+        self._reset_run()
+        self._validators.clear()
+        self._not_modified.clear()
+        self._chunk_documents.clear()
+        self.render_router.drain()
+        pages: dict[str, tuple[str | None, str | None, dict[str, object]]] = {}
+        touches: dict[str, str | None] = {}
+        for result in results:
+            for raw_hash, html, page in result["pages"]:
+                touches.pop(page["url"], None)
+                pages[page["url"]] = (raw_hash, html, page)
+            for url, raw_hash in result["touches"]:
+                pages.pop(url, None)
+                touches[url] = raw_hash
+            self._finished.update(result["finished"])
+            for url, validator in result["validators"].items():
+                self._validators[url] = (validator["etag"], validator["last_modified"])
+            self._not_modified.update(result["not_modified"])
+            self.render_router.merge(result["render_observed"])
+        self._pending_pages = list(pages.values())
+        self._pending_touches = list(touches.items())
+        for url in pages:
+            self._finished.pop(url, None)
+        self._frontier_entries = self.frontier.entries(list({*self._finished, *pages, *touches}))
+        self._scheduled = self._completed = len(pages) + len(touches)
+        self._flush()
+        return self._finish_run(
+            "write",
+            {
+                "results": len(results),
+                "processed": self.outcomes[PAGE_CHANGED] + self.outcomes[PAGE_UNCHANGED] + self.outcomes[PAGE_DUPLICATE],
+                "changed": self.outcomes[PAGE_CHANGED],
+                "skipped_unchanged": self.outcomes[PAGE_SKIPPED],
+                "near_duplicates": self.outcomes[PAGE_DUPLICATE],
+            },
+        )
+
+    def _flush_pending(self) -> None:
+        pages, self._pending_pages = self._pending_pages, []
+        touches, self._pending_touches = self._pending_touches, []
+        raw_rows = self._archive([(RAW_HTML, raw_hash, html) for raw_hash, html, _ in pages])
+        now = datetime.utcnow()
+        with self.timings.measure("upsert") if pages or touches else nullcontext():
+            if pages:
+                begin_write(self.db)
+                self._upsert_regulations([page for _, _, page in pages], now)
+                self._save_fetch_states([(page["url"], raw_hash) for raw_hash, _, page in pages], now)
+                self.artifacts.record(raw_rows)
+            if touches:
+                touched_urls = [url for url, _ in touches]
+                self.db.execute(update(Regulation).where(Regulation.url.in_(touched_urls)).values(last_seen_at=now))
+                self._save_fetch_states(touches, now)
+                self.outcomes[PAGE_SKIPPED] += len(touches)
+            finished, self._finished = self._finished, {}
+            self.frontier.record(self._frontier_entries, finished, now)
+            self.render_router.flush(now)
+        self._commit(bool(pages or touches))
+
+        documents, self._chunk_documents = self._chunk_documents, {}
+        if not settings.chunk_index_enabled:
+            documents = {}
+        reusable = self.chunks.reusable(list(documents)) if documents else {}
+        markdown_rows = self._archive(
+            [
+                (MARKDOWN, page["content_hash"], page["content_markdown"])
+                for _, _, page in pages
+                if finished.get(page["url"]) == PAGE_CHANGED
+            ]
+        )
+        chunk_rows: list[dict[str, object]] = []
+        if documents:
+            with self.timings.measure("chunk_index"):
+                chunk_rows, _ = self.chunks.prepare(documents, reusable)
+        if documents or markdown_rows:
+            self.chunks.write(list(documents), chunk_rows)
+            self.artifacts.record(markdown_rows)
+            self._commit(bool(documents))
+
+    def _archive(self, items: list[tuple[str, str | None, str | None]]) -> list[dict[str, object]]:
+        if not items:
+            return []
+        missing = self.artifacts.missing(items)
+        self.db.commit()
+        with self.timings.measure("file_write"):
+            return self.artifacts.append(missing)
+
+    def _commit(self, changed: bool) -> None:
+        if changed:
+            bump_generation(self.db)
+        with self.timings.measure("commit") if changed else nullcontext():
+            self.db.commit()
+
+    def _load_fetch_states(self, urls: list[str]) -> None:
+        self._fetch_states.clear()
+        self._validators.clear()
+        self._not_modified.clear()
+        for start in range(0, len(urls), 500):
+            stmt = select(FetchState.url, FetchState.etag, FetchState.last_modified, FetchState.raw_hash).where(
+                FetchState.url.in_(urls[start : start + 500])
+            )
+            for state in self.db.execute(stmt):
+                self._fetch_states[state.url] = state
+        self.db.commit()
+
+    def _conditional_headers(self, url: str) -> dict[str, str]:
+        state = self._fetch_states.get(url)
+        headers: dict[str, str] = {}
+        if state and state.etag:
+            headers["If-None-Match"] = state.etag
+        if state and state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+        return headers
+
+    def _read_response(self, url: str, response: httpx.Response) -> str | None:
+        if response.status_code == 304:
+            self._not_modified.add(url)
+            return None
+        response.raise_for_status()
+        self._validators[url] = (response.headers.get("etag"), response.headers.get("last-modified"))
+        return response.text
+
+    def _save_fetch_states(self, entries: list[tuple[str, str | None]], now: datetime) -> None:
+        fetched = [(url, raw_hash) for url, raw_hash in entries if url not in self._not_modified]
+        not_modified = [url for url, _ in entries if url in self._not_modified]
+        if fetched:
+            rows = [
+                {"url": url, **self._validator_fields(url), "raw_hash": raw_hash, "fetched_at": now}
+                for url, raw_hash in fetched
+            ]
+            stmt = dialect_insert(self.db, FetchState).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[FetchState.url],
+                set_={
+                    "etag": stmt.excluded.etag,
+                    "last_modified": stmt.excluded.last_modified,
+                    "raw_hash": stmt.excluded.raw_hash,
+                    "fetched_at": stmt.excluded.fetched_at,
+                },
+            )
+            self.db.execute(stmt)
+        if not_modified:
+            self.db.execute(update(FetchState).where(FetchState.url.in_(not_modified)).values(fetched_at=now))
+
+    def _validator_fields(self, url: str) -> dict[str, str | None]:
+        if url in self._validators:
+            etag, last_modified = self._validators[url]
+        else:
+            state = self._fetch_states.get(url)
+            etag, last_modified = (state.etag, state.last_modified) if state else (None, None)
+        return {"etag": etag, "last_modified": last_modified}
+
     def _discover_links(self, seed_urls: list[str]) -> list[str]:
         links: set[str] = set()
         for seed in seed_urls:
             html = self._safe_get(seed)
-            if not html:
-                continue
-            soup = BeautifulSoup(html, "html.parser")
-            for a in soup.select("a[href]"):
-                absolute = urljoin(seed, a.get("href", ""))
-                if absolute.startswith("http"):
-                    links.add(absolute.split("#")[0])
+            if html:
+                links.update(ParsedDocument(html, base_url=seed).links())
         return sorted(links)
 
-    def _extract_title(self, html: str) -> str | None:
-        soup = BeautifulSoup(html, "html.parser")
-        if soup.title and soup.title.string:
-            return soup.title.string.strip()
-        h1 = soup.find("h1")
-        return h1.get_text(strip=True) if h1 else None
+    async def _discover_links_async(self, client: httpx.AsyncClient, seed_urls: list[str]) -> list[str]:
+        pages = await asyncio.gather(*(self._safe_get_async(client, seed) for seed in seed_urls))
+        links: set[str] = set()
+        for seed, html in zip(seed_urls, pages):
+            if html:
+                links.update(ParsedDocument(html, base_url=seed).links())
+        return sorted(links)
 
-    def _download_html(self, url: str) -> str | None:
-        if settings.use_playwright_render and self._needs_browser_render(url):
+    def _download_html(self, url: str) -> tuple[str | None, bool]:
+        if self._render_first(url):
             rendered = self._fetch_with_render_service(url)
             if rendered:
-                return rendered
-        return self._safe_get(url)
-
-    def _needs_browser_render(self, url: str) -> bool:
-        lowered = url.lower()
-        dynamic_hints = ["#/", "?page=", "arama", "search", "query", "spa"]
-        return any(hint in lowered for hint in dynamic_hints)
+                self.render_routes[ROUTE_PLANNED] += 1
+                return rendered, True
+        return self._safe_get(url, conditional=True), False
 
     def _fetch_with_render_service(self, url: str) -> str | None:
         try:
             response = self.client.post(
                 settings.render_service_url,
-                json={"url": url, "wait_until": "networkidle", "timeout_ms": settings.render_timeout_seconds * 1000},
+                json={"url": url, **self._render_options()},
                 timeout=settings.render_timeout_seconds,
             )
             response.raise_for_status()
             payload = response.json()
+            self._record_render_stats(url, payload)
             return payload.get("html")
-        except (httpx.HTTPError, ValueError):
+        except (httpx.HTTPError, ValueError) as exc:
+            self.timings.error("render", exc)
             return None
 
-    def _safe_get(self, url: str) -> str | None:
+    async def _render_batch_async(
+        self, client: httpx.AsyncClient, urls: list[str]
+    ) -> AsyncIterator[tuple[str, str | None]]:
+        for url in urls:
+            await self.rate_limiter.acquire(url)
+        pending = dict(enumerate(urls))
         try:
-            response = self.client.get(url)
-            response.raise_for_status()
-            return response.text
-        except httpx.HTTPError:
-            return None
-
-    def _extract_markdown(self, html: str) -> str | None:
-        extracted = trafilatura.extract(
-            html,
-            include_comments=False,
-            include_formatting=True,
-            output_format="markdown",
-        )
-        if extracted:
-            return extracted
-        if not settings.use_unstructured_fallback:
-            return None
-        return self._extract_with_unstructured(html)
+            async with client.stream(
+                "POST",
+                settings.render_service_url.rstrip("/") + "/batch",
+                json={"urls": urls, **self._render_options()},
+                timeout=settings.render_timeout_seconds * 2,
+            ) as response:
+                response.raise_for_status()
+                async for line in response.aiter_lines():
+                    if not line.strip():
+                        continue
+                    item = json.loads(line)
+                    url = pending.pop(item.get("index"), None)
+                    if url is not None:
+                        self._record_render_stats(url, item)
+                        yield url, item.get("html")
+        except (httpx.HTTPError, ValueError) as exc:
+            self.timings.error("render", exc)
+        for url in pending.values():
+            yield url, None
+
+    def _record_render_stats(self, url: str, payload: dict[str, object]) -> None:
+        if payload.get("error"):
+            self.timings.error("render", f"status_{payload.get('status', 'unknown')}")
+        stats = payload.get("stats")
+        if isinstance(stats, dict) and stats.get("render_ms") is not None:
+            self.timings.add("render", stats["render_ms"] / 1000, _host(url))
+
+    def _render_options(self) -> dict[str, object]:
+        return {
+            "wait_until": settings.render_wait_until,
+            "timeout_ms": settings.render_timeout_seconds * 1000,
+            "wait_for_selector": settings.render_wait_for_selector,
+            "idle_ms": settings.render_idle_ms,
+            "idle_timeout_ms": settings.render_idle_timeout_ms,
+            "block_resource_types": settings.render_block_resource_types,
+            "block_url_patterns": settings.render_block_url_patterns,
+        }
 
-    def _extract_with_unstructured(self, html: str) -> str | None:
+    def _safe_get(self, url: str, conditional: bool = False) -> str | None:
+        headers = self._conditional_headers(url) if conditional else None
         try:
-            from unstructured.partition.html import partition_html
-        except Exception:
+            with self.timings.measure("download", _host(url)):
+                response = self.client.get(url, headers=headers)
+            return self._read_response(url, response)
+        except httpx.HTTPError as exc:
+            self.timings.error("download", exc)
             return None
 
+    async def _safe_get_async(self, client: httpx.AsyncClient, url: str, conditional: bool = False) -> str | None:
+        await self.rate_limiter.acquire(url)
+        headers = self._conditional_headers(url) if conditional else None
         try:
-            elements = partition_html(text=html)
-            lines = [str(element).strip() for element in elements if str(element).strip()]
-            if not lines:
-                return None
-            return "\n\n".join(lines)
-        except Exception:
+            with self.timings.measure("download", _host(url)):
+                response = await client.get(url, headers=headers)
+            return self._read_response(url, response)
+        except httpx.HTTPError as exc:
+            self.timings.error("download", exc)
             return None
 
-    def _canonicalize_url(self, url: str) -> str:
-        parsed = urlparse(url)
-        path = parsed.path.rstrip("/") or "/"
-        return f"{parsed.scheme}://{parsed.netloc}{path}"
-
-    def _extract_metadata(self, *, title: str, url: str, plain_text: str) -> dict[str, str | None]:
-        lower = f"{title} {url} {plain_text[:2000]}".lower()
-
-        instrument_type = None
-        for keyword in ["kanun", "yönetmelik", "tebliğ", "genelge", "karar", "anayasa"]:
-            if keyword in lower:
-                instrument_type = keyword
-                break
+    def _extract_executor(self) -> ProcessPoolExecutor | nullcontext[ProcessPoolExecutor | None]:
+        if self.executor is not None:
+            return nullcontext(self.executor)
+        return create_extract_executor() or nullcontext()
 
-        institution = None
-        for keyword in ["cumhurbaşkanlığı", "bakanlığı", "tbmm", "resmî gazete", "resmi gazete"]:
-            if keyword in lower:
-                institution = keyword
-                break
-
-        article_no = None
-        article_match = re.search(r"madde\s*(\d+[/-]?\w*)", lower)
-        if article_match:
-            article_no = article_match.group(1)
+    def _async_client(self) -> httpx.AsyncClient:
+        concurrency = max(1, settings.fetch_concurrency)
+        return httpx.AsyncClient(
+            headers={"User-Agent": settings.user_agent},
+            timeout=settings.request_timeout_seconds,
+            follow_redirects=True,
+            http2=settings.http2_enabled and importlib.util.find_spec("h2") is not None,
+            limits=httpx.Limits(max_connections=concurrency * 2, max_keepalive_connections=concurrency),
+            transport=self.async_transport,
+        )
 
-        return {
-            "instrument_type": instrument_type,
-            "institution": institution,
-            "article_no": article_no,
+    def _upsert_regulations(self, pages: list[dict[str, object]], now: datetime) -> None:
+        urls = [page["url"] for page in pages]
+        existing = {
+            row.url: row
+            for row in self.db.execute(
+                select(
+                    Regulation.id,
+                    Regulation.url,
+                    Regulation.content_hash,
+                    Regulation.normalized_hash,
+                    Regulation.simhash,
+                    Regulation.duplicate_of_id,
+                ).where(Regulation.url.in_(urls))
+            )
         }
+        pages, deferred = self._resolve_near_duplicates(pages, existing, now)
+        if not pages:
+            return
+        changed_ids = [
+            existing[page["url"]].id
+            for page in pages
+            if page["url"] in existing and existing[page["url"]].content_hash != page["content_hash"]
+        ]
+        previous_texts: dict[int, str | None] = {}
+        stored_versions: dict[int, int] = {}
+        if changed_ids:
+            previous_texts = dict(
+                self.db.execute(
+                    select(Regulation.id, Regulation.content_markdown).where(Regulation.id.in_(changed_ids))
+                ).all()
+            )
+            stored_versions = dict(
+                self.db.execute(
+                    select(RegulationVersion.regulation_id, func.max(RegulationVersion.version))
+                    .where(RegulationVersion.regulation_id.in_(changed_ids), RegulationVersion.payload.is_not(None))
+                    .group_by(RegulationVersion.regulation_id)
+                ).all()
+            )
 
-    def _upsert_regulation(
-        self,
-        *,
-        title: str,
-        url: str,
-        canonical_url: str,
-        source: str,
-        instrument_type: str | None,
-        institution: str | None,
-        article_no: str | None,
-        content_markdown: str,
-        content_text: str,
-        content_hash: str,
-    ) -> bool:
-        stmt = select(Regulation).where(Regulation.url == url)
-        existing = self.db.scalars(stmt).first()
-
-        if existing:
-            changed = existing.content_hash != content_hash
-            if changed:
-                existing.version += 1
-                self._create_version_snapshot(existing.id, existing.version, content_hash, existing.content_text or "", content_text)
-            existing.title = title
-            existing.source = source
-            existing.canonical_url = canonical_url
-            existing.instrument_type = instrument_type
-            existing.institution = institution
-            existing.article_no = article_no
-            existing.content_markdown = content_markdown
-            existing.content_text = content_text
-            existing.content_hash = content_hash
-            existing.last_seen_at = datetime.utcnow()
-            return changed
-
-        row = Regulation(
-            title=title,
-            url=url,
-            source=source,
-            canonical_url=canonical_url,
-            instrument_type=instrument_type,
-            institution=institution,
-            article_no=article_no,
-            content_markdown=content_markdown,
-            content_text=content_text,
-            content_hash=content_hash,
-            version=1,
-            last_seen_at=datetime.utcnow(),
-            created_at=datetime.utcnow(),
+        columns = [{key: value for key, value in page.items() if key != "articles"} for page in pages]
+        stmt = dialect_insert(self.db, Regulation).values(
+            [{**values, "version": 1, "last_seen_at": now, "created_at": now} for values in columns]
         )
-        self.db.add(row)
-        self.db.flush()
-        self._create_version_snapshot(row.id, 1, content_hash, "", content_text)
-        return True
-
-    def _create_version_snapshot(
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Regulation.url],
+            set_={
+                "title": stmt.excluded.title,
+                "source": stmt.excluded.source,
+                "canonical_url": stmt.excluded.canonical_url,
+                "instrument_type": stmt.excluded.instrument_type,
+                "institution": stmt.excluded.institution,
+                "article_no": stmt.excluded.article_no,
+                "instrument_number": stmt.excluded.instrument_number,
+                "gazette_number": stmt.excluded.gazette_number,
+                "published_at": stmt.excluded.published_at,
+                "content_markdown": stmt.excluded.content_markdown,
+                "content_text": stmt.excluded.content_text,
+                "content_hash": stmt.excluded.content_hash,
+                "normalized_hash": stmt.excluded.normalized_hash,
+                "simhash": stmt.excluded.simhash,
+                "duplicate_of_id": stmt.excluded.duplicate_of_id,
+                "version": Regulation.version
+                + case(
+                    (
+                        and_(
+                            Regulation.content_hash.is_distinct_from(stmt.excluded.content_hash),
+                            stmt.excluded.duplicate_of_id.is_(None),
+                        ),
+                        1,
+                    ),
+                    else_=0,
+                ),
+                "last_seen_at": stmt.excluded.last_seen_at,
+            },
+        ).returning(Regulation.id, Regulation.url, Regulation.version)
+        saved = {row.url: row for row in self.db.execute(stmt)}
+
+        versions: list[dict[str, object]] = []
+        events: list[dict[str, object]] = []
+        signatures: dict[int, int | None] = {}
+        articles: dict[int, list[dict[str, object]]] = {}
+        for page in pages:
+            row = saved[page["url"]]
+            previous = existing.get(page["url"])
+            articles[row.id] = page["articles"] if page["duplicate_of_id"] is None else []
+            if previous is not None and previous.content_hash == page["content_hash"]:
+                if previous.simhash is None and page["duplicate_of_id"] is None:
+                    signatures[row.id] = page["simhash"]
+                self._finished[page["url"]] = PAGE_UNCHANGED
+                self.outcomes[PAGE_UNCHANGED] += 1
+                continue
+            if page["duplicate_of_id"] is not None:
+                signatures[row.id] = None
+                self._chunk_documents[row.id] = None
+                self._finished[page["url"]] = PAGE_DUPLICATE
+                self.outcomes[PAGE_DUPLICATE] += 1
+                continue
+            signatures[row.id] = page["simhash"]
+            self._chunk_documents[row.id] = page["content_markdown"]
+            previous_text = previous_texts.get(previous.id) if previous is not None else None
+            chained = previous is not None and stored_versions.get(previous.id) == row.version - 1
+            version = self._version_row(
+                row.id, row.version, page["content_hash"], previous_text, page["content_markdown"], chained, now
+            )
+            versions.append(version)
+            events.append(
+                {
+                    "regulation_id": row.id,
+                    "version": row.version,
+                    "kind": CHANGE_CREATED if previous is None else CHANGE_UPDATED,
+                    "title": page["title"],
+                    "url": page["url"],
+                    "content_hash": page["content_hash"],
+                    "summary": version["summary"],
+                    "created_at": now,
+                }
+            )
+            self._finished[page["url"]] = PAGE_CHANGED
+            self.outcomes[PAGE_CHANGED] += 1
+        if versions:
+            self.db.execute(insert(RegulationVersion), versions)
+            self.db.execute(insert(ChangeEvent), events)
+        ArticleIndex(self.db).replace(articles)
+        if settings.near_duplicate_enabled:
+            NearDuplicateIndex(self.db).replace(signatures)
+        if deferred:
+            self._upsert_regulations(deferred, now)
+
+    def _resolve_near_duplicates(
+        self, pages: list[dict[str, object]], existing: dict[str, Row], now: datetime
+    ) -> tuple[list[dict[str, object]], list[dict[str, object]]]:
+        if not settings.near_duplicate_enabled:
+            return [{**page, "duplicate_of_id": None} for page in pages], []
+
+        index = NearDuplicateIndex(self.db)
+        resolved: list[dict[str, object]] = []
+        deferred: list[dict[str, object]] = []
+        cosmetic: list[str] = []
+        batch_hashes: list[int] = []
+        for page in pages:
+            previous = existing.get(page["url"])
+            value = page["simhash"]
+            if previous is not None and previous.content_hash == page["content_hash"]:
+                resolved.append({**page, **self._duplicate_fields(previous.duplicate_of_id)})
+                continue
+            if (
+                previous is not None
+                and previous.duplicate_of_id is None
+                and previous.normalized_hash is not None
+                and previous.normalized_hash == page["normalized_hash"]
+            ):
+                cosmetic.append(page["url"])
+                continue
+            canonical_id = index.find(value, exclude_id=previous.id if previous else None) if value is not None else None
+            if canonical_id is None and any(is_near_duplicate(value, other) for other in batch_hashes):
+                deferred.append(page)
+                continue
+            if canonical_id is None and value is not None:
+                batch_hashes.append(value)
+            resolved.append({**page, **self._duplicate_fields(canonical_id)})
+
+        if cosmetic:
+            self.db.execute(update(Regulation).where(Regulation.url.in_(cosmetic)).values(last_seen_at=now))
+            for url in cosmetic:
+                self._finished[url] = PAGE_UNCHANGED
+            self.outcomes[PAGE_UNCHANGED] += len(cosmetic)
+        return resolved, deferred
+
+    def _duplicate_fields(self, duplicate_of_id: int | None) -> dict[str, object]:
+        if duplicate_of_id is None:
+            return {"duplicate_of_id": None}
+        return {"duplicate_of_id": duplicate_of_id, "content_markdown": None, "content_text": None}
+
+    def _version_row(
         self,
         regulation_id: int,
         version: int,
         content_hash: str,
-        previous_text: str,
+        previous_text: str | None,
         current_text: str,
-    ) -> None:
-        prev_lines = previous_text.splitlines()[:120]
-        curr_lines = current_text.splitlines()[:120]
-        diff = difflib.unified_diff(prev_lines, curr_lines, n=1)
-        summary = " | ".join(list(diff)[:8])[:1000]
-        snapshot = RegulationVersion(
-            regulation_id=regulation_id,
-            content_hash=content_hash,
-            version=version,
-            summary=summary or "İlk versiyon",
-            created_at=datetime.utcnow(),
-        )
-        self.db.add(snapshot)
+        chained: bool,
+        now: datetime,
+    ) -> dict[str, object]:
+        force_keyframe = not chained or (version - 1) % max(1, settings.version_keyframe_interval) == 0
+        kind, payload, summary = encode_version(previous_text, current_text, force_keyframe)
+        return {
+            "regulation_id": regulation_id,
+            "content_hash": content_hash,
+            "version": version,
+            "summary": summary or "İlk versiyon",
+            "payload_kind": kind,
+            "payload": payload,
+            "created_at": now,
+        }
+
+
+def create_extract_executor() -> ProcessPoolExecutor | None:
+    if settings.extract_workers <= 0:
+        return None
+    return ProcessPoolExecutor(max_workers=settings.extract_workers, mp_context=multiprocessing.get_context("spawn"))
+
 
-    def _write_processed(self, url: str, markdown: str) -> None:
-        file_name = hashlib.md5(url.encode("utf-8")).hexdigest() + ".md"
-        file_path = Path(settings.processed_output_dir) / file_name
-        file_path.write_text(markdown, encoding="utf-8")
+def _host(url: str) -> str:
+    return urlparse(url).netloc.lower()
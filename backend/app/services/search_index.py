@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import re
+
+from sqlalchemy import Engine, column, literal_column, select, table, text
+from sqlalchemy.orm import Session
+
+from app.models import Regulation
+from app.services.pagination import SUMMARY_COLUMNS
+
+FTS_TABLE = "regulations_fts"
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+TURKISH_FOLD = str.maketrans({"İ": "I", "ı": "i"})
+
+
+def _fold_sql(expression: str) -> str:
+    return f"replace(replace({expression}, 'İ', 'I'), 'ı', 'i')"
+
+
+SEARCH_INDEX_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, content_text,
+        content='regulations', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON regulations BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, content_text)
+        VALUES (new.id, {_fold_sql("new.title")}, {_fold_sql("new.content_text")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON regulations BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content_text)
+        VALUES ('delete', old.id, {_fold_sql("old.title")}, {_fold_sql("old.content_text")});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, content_text ON regulations
+    WHEN old.title IS NOT new.title OR old.content_text IS NOT new.content_text BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, content_text)
+        VALUES ('delete', old.id, {_fold_sql("old.title")}, {_fold_sql("old.content_text")});
+        INSERT INTO {FTS_TABLE}(rowid, title, content_text)
+        VALUES (new.id, {_fold_sql("new.title")}, {_fold_sql("new.content_text")});
+    END
+    """,
+]
+
+fts_table = table(FTS_TABLE, column("rowid"))
+
+
+def search_index_supported(bind: Engine | Session) -> bool:
+    engine = bind.get_bind() if isinstance(bind, Session) else bind
+    return engine.dialect.name == "sqlite"
+
+
+def ensure_search_index(engine: Engine) -> None:
+    if not search_index_supported(engine):
+        return
+    with engine.begin() as connection:
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": FTS_TABLE}
+        ).first()
+        for statement in SEARCH_INDEX_DDL:
+            connection.execute(text(statement))
+    if not exists:
+        with Session(engine) as db:
+            rebuild_search_index(db)
+
+
+def rebuild_search_index(db: Session) -> int:
+    db.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')"))
+    db.execute(
+        text(
+            f"INSERT INTO {FTS_TABLE}(rowid, title, content_text) "
+            f"SELECT id, {_fold_sql('title')}, {_fold_sql('content_text')} FROM regulations"
+        )
+    )
+    db.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"))
+    db.commit()
+    return int(db.scalar(text("SELECT count(*) FROM regulations")) or 0)
+
+
+def build_match_query(query: str) -> str | None:
+    tokens = TOKEN_PATTERN.findall(query.translate(TURKISH_FOLD))
+    if not tokens:
+        return None
+    quoted = [f'"{token}"' for token in tokens]
+    quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+def search_regulations_fts(db: Session, query: str, limit: int, order: str) -> list[dict[str, object]]:
+    match_query = build_match_query(query)
+    if match_query is None:
+        return []
+    score = literal_column(f"bm25({FTS_TABLE}, 10.0, 1.0)").label("score")
+    stmt = (
+        select(
+            *SUMMARY_COLUMNS,
+            literal_column(f"snippet({FTS_TABLE}, -1, '<mark>', '</mark>', '…', 24)").label("snippet"),
+            score,
+        )
+        .select_from(fts_table.join(Regulation, Regulation.id == fts_table.c.rowid))
+        .where(literal_column(FTS_TABLE).op("MATCH")(match_query))
+        .where(Regulation.duplicate_of_id.is_(None))
+        .order_by(Regulation.last_seen_at.desc() if order == "recent" else score)
+        .limit(limit)
+    )
+    return [dict(row) for row in db.execute(stmt).mappings()]
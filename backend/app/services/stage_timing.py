@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import math
+import time
+from collections import Counter, defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from app.services.metrics import FALLBACK_RESULTS, STAGE_ERRORS, STAGE_SECONDS
+
+FALLBACK_HIT = "hit"
+FALLBACK_MISS = "miss"
+
+
+class StageTimings:
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = defaultdict(list)
+        self.host_samples: dict[str, dict[str, list[float]]] = defaultdict(lambda: defaultdict(list))
+        self.errors: Counter[tuple[str, str]] = Counter()
+        self.fallbacks: Counter[str] = Counter()
+
+    def add(self, stage: str, seconds: float, host: str = "") -> None:
+        self.samples[stage].append(seconds)
+        if host:
+            self.host_samples[host][stage].append(seconds)
+        STAGE_SECONDS.labels(stage=stage, host=host).observe(seconds)
+
+    @contextmanager
+    def measure(self, stage: str, host: str = "") -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - started, host)
+
+    def error(self, stage: str, error: BaseException | str) -> None:
+        name = error if isinstance(error, str) else type(error).__name__
+        self.errors[(stage, name)] += 1
+        STAGE_ERRORS.labels(stage=stage, error=name).inc()
+
+    def fallback(self, result: str) -> None:
+        self.fallbacks[result] += 1
+        FALLBACK_RESULTS.labels(result=result).inc()
+
+    def clear(self) -> None:
+        self.samples.clear()
+        self.host_samples.clear()
+        self.errors.clear()
+        self.fallbacks.clear()
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return _summarize(self.samples)
+
+    def trace(self) -> dict[str, object]:
+        attempts = self.fallbacks[FALLBACK_HIT] + self.fallbacks[FALLBACK_MISS]
+        return {
+            "stages": self.summary(),
+            "hosts": {host: _summarize(stages) for host, stages in sorted(self.host_samples.items())},
+            "errors": [
+                {"stage": stage, "error": name, "count": count}
+                for (stage, name), count in self.errors.most_common()
+            ],
+            "fallback": {
+                **{result: self.fallbacks[result] for result in (FALLBACK_HIT, FALLBACK_MISS)},
+                "hit_rate": round(self.fallbacks[FALLBACK_HIT] / attempts, 3) if attempts else None,
+            },
+        }
+
+
+def _summarize(samples: dict[str, list[float]]) -> dict[str, dict[str, float]]:
+    return {
+        stage: {
+            "count": len(values),
+            "p50_ms": round(_percentile(sorted(values), 0.50) * 1000, 2),
+            "p95_ms": round(_percentile(sorted(values), 0.95) * 1000, 2),
+            "total_s": round(sum(values), 3),
+        }
+        for stage, values in samples.items()
+        if values
+    }
+
+
+def _percentile(values: list[float], quantile: float) -> float:
+    return values[max(0, math.ceil(quantile * len(values)) - 1)]
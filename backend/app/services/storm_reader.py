@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+from collections.abc import Iterator
+from pathlib import Path
+
+from app.config import settings
+from app.services.frontier import UrlFrontier
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float) -> None:
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def add(self, value: str) -> bool:
+        added = False
+        for position in self._positions(value):
+            byte, mask = position >> 3, 1 << (position & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                added = True
+        return added
+
+    def __contains__(self, value: str) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(value))
+
+    def load(self, path: Path) -> bool:
+        if not path.exists() or path.stat().st_size != len(self.bits):
+            return False
+        self.bits = bytearray(path.read_bytes())
+        return True
+
+    def save(self, path: Path) -> None:
+        temporary = path.with_suffix(".tmp")
+        temporary.write_bytes(self.bits)
+        temporary.replace(path)
+
+    def _positions(self, value: str) -> Iterator[int]:
+        digest = hashlib.blake2b(value.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for index in range(self.hash_count):
+            yield (first + index * second) % self.size
+
+
+class StormUrlReader:
+    def __init__(self, path: str | Path, state_dir: str | Path | None = None) -> None:
+        self.path = Path(path)
+        state = Path(state_dir or settings.storm_state_dir)
+        self.checkpoint_path = state / f"{self.path.name}.checkpoint.json"
+        self.bloom_path = state / f"{self.path.name}.bloom"
+        self.bloom = BloomFilter(settings.storm_bloom_capacity, settings.storm_bloom_error_rate)
+        self.offset = 0
+        self.read_lines = 0
+        self.new_urls = 0
+        self._pending_offset = 0
+
+    def iter_new_urls(self, frontier: UrlFrontier | None = None) -> Iterator[str]:
+        self._load_checkpoint()
+        self._pending_offset = self.offset
+        self.read_lines = 0
+        self.new_urls = 0
+        if not self.path.exists():
+            return
+        maybe_seen: list[str] = []
+        with self.path.open("rb") as handle:
+            handle.seek(self.offset)
+            for raw in handle:
+                if not raw.endswith(b"\n"):
+                    break
+                self._pending_offset += len(raw)
+                self.read_lines += 1
+                url = raw.decode("utf-8", errors="replace").strip()
+                if not url.startswith("http"):
+                    continue
+                if self.bloom.add(url):
+                    self.new_urls += 1
+                    yield url
+                elif frontier is not None:
+                    maybe_seen.append(url)
+                    if len(maybe_seen) >= 500:
+                        yield from self._unknown(frontier, maybe_seen)
+                        maybe_seen = []
+        if frontier is not None:
+            yield from self._unknown(frontier, maybe_seen)
+
+    def feed(self, frontier: UrlFrontier) -> int:
+        frontier.add(self.iter_new_urls(frontier))
+        self.commit()
+        return self.new_urls
+
+    def _unknown(self, frontier: UrlFrontier, urls: list[str]) -> Iterator[str]:
+        known = frontier.entries(list(dict.fromkeys(urls)))
+        for url in dict.fromkeys(urls):
+            if url not in known:
+                self.new_urls += 1
+                yield url
+
+    def commit(self) -> None:
+        self.checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+        self.offset = self._pending_offset
+        self.bloom.save(self.bloom_path)
+        stat = self.path.stat() if self.path.exists() else None
+        temporary = self.checkpoint_path.with_suffix(".tmp")
+        temporary.write_text(
+            json.dumps({"offset": self.offset, "inode": stat.st_ino if stat else None}),
+            encoding="utf-8",
+        )
+        temporary.replace(self.checkpoint_path)
+
+    def _load_checkpoint(self) -> None:
+        self.offset = 0
+        if not self.checkpoint_path.exists() or not self.path.exists():
+            return
+        checkpoint = json.loads(self.checkpoint_path.read_text(encoding="utf-8"))
+        stat = self.path.stat()
+        if checkpoint.get("inode") != stat.st_ino or checkpoint.get("offset", 0) > stat.st_size:
+            return
+        if self.bloom.load(self.bloom_path):
+            self.offset = int(checkpoint["offset"])
+
+
+_stats_cache: dict[str, dict[str, int]] = {}
+
+
+def count_storm_urls(path: str | Path) -> int:
+    path = Path(path)
+    if not path.exists():
+        return 0
+    stat = path.stat()
+    cached = _stats_cache.get(str(path))
+    if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+        return cached["lines"] + cached["partial"]
+
+    position, lines, partial = 0, 0, 0
+    if cached and cached["size"] < stat.st_size:
+        position, lines = cached["position"], cached["lines"]
+    with path.open("rb") as handle:
+        handle.seek(position)
+        for raw in handle:
+            if not raw.endswith(b"\n"):
+                partial = 1 if raw.strip() else 0
+                break
+            position += len(raw)
+            if raw.strip():
+                lines += 1
+    _stats_cache[str(path)] = {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "position": position,
+        "lines": lines,
+        "partial": partial,
+    }
+    return lines + partial
@@ -0,0 +1,312 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from sqlalchemy import Row, bindparam, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Regulation, RegulationChunk
+from app.services.chunking import split_articles
+from app.services.embeddings import get_embedder
+from app.services.pagination import SUMMARY_COLUMNS
+
+VECTOR_FILE = "vectors.f32"
+META_FILE = "meta.json"
+CENTROID_FILE = "centroids.npy"
+ASSIGN_BATCH_SIZE = 50_000
+TRAIN_SAMPLE_PER_CLUSTER = 64
+SNIPPET_CHARS = 400
+
+_centroid_cache: dict[Path, tuple[tuple[int, int], np.ndarray]] = {}
+
+
+class VectorStoreMismatch(RuntimeError):
+    pass
+
+
+class VectorStore:
+    def __init__(self, root: str | Path | None = None) -> None:
+        self.root = Path(root or settings.vector_dir)
+        self.vector_path = self.root / VECTOR_FILE
+        self.meta_path = self.root / META_FILE
+        self.centroid_path = self.root / CENTROID_FILE
+
+    def meta(self) -> dict[str, object] | None:
+        if not self.meta_path.exists():
+            return None
+        return json.loads(self.meta_path.read_text(encoding="utf-8"))
+
+    def write_meta(self, meta: dict[str, object]) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        temporary = self.meta_path.with_suffix(".tmp")
+        temporary.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(temporary, self.meta_path)
+
+    def ensure(self, identity: str, dim: int) -> dict[str, object]:
+        meta = self.meta()
+        if meta is None:
+            meta = {"identity": identity, "dim": dim, "trained_rows": 0}
+            self.write_meta(meta)
+        elif meta["identity"] != identity or meta["dim"] != dim:
+            raise VectorStoreMismatch(
+                f"Embedding modeli değişti ({meta['identity']} → {identity}); "
+                "worker/rebuild_vector_index.py --reset çalıştırın"
+            )
+        return meta
+
+    def count(self) -> int:
+        meta = self.meta()
+        if meta is None or not self.vector_path.exists():
+            return 0
+        return self.vector_path.stat().st_size // (int(meta["dim"]) * 4)
+
+    def append(self, vectors: np.ndarray) -> int:
+        meta = self.meta()
+        row_bytes = int(meta["dim"]) * 4
+        fd = os.open(self.vector_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size % row_bytes:
+                os.ftruncate(fd, size - size % row_bytes)
+            first = size // row_bytes
+            os.write(fd, np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return first
+
+    def matrix(self) -> np.ndarray | None:
+        count = self.count()
+        if count == 0:
+            return None
+        return np.memmap(self.vector_path, dtype=np.float32, mode="r", shape=(count, int(self.meta()["dim"])))
+
+    def centroids(self) -> np.ndarray | None:
+        if not self.centroid_path.exists():
+            return None
+        stat = self.centroid_path.stat()
+        key = (stat.st_mtime_ns, stat.st_size)
+        cached = _centroid_cache.get(self.centroid_path)
+        if cached is None or cached[0] != key:
+            cached = (key, np.load(self.centroid_path))
+            _centroid_cache[self.centroid_path] = cached
+        return cached[1]
+
+    def save_centroids(self, centroids: np.ndarray, trained_rows: int) -> None:
+        temporary = self.root / f"{CENTROID_FILE}.tmp"
+        with temporary.open("wb") as handle:
+            np.save(handle, centroids.astype(np.float32))
+        os.replace(temporary, self.centroid_path)
+        self.write_meta({**self.meta(), "trained_rows": trained_rows, "clusters": len(centroids)})
+
+    def replace_vectors(self, vectors_path: Path) -> None:
+        os.replace(vectors_path, self.vector_path)
+
+    def reset(self) -> None:
+        for path in (self.vector_path, self.meta_path, self.centroid_path):
+            path.unlink(missing_ok=True)
+
+
+class ChunkIndexer:
+    def __init__(self, db: Session, store: VectorStore | None = None) -> None:
+        self.db = db
+        self.store = store or VectorStore()
+
+    def index(self, documents: dict[int, str | None]) -> int:
+        if not documents:
+            return 0
+        rows, embedded = self.prepare(documents, self.reusable(list(documents)))
+        self.write(list(documents), rows)
+        return embedded
+
+    def reusable(self, ids: list[int]) -> dict[int, dict[str, tuple[int, int | None]]]:
+        found: dict[int, dict[str, tuple[int, int | None]]] = defaultdict(dict)
+        for start in range(0, len(ids), 500):
+            stmt = select(
+                RegulationChunk.regulation_id,
+                RegulationChunk.content_hash,
+                RegulationChunk.vector_row,
+                RegulationChunk.cluster,
+            ).where(RegulationChunk.regulation_id.in_(ids[start : start + 500]), RegulationChunk.vector_row.is_not(None))
+            for row in self.db.execute(stmt):
+                found[row.regulation_id][row.content_hash] = (row.vector_row, row.cluster)
+        return found
+
+    def prepare(
+        self, documents: dict[int, str | None], reusable: dict[int, dict[str, tuple[int, int | None]]]
+    ) -> tuple[list[dict[str, object]], int]:
+        embedder = get_embedder()
+        self.store.ensure(embedder.identity, embedder.dim)
+        now = datetime.utcnow()
+        rows: list[dict[str, object]] = []
+        pending: list[dict[str, object]] = []
+        for regulation_id, markdown in documents.items():
+            for chunk in split_articles(markdown):
+                previous = reusable.get(regulation_id, {}).get(chunk["content_hash"])
+                row = {"regulation_id": regulation_id, **chunk, "created_at": now}
+                row["vector_row"], row["cluster"] = previous if previous else (None, None)
+                if previous is None:
+                    pending.append(row)
+                rows.append(row)
+
+        if pending:
+            vectors = embedder.embed([row["content"] for row in pending])
+            first = self.store.append(vectors)
+            clusters = _assign(self.store.centroids(), vectors)
+            for offset, row in enumerate(pending):
+                row["vector_row"] = first + offset
+                row["cluster"] = clusters[offset] if clusters is not None else None
+        return rows, len(pending)
+
+    def write(self, ids: list[int], rows: list[dict[str, object]]) -> None:
+        for start in range(0, len(ids), 500):
+            self.db.execute(delete(RegulationChunk).where(RegulationChunk.regulation_id.in_(ids[start : start + 500])))
+        if rows:
+            self.db.execute(insert(RegulationChunk), rows)
+
+    def needs_training(self) -> bool:
+        count = self.store.count()
+        if count < settings.vector_ivf_min_rows:
+            return False
+        trained_rows = int(self.store.meta().get("trained_rows") or 0)
+        return self.store.centroids() is None or count >= 2 * trained_rows
+
+    def train(self) -> int:
+        matrix = self.store.matrix()
+        if matrix is None:
+            return 0
+        live = self._live_rows(matrix.shape[0])
+        self.db.commit()
+        if not live:
+            return 0
+        rows = np.unique(np.fromiter((row.vector_row for row in live), dtype=np.int64, count=len(live)))
+        clusters = min(4096, max(8, int(math.sqrt(len(rows)))), len(rows))
+        rng = np.random.default_rng(0)
+        sample = np.sort(rng.choice(rows, size=min(len(rows), clusters * TRAIN_SAMPLE_PER_CLUSTER), replace=False))
+        data = np.asarray(matrix[sample])
+        centroids = data[rng.choice(len(data), size=clusters, replace=False)].copy()
+        for _ in range(max(1, settings.vector_ivf_iterations)):
+            labels = np.argmax(data @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, data)
+            filled = np.bincount(labels, minlength=clusters) > 0
+            centroids[filled] = sums[filled]
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        assignments = self._assign_rows(matrix, rows, centroids)
+
+        trained_id = max(row.id for row in live)
+        matrix = self.store.matrix()
+        fresh = self._live_rows(matrix.shape[0], after_id=trained_id)
+        if fresh:
+            fresh_rows = np.unique(np.fromiter((row.vector_row for row in fresh), dtype=np.int64, count=len(fresh)))
+            assignments.update(self._assign_rows(matrix, fresh_rows, centroids))
+        self.store.save_centroids(centroids, trained_rows=matrix.shape[0])
+        updates = [
+            {"chunk_id": row.id, "cluster": assignments[row.vector_row]}
+            for row in live + fresh
+            if row.vector_row in assignments
+        ]
+        stmt = (
+            update(RegulationChunk.__table__)
+            .where(RegulationChunk.__table__.c.id == bindparam("chunk_id"))
+            .values(cluster=bindparam("cluster"))
+        )
+        for start in range(0, len(updates), 5000):
+            self.db.execute(stmt, updates[start : start + 5000])
+        return clusters
+
+    def _live_rows(self, count: int, after_id: int = 0) -> list[Row]:
+        return list(
+            self.db.execute(
+                select(RegulationChunk.id, RegulationChunk.vector_row).where(
+                    RegulationChunk.id > after_id,
+                    RegulationChunk.vector_row.is_not(None),
+                    RegulationChunk.vector_row < count,
+                )
+            )
+        )
+
+    def _assign_rows(self, matrix: np.ndarray, rows: np.ndarray, centroids: np.ndarray) -> dict[int, int]:
+        assignments: dict[int, int] = {}
+        for start in range(0, len(rows), ASSIGN_BATCH_SIZE):
+            batch = rows[start : start + ASSIGN_BATCH_SIZE]
+            labels = np.argmax(np.asarray(matrix[batch]) @ centroids.T, axis=1)
+            assignments.update(zip(batch.tolist(), labels.tolist()))
+        return assignments
+
+    def compact(self) -> int:
+        matrix = self.store.matrix()
+        if matrix is None:
+            return 0
+        live = self._live_rows(matrix.shape[0])
+        rows = np.unique(np.fromiter((row.vector_row for row in live), dtype=np.int64, count=len(live)))
+        mapping = {old: new for new, old in enumerate(rows.tolist())}
+        temporary = self.store.root / f"{VECTOR_FILE}.compact"
+        with temporary.open("wb") as handle:
+            for start in range(0, len(rows), ASSIGN_BATCH_SIZE):
+                handle.write(np.asarray(matrix[rows[start : start + ASSIGN_BATCH_SIZE]], dtype=np.float32).tobytes())
+            handle.flush()
+            os.fsync(handle.fileno())
+        updates = [{"id": row.id, "vector_row": mapping[row.vector_row]} for row in live]
+        for start in range(0, len(updates), 5000):
+            self.db.execute(update(RegulationChunk), updates[start : start + 5000])
+        self.store.replace_vectors(temporary)
+        return matrix.shape[0] - len(rows)
+
+
+def similarity_search(db: Session, query: str, limit: int) -> list[dict[str, object]]:
+    store = VectorStore()
+    meta = store.meta()
+    matrix = store.matrix()
+    if meta is None or matrix is None:
+        return []
+    embedder = get_embedder()
+    if embedder.identity != meta["identity"]:
+        raise VectorStoreMismatch(f"Vektör indeksi {meta['identity']} ile oluşturulmuş, etkin model {embedder.identity}")
+    vector = embedder.embed([query])[0]
+
+    stmt = select(RegulationChunk.id, RegulationChunk.vector_row).where(
+        RegulationChunk.vector_row.is_not(None), RegulationChunk.vector_row < matrix.shape[0]
+    )
+    centroids = store.centroids()
+    if centroids is not None:
+        probes = np.argsort(centroids @ vector)[::-1][: max(1, settings.vector_ivf_nprobe)]
+        stmt = stmt.where(RegulationChunk.cluster.in_(probes.tolist()))
+    candidates = list(db.execute(stmt))
+    if not candidates:
+        return []
+
+    rows = np.fromiter((row.vector_row for row in candidates), dtype=np.int64, count=len(candidates))
+    order = np.argsort(rows)
+    scores = np.empty(len(rows), dtype=np.float32)
+    scores[order] = np.asarray(matrix[rows[order]]) @ vector
+    top = np.argsort(scores)[::-1][: limit * 2]
+    ranked = {candidates[index].id: float(scores[index]) for index in top}
+
+    stmt = (
+        select(*SUMMARY_COLUMNS, RegulationChunk.id.label("chunk_id"), RegulationChunk.article, RegulationChunk.content)
+        .join(Regulation, Regulation.id == RegulationChunk.regulation_id)
+        .where(RegulationChunk.id.in_(list(ranked)), Regulation.duplicate_of_id.is_(None))
+    )
+    hits = []
+    for row in db.execute(stmt).mappings():
+        hit = {key: value for key, value in row.items() if key != "content"}
+        content = row["content"]
+        hit["snippet"] = content if len(content) <= SNIPPET_CHARS else content[:SNIPPET_CHARS].rsplit(" ", 1)[0] + "…"
+        hit["score"] = round(ranked[row["chunk_id"]], 4)
+        hits.append(hit)
+    hits.sort(key=lambda hit: hit["score"], reverse=True)
+    return hits[:limit]
+
+
+def _assign(centroids: np.ndarray | None, vectors: np.ndarray) -> list[int] | None:
+    if centroids is None:
+        return None
+    return np.argmax(vectors @ centroids.T, axis=1).tolist()
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import difflib
+import json
+import zlib
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import RegulationVersion
+
+KEYFRAME = "keyframe"
+DELTA = "delta"
+
+
+def encode_version(previous: str | None, current: str, force_keyframe: bool) -> tuple[str, bytes, str]:
+    current_lines = current.splitlines()
+    keyframe = zlib.compress(current.encode("utf-8"), 9)
+    if previous is None:
+        return KEYFRAME, keyframe, ""
+
+    previous_lines = previous.splitlines()
+    operations: list[list[object]] = []
+    changes: list[str] = []
+    matcher = difflib.SequenceMatcher(None, previous_lines, current_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            operations.append([i1, i2])
+            continue
+        if j2 > j1:
+            operations.append(current_lines[j1:j2])
+        changes.extend(f"-{line}" for line in previous_lines[i1:i2])
+        changes.extend(f"+{line}" for line in current_lines[j1:j2])
+    summary = " | ".join(changes[:8])[:1000]
+
+    delta = zlib.compress(json.dumps(operations, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), 9)
+    if force_keyframe or len(keyframe) <= len(delta):
+        return KEYFRAME, keyframe, summary
+    return DELTA, delta, summary
+
+
+def apply_version(previous: str | None, kind: str, payload: bytes) -> str:
+    data = zlib.decompress(payload).decode("utf-8")
+    if kind == KEYFRAME:
+        return data
+    previous_lines = (previous or "").splitlines()
+    lines: list[str] = []
+    for operation in json.loads(data):
+        if len(operation) == 2 and all(isinstance(item, int) for item in operation):
+            lines.extend(previous_lines[operation[0] : operation[1]])
+        else:
+            lines.extend(operation)
+    return "\n".join(lines)
+
+
+class VersionStore:
+    def __init__(self, db: Session) -> None:
+        self.db = db
+
+    def texts(self, regulation_id: int, first: int, last: int) -> dict[int, str]:
+        keyframe = self.db.scalar(
+            select(func.max(RegulationVersion.version)).where(
+                RegulationVersion.regulation_id == regulation_id,
+                RegulationVersion.payload_kind == KEYFRAME,
+                RegulationVersion.version <= first,
+            )
+        )
+        if keyframe is None:
+            return {}
+        stmt = (
+            select(RegulationVersion.version, RegulationVersion.payload_kind, RegulationVersion.payload)
+            .where(
+                RegulationVersion.regulation_id == regulation_id,
+                RegulationVersion.version.between(keyframe, last),
+            )
+            .order_by(RegulationVersion.version)
+        )
+        texts: dict[int, str] = {}
+        current: str | None = None
+        for version, kind, payload in self.db.execute(stmt):
+            if payload is None:
+                current = None
+                continue
+            if kind == DELTA and current is None:
+                continue
+            current = apply_version(current, kind, payload)
+            if version >= first:
+                texts[version] = current
+        return texts
+
+    def rebuild(self, regulation_id: int, version: int) -> str | None:
+        return self.texts(regulation_id, version, version).get(version)
+
+    def diff(self, regulation_id: int, from_version: int, to_version: int) -> list[str] | None:
+        low, high = sorted((from_version, to_version))
+        texts = self.texts(regulation_id, low, high)
+        if from_version not in texts or to_version not in texts:
+            return None
+        return list(
+            difflib.unified_diff(
+                texts[from_version].splitlines(),
+                texts[to_version].splitlines(),
+                fromfile=f"v{from_version}",
+                tofile=f"v{to_version}",
+                lineterm="",
+            )
+        )
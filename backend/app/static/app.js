@@ -3,8 +3,12 @@ const api = {
   renderHealth: 'http://localhost:9000/health',
   stats: '/ops/stats',
   ingest: '/ops/ingest',
+  jobs: '/ops/jobs?limit=1',
+  job: (id) => `/ops/jobs/${id}`,
+  cancelJob: (id) => `/ops/jobs/${id}/cancel`,
   regulations: '/regulations?limit=20',
   changes: '/changes/updated?limit=20',
+  changeStream: '/changes/stream',
   search: (q) => `/search?q=${encodeURIComponent(q)}`,
 };
 
@@ -61,12 +65,63 @@ async function loadChanges() {
   fillList('changeList', rows, (row) => `${row.id} | v${row.version} | ${row.title}`);
 }
 
+let changeTimer = null;
+
+function watchChanges() {
+  if (!window.EventSource) return;
+  const source = new EventSource(api.changeStream);
+  source.addEventListener('change', () => {
+    clearTimeout(changeTimer);
+    changeTimer = setTimeout(() => Promise.all([loadStats(), loadRegulations(), loadChanges()]), 500);
+  });
+}
+
+const finishedStatuses = ['succeeded', 'failed', 'cancelled'];
+let activeJobId = null;
+let jobTimer = null;
+
+function showJob(job) {
+  const active = job && !finishedStatuses.includes(job.status);
+  activeJobId = active ? job.id : null;
+  byId('cancelBtn').disabled = !active;
+  if (!job) return;
+  const details = job.status === 'succeeded' ? job.result : job.error ? { error: job.error } : job.progress;
+  byId('ingestResult').textContent = `#${job.id} ${job.kind}: ${job.status}\n${JSON.stringify(details ?? {}, null, 2)}`;
+}
+
+async function pollJob(id) {
+  clearTimeout(jobTimer);
+  const job = await safeJson(api.job(id));
+  showJob(job);
+  if (job && !finishedStatuses.includes(job.status)) {
+    jobTimer = setTimeout(() => pollJob(id), 2000);
+  } else if (job) {
+    await refreshAll();
+  }
+}
+
 async function runIngest() {
   const seed = byId('seedInput').value.trim();
-  byId('ingestResult').textContent = 'Çalışıyor...';
-  const result = await safeJson(`${api.ingest}?seed=${encodeURIComponent(seed)}`, { method: 'POST' });
-  byId('ingestResult').textContent = JSON.stringify(result ?? { error: 'Ingest başarısız' }, null, 2);
-  await refreshAll();
+  byId('ingestResult').textContent = 'Kuyruğa ekleniyor...';
+  const job = await safeJson(`${api.ingest}?seed=${encodeURIComponent(seed)}`, { method: 'POST' });
+  if (!job) {
+    byId('ingestResult').textContent = JSON.stringify({ error: 'Ingest kuyruğa eklenemedi' }, null, 2);
+    return;
+  }
+  await pollJob(job.id);
+}
+
+async function cancelIngest() {
+  if (activeJobId === null) return;
+  const job = await safeJson(api.cancelJob(activeJobId), { method: 'POST' });
+  if (job) await pollJob(job.id);
+}
+
+async function loadLatestJob() {
+  const jobs = await safeJson(api.jobs);
+  const job = jobs?.[0];
+  showJob(job);
+  if (activeJobId !== null) jobTimer = setTimeout(() => pollJob(job.id), 2000);
 }
 
 async function doSearch() {
@@ -82,6 +137,9 @@ async function refreshAll() {
 
 byId('refreshBtn').addEventListener('click', refreshAll);
 byId('ingestBtn').addEventListener('click', runIngest);
+byId('cancelBtn').addEventListener('click', cancelIngest);
 byId('searchBtn').addEventListener('click', doSearch);
 
 refreshAll();
+loadLatestJob();
+watchChanges();
@@ -0,0 +1,97 @@
+import os
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+DATA_DIR = Path(tempfile.mkdtemp(prefix="regulasyon-test-"))
+os.environ.update(
+    DATA_DIR=str(DATA_DIR),
+    DATABASE_URL=f"sqlite:///{(DATA_DIR / 'test.db').as_posix()}",
+    ARTIFACT_DIR=str(DATA_DIR / "artifacts"),
+    VECTOR_DIR=str(DATA_DIR / "vectors"),
+    STORM_STATE_DIR=str(DATA_DIR / "state"),
+    STORM_DISCOVERED_URLS_FILE=str(DATA_DIR / "stormcrawler" / "discovered_urls.txt"),
+    REQUEST_DELAY_SECONDS="0",
+    EXTRACT_WORKERS="0",
+    USE_PLAYWRIGHT_RENDER="false",
+    USE_UNSTRUCTURED_FALLBACK="false",
+    CHUNK_INDEX_ENABLED="false",
+)
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import httpx
+import pytest
+from sqlalchemy import update
+
+from app.db import Base, SessionLocal, engine, init_db
+from app.models import FrontierEntry
+from app.services import response_cache
+from app.services.scrape_pipeline import RegulationScrapePipeline
+
+init_db()
+
+
+@pytest.fixture(autouse=True)
+def clean_db():
+    yield
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    response_cache.get_response_cache().clear()
+    response_cache._generation = (0.0, None)
+
+
+@pytest.fixture
+def client():
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+def law_html(articles: list[str], title: str = "Örnek Kanun") -> str:
+    body = "".join(f"<p>MADDE {number} - {text}</p>" for number, text in enumerate(articles, start=1))
+    return f"<html><head><title>{title}</title></head><body><article><h1>{title}</h1>{body}</article></body></html>"
+
+
+class FakeSite:
+    def __init__(self) -> None:
+        self.pages: dict[str, str] = {}
+        self.etags: dict[str, str] = {}
+        self.requests: list[httpx.Request] = []
+        self.transport = httpx.MockTransport(self._handle)
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        html = self.pages.get(str(request.url))
+        if html is None:
+            return httpx.Response(404)
+        etag = self.etags.get(str(request.url))
+        if etag is None:
+            return httpx.Response(200, text=html)
+        if request.headers.get("if-none-match") == etag:
+            return httpx.Response(304, headers={"etag": etag})
+        return httpx.Response(200, text=html, headers={"etag": etag})
+
+    def pipeline(self, session) -> RegulationScrapePipeline:
+        return RegulationScrapePipeline(session, transport=self.transport, async_transport=self.transport)
+
+    def ingest(self, urls: list[str]) -> dict[str, int]:
+        with SessionLocal() as session:
+            session.execute(update(FrontierEntry).values(next_due_at=datetime(2000, 1, 1)))
+            session.commit()
+            return self.pipeline(session).ingest(seed_urls=[], extra_urls=urls)
+
+
+@pytest.fixture
+def site() -> FakeSite:
+    return FakeSite()
@@ -0,0 +1,85 @@
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.models import Regulation, RegulationVersion
+from app.services.near_duplicate import NearDuplicateIndex, hamming_distance, simhash, simhash_bands
+from tests.conftest import law_html
+
+TOPICS = {
+    "https://mevzuat.test/kanun/tapu": "Tapu sicilinde tescil edilen taşınmazların devri noter onayı ile yapılır",
+    "https://mevzuat.test/kanun/vergi": "Gelir vergisi beyannamesi mart ayının son gününe kadar verilir",
+    "https://mevzuat.test/kanun/trafik": "Sürücü belgesi olmadan motorlu araç kullananlara idari para cezası verilir",
+}
+
+
+def topic_articles(sentence: str) -> list[str]:
+    return [f"{sentence} ve {number} numaralı fıkra hükümleri saklıdır." for number in range(1, 41)]
+
+
+def flip_bits(value: int, positions: list[int]) -> int:
+    for position in positions:
+        value ^= 1 << position
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def test_batch_keeps_ids_and_bumps_only_changed_rows(site, db):
+    for url, sentence in TOPICS.items():
+        site.pages[url] = law_html(topic_articles(sentence))
+    assert site.ingest(list(TOPICS))["upserted"] == 3
+    ids = dict(db.execute(select(Regulation.url, Regulation.id)).all())
+    db.commit()
+
+    changed = "https://mevzuat.test/kanun/vergi"
+    site.pages[changed] = law_html(topic_articles(TOPICS[changed].replace("mart", "nisan")))
+    summary = site.ingest(list(TOPICS))
+
+    assert summary["changed"] == 1
+    assert dict(db.execute(select(Regulation.url, Regulation.id)).all()) == ids
+    versions = dict(db.execute(select(Regulation.url, Regulation.version)).all())
+    assert versions == {url: 2 if url == changed else 1 for url in TOPICS}
+    assert db.scalar(select(func.count()).select_from(RegulationVersion)) == 4
+
+
+def test_near_duplicate_in_the_same_batch_links_to_canonical(site, db):
+    url = "https://mevzuat.test/kanun/tapu"
+    copy_url = url + "?yazdir=1"
+    site.pages[url] = law_html(topic_articles(TOPICS[url]))
+    site.pages[copy_url] = law_html(topic_articles(TOPICS[url]) + ["Yazdırma görünümü."])
+
+    summary = site.ingest([url, copy_url])
+
+    assert summary["near_duplicates"] == 1
+    rows = list(db.execute(select(Regulation.id, Regulation.duplicate_of_id)))
+    canonical = [row.id for row in rows if row.duplicate_of_id is None]
+    assert len(canonical) == 1
+    assert [row.duplicate_of_id for row in rows if row.id not in canonical] == canonical
+
+
+def test_band_lookup_finds_the_closest_canonical(db):
+    base = simhash(" ".join(topic_articles(TOPICS["https://mevzuat.test/kanun/tapu"])))
+    width = 64 // (settings.near_duplicate_max_distance + 1)
+    spread = [band * width for band in range(settings.near_duplicate_max_distance)]
+    near = flip_bits(base, spread)
+    nearest = flip_bits(base, spread[:1])
+    far = flip_bits(base, list(range(0, 64, 4)))
+    rows = [
+        Regulation(title="Yakın", url="https://mevzuat.test/yakin", simhash=near),
+        Regulation(title="En yakın", url="https://mevzuat.test/en-yakin", simhash=nearest),
+        Regulation(title="Uzak", url="https://mevzuat.test/uzak", simhash=far),
+    ]
+    db.add_all(rows)
+    db.flush()
+    index = NearDuplicateIndex(db)
+    index.replace({row.id: row.simhash for row in rows})
+
+    shared = [left == right for left, right in zip(simhash_bands(base), simhash_bands(near))]
+    assert hamming_distance(base, near) == settings.near_duplicate_max_distance
+    assert any(shared)
+    assert index.find(base) == rows[1].id
+    assert index.find(base, exclude_id=rows[1].id) == rows[0].id
+
+    rows[1].duplicate_of_id = rows[0].id
+    index.replace({rows[0].id: far})
+    db.flush()
+
+    assert index.find(base) is None
@@ -0,0 +1,34 @@
+import sys
+from pathlib import Path
+
+from app.config import settings
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "scripts"))
+
+import benchmark_pipeline
+
+
+def test_synthetic_corpus_replays_every_page(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "use_playwright_render", True)
+    monkeypatch.setattr(settings, "max_pages_per_run", 100)
+    corpus = tmp_path / "corpus.jsonl.gz"
+    again = tmp_path / "again.jsonl.gz"
+    benchmark_pipeline.synthesize(corpus, pages=12, rendered_every=4, seed=3)
+    benchmark_pipeline.synthesize(again, pages=12, rendered_every=4, seed=3)
+
+    result = benchmark_pipeline.replay(corpus, repeat=2)
+
+    assert benchmark_pipeline.ReplayCorpus(corpus).static == benchmark_pipeline.ReplayCorpus(again).static
+    assert result["summary"]["upserted"] == 12
+    assert result["summary"]["rendered"] == 3
+    assert len(result["runs"]) == 2
+    assert benchmark_pipeline.regressions(result, result, 0.2) == []
+
+
+def test_regressions_flag_slower_stages():
+    baseline = {"pages_per_sec": 10.0, "stages": {"extract": {"count": 40, "p95_ms": 100.0}}}
+    result = {"pages_per_sec": 7.0, "stages": {"extract": {"count": 40, "p95_ms": 130.0}}}
+
+    assert len(benchmark_pipeline.regressions(result, baseline, 0.2)) == 2
+    assert benchmark_pipeline.regressions(result, baseline, 0.5) == []
+    assert len(benchmark_pipeline.regressions(result, baseline, 0.2, min_samples=50)) == 1
@@ -0,0 +1,88 @@
+import asyncio
+
+from prometheus_client import REGISTRY
+
+from app.config import settings
+from app.models import ChangeEvent, Regulation
+from app.services import change_feed
+from app.services.change_feed import CHANGE_CREATED, ChangeFeed
+from app.services.response_cache import bump_generation
+
+
+def add_events(db, count: int) -> list[int]:
+    regulation = db.query(Regulation).first()
+    if regulation is None:
+        regulation = Regulation(title="Akış Yönetmeliği", url="https://mevzuat.test/akis")
+        db.add(regulation)
+        db.flush()
+    events = [
+        ChangeEvent(
+            regulation_id=regulation.id,
+            version=regulation.version + index,
+            kind=CHANGE_CREATED,
+            title=regulation.title,
+            url=regulation.url,
+            content_hash=f"hash-{index}",
+        )
+        for index in range(count)
+    ]
+    db.add_all(events)
+    bump_generation(db)
+    db.commit()
+    return [event.id for event in events]
+
+
+def published(event_id: int) -> dict[str, object]:
+    return {"id": event_id, "regulation_id": 1, "version": 1, "kind": CHANGE_CREATED}
+
+
+def test_long_poll_resumes_from_cursor(db, monkeypatch):
+    monkeypatch.setattr(settings, "change_feed_poll_seconds", 0.01)
+    monkeypatch.setattr(settings, "response_cache_generation_ttl_seconds", 0)
+    existing = add_events(db, 3)
+
+    async def scenario() -> list[tuple[list[int], int]]:
+        feed = ChangeFeed()
+        polls = []
+        try:
+            cursor = 0
+            for _ in range(3):
+                events, cursor = await feed.wait(cursor, 2, 0)
+                polls.append(([event["id"] for event in events], cursor))
+            waiting = asyncio.create_task(feed.wait(cursor, 10, 2))
+            await asyncio.sleep(0.05)
+            await asyncio.to_thread(add_events, db, 1)
+            events, cursor = await waiting
+            polls.append(([event["id"] for event in events], cursor))
+        finally:
+            await feed.stop()
+        return polls
+
+    polls = asyncio.run(scenario())
+
+    assert polls[:3] == [(existing[:2], existing[1]), (existing[2:], existing[2]), ([], existing[2])]
+    assert polls[3][0] == [existing[2] + 1]
+    assert polls[3][1] == existing[2] + 1
+
+
+def test_lagging_subscriber_catches_up_from_the_buffer(monkeypatch):
+    monkeypatch.setattr(change_feed, "SUBSCRIBER_QUEUE_SIZE", 3)
+    lagged = REGISTRY.get_sample_value("api_change_feed_events_total", {"result": "lagged"}) or 0
+
+    async def scenario() -> list[int]:
+        feed = ChangeFeed()
+        stream = feed.stream(cursor=None)
+        try:
+            first = asyncio.create_task(anext(stream))
+            await asyncio.sleep(0.01)
+            feed._publish([published(event_id) for event_id in range(1, 6)])
+            received = [(await first)["id"]]
+            while len(received) < 5:
+                received.append((await anext(stream))["id"])
+            return received
+        finally:
+            await stream.aclose()
+            await feed.stop()
+
+    assert asyncio.run(scenario()) == [1, 2, 3, 4, 5]
+    assert REGISTRY.get_sample_value("api_change_feed_events_total", {"result": "lagged"}) == lagged + 1
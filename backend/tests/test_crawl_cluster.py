@@ -0,0 +1,46 @@
+import asyncio
+from datetime import datetime
+
+import httpx
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.db import engine
+from app.models import CrawlWorker, Regulation
+from app.services.crawl_cluster import CrawlResultWriter, DistributedCrawlWorker, HashRing
+from app.services.frontier import UrlFrontier
+from tests.conftest import law_html
+
+
+def test_hash_ring_moves_only_the_new_members_share():
+    shards = [str(shard) for shard in range(1024)]
+    before = HashRing(["w1", "w2", "w3"], 64)
+    after = HashRing(["w1", "w2", "w3", "w4"], 64)
+
+    moved = [shard for shard in shards if before.owner(shard) != after.owner(shard)]
+
+    assert all(after.owner(shard) == "w4" for shard in moved)
+    assert 0.1 < len(moved) / len(shards) < 0.4
+
+
+def test_worker_keeps_membership_while_a_fetch_outlives_the_ttl(db, monkeypatch):
+    monkeypatch.setattr(settings, "crawl_worker_ttl_seconds", 1)
+    monkeypatch.setattr(settings, "crawl_heartbeat_seconds", 0.1)
+    url = "https://yavas.test/yonetmelik"
+    alive = []
+
+    async def slow_site(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(1.5)
+        with Session(engine) as probe:
+            alive.append(probe.scalar(select(CrawlWorker.worker_id).where(CrawlWorker.expires_at > datetime.utcnow())))
+        return httpx.Response(200, text=law_html(["Uzun süren bir sayfa yüklemesi. " * 20]))
+
+    UrlFrontier(db).add([url])
+    worker = DistributedCrawlWorker(db, worker_id="worker-a", async_transport=httpx.MockTransport(slow_site))
+    worker.run_forever(once=True)
+    CrawlResultWriter(db).run_forever(once=True)
+
+    assert alive == ["worker-a"]
+    assert db.scalar(select(Regulation.url)) == url
+    assert db.scalar(select(CrawlWorker.id)) is None
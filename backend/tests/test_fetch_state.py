@@ -0,0 +1,67 @@
+from sqlalchemy import func, select
+
+from app.models import FetchState, Regulation, RegulationVersion
+from app.services import scrape_pipeline
+from app.services.near_duplicate import normalized_hash
+from tests.conftest import law_html
+
+URL = "https://mevzuat.test/kanun/4857"
+TEXT = ["İşveren işçiyi eşit davranma ilkesine göre çalıştırır.", "Çalışma süresi haftada en çok kırk beş saattir."]
+
+
+def test_identical_body_is_skipped_without_extraction(site, db, monkeypatch):
+    site.pages[URL] = law_html(TEXT)
+    site.ingest([URL])
+    first_seen = db.scalar(select(Regulation.last_seen_at).where(Regulation.url == URL))
+    db.commit()
+    extracted = []
+    extract_page = scrape_pipeline.extract_page
+    monkeypatch.setattr(scrape_pipeline, "extract_page", lambda url, html: extracted.append(url) or extract_page(url, html))
+
+    summary = site.ingest([URL])
+
+    assert summary["skipped_unchanged"] == 1
+    assert extracted == []
+    assert "if-none-match" not in site.requests[-1].headers
+    assert db.scalar(select(Regulation.last_seen_at).where(Regulation.url == URL)) > first_seen
+    assert db.scalar(select(func.count()).select_from(RegulationVersion)) == 1
+
+
+def test_not_modified_response_keeps_validators_and_version(site, db):
+    site.pages[URL] = law_html(TEXT)
+    site.etags[URL] = '"v1"'
+    site.ingest([URL])
+    db.commit()
+
+    summary = site.ingest([URL])
+
+    assert site.requests[-1].headers["if-none-match"] == '"v1"'
+    assert summary["skipped_unchanged"] == 1
+    state = db.scalar(select(FetchState).where(FetchState.url == URL))
+    assert state.etag == '"v1"'
+    assert state.raw_hash is not None
+    assert db.scalar(select(Regulation.version).where(Regulation.url == URL)) == 1
+
+
+def test_substantive_edit_after_not_modified_creates_a_version(site, db):
+    site.pages[URL] = law_html(TEXT)
+    site.etags[URL] = '"v1"'
+    site.ingest([URL])
+    db.commit()
+    site.ingest([URL])
+    db.commit()
+
+    site.pages[URL] = law_html([TEXT[0], TEXT[1].replace("kırk beş", "kırk")])
+    site.etags[URL] = '"v2"'
+    summary = site.ingest([URL])
+
+    assert summary["changed"] == 1
+    assert db.scalar(select(Regulation.version).where(Regulation.url == URL)) == 2
+    assert db.scalar(select(FetchState.etag).where(FetchState.url == URL)) == '"v2"'
+
+
+def test_normalized_hash_separates_cosmetic_from_substantive_edits():
+    original = "Çalışma süresi haftada en çok kırk beş saattir."
+
+    assert normalized_hash(original) == normalized_hash("çalışma  süresi, haftada en çok\nkırk beş saattir")
+    assert normalized_hash(original) != normalized_hash("Çalışma süresi haftada en çok kırk saattir.")
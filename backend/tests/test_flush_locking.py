@@ -0,0 +1,102 @@
+import sqlite3
+import threading
+from datetime import datetime
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import OperationalError
+
+from app.config import settings
+from app.db import heartbeat_engine
+from app.models import CrawlResult, IngestJob, Regulation, RegulationChunk
+from app.services import artifact_store
+from app.services.crawl_cluster import ResultSpool
+from app.services.heartbeat import Heartbeat
+from app.services.vector_index import ChunkIndexer
+from tests.conftest import DATA_DIR, law_html
+
+
+def other_writer_can_commit() -> bool:
+    connection = sqlite3.connect(DATA_DIR / "test.db", timeout=0.05, isolation_level=None)
+    try:
+        connection.execute("BEGIN IMMEDIATE")
+        connection.execute("ROLLBACK")
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        connection.close()
+
+
+def test_embedding_and_compression_run_outside_the_write_transaction(site, db, monkeypatch):
+    monkeypatch.setattr(settings, "chunk_index_enabled", True)
+    probes: dict[str, list[bool]] = {"embed": [], "compress": []}
+    prepare, compress = ChunkIndexer.prepare, artifact_store.compress
+
+    def probing_prepare(self, documents, reusable):
+        probes["embed"].append(other_writer_can_commit())
+        return prepare(self, documents, reusable)
+
+    def probing_compress(data, codec):
+        probes["compress"].append(other_writer_can_commit())
+        return compress(data, codec)
+
+    monkeypatch.setattr(ChunkIndexer, "prepare", probing_prepare)
+    monkeypatch.setattr(artifact_store, "compress", probing_compress)
+    url = "https://mevzuat.test/yonetmelik/kilit"
+    site.pages[url] = law_html(["Kilit dışında hesaplanan madde metni. " * 20, "İkinci madde hükmü. " * 20])
+
+    site.ingest([url])
+
+    assert probes["embed"] == [True]
+    assert probes["compress"] and all(probes["compress"])
+    assert db.scalar(select(func.count()).select_from(RegulationChunk)) >= 2
+
+
+def test_spool_keeps_results_while_the_database_is_locked(db, monkeypatch):
+    spool = ResultSpool(db, "worker-a")
+    execute = db.execute
+    calls = []
+
+    def locked_once(statement, *args, **kwargs):
+        if not calls:
+            calls.append(statement)
+            raise OperationalError("INSERT", {}, sqlite3.OperationalError("database is locked"))
+        return execute(statement, *args, **kwargs)
+
+    monkeypatch.setattr(db, "execute", locked_once)
+    spool.put({"pages": [], "touches": [], "finished": {}, "validators": {}, "not_modified": [], "render_observed": []})
+
+    assert len(spool.backlog) == 1
+    assert spool.flush()
+    assert spool.backlog == []
+    assert db.scalar(select(func.count()).select_from(CrawlResult)) == 1
+
+
+def test_write_lock_is_taken_only_by_the_first_write(db):
+    db.scalars(select(Regulation)).all()
+    assert other_writer_can_commit()
+
+    db.execute(update(Regulation).values(last_seen_at=datetime.utcnow()))
+    assert not other_writer_can_commit()
+
+    db.commit()
+    assert other_writer_can_commit()
+
+
+def test_heartbeat_uses_its_own_connection_and_retries(db, monkeypatch):
+    monkeypatch.setattr(settings, "heartbeat_retry_seconds", 0.01)
+    db.scalars(select(Regulation)).all()
+    calls = []
+    done = threading.Event()
+
+    def beat(session):
+        calls.append(session.scalar(select(func.count()).select_from(IngestJob)))
+        if len(calls) == 1:
+            raise OperationalError("UPDATE", {}, sqlite3.OperationalError("database is locked"))
+        done.set()
+
+    with Heartbeat(heartbeat_engine, 0.01, beat, "test") as heartbeat:
+        assert done.wait(2)
+
+    assert calls[:2] == [0, 0]
+    assert heartbeat.error is None
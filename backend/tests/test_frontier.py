@@ -0,0 +1,103 @@
+import threading
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.config import settings
+from app.db import SessionLocal
+from app.models import FrontierEntry
+from app.services.frontier import OUTCOME_CHANGED, UrlFrontier, host_shard
+
+HOUR = 3600
+
+
+def intervals(db, urls: list[str]) -> list[int]:
+    rows = dict(db.execute(select(FrontierEntry.url, FrontierEntry.revisit_interval_seconds)).all())
+    return [rows[url] for url in urls]
+
+
+def visit(db, frontier: UrlFrontier, outcomes: dict[str, str], now: datetime) -> None:
+    frontier.record(frontier.entries(list(outcomes)), outcomes, now)
+    db.commit()
+
+
+def test_interval_shrinks_for_changing_pages_and_grows_for_stable_ones(db):
+    frontier = UrlFrontier(db)
+    busy, quiet = "https://mevzuat.test/sik", "https://mevzuat.test/sabit"
+    frontier.add([busy, quiet])
+    start = intervals(db, [busy, quiet])
+    now = datetime.utcnow()
+
+    visit(db, frontier, {busy: OUTCOME_CHANGED, quiet: "unchanged"}, now)
+    first = intervals(db, [busy, quiet])
+    visit(db, frontier, {busy: OUTCOME_CHANGED, quiet: "unchanged"}, now + timedelta(hours=1))
+    second = intervals(db, [busy, quiet])
+
+    assert start == [settings.frontier_default_revisit_hours * HOUR] * 2
+    assert start[0] > first[0] > second[0]
+    assert start[1] < first[1] < second[1]
+    due = dict(db.execute(select(FrontierEntry.url, FrontierEntry.next_due_at)).all())
+    assert due[busy] == now + timedelta(hours=1, seconds=second[0])
+
+
+def test_interval_stays_within_bounds(db):
+    frontier = UrlFrontier(db)
+    busy, quiet = "https://mevzuat.test/sik", "https://mevzuat.test/sabit"
+    frontier.add([busy, quiet])
+    db.execute(update(FrontierEntry).where(FrontierEntry.url == busy).values(revisit_interval_seconds=7 * HOUR))
+    db.execute(update(FrontierEntry).where(FrontierEntry.url == quiet).values(revisit_interval_seconds=700 * HOUR))
+    db.commit()
+
+    for _ in range(5):
+        visit(db, frontier, {busy: OUTCOME_CHANGED, quiet: "unchanged"}, datetime.utcnow())
+
+    assert intervals(db, [busy, quiet]) == [
+        settings.frontier_min_revisit_hours * HOUR,
+        settings.frontier_max_revisit_hours * HOUR,
+    ]
+
+
+def test_concurrent_claims_never_share_a_url(db):
+    urls = [f"https://host{host}.test/{page}" for host in range(4) for page in range(3)]
+    UrlFrontier(db).add(urls)
+    shards = sorted({host_shard(f"host{host}.test") for host in range(4)})
+    other_engine = create_engine(settings.database_url, poolclass=NullPool, connect_args={"timeout": 5})
+    barrier = threading.Barrier(2)
+    claimed: dict[str, list[str]] = {}
+
+    def claim(worker_id: str, session: Session) -> None:
+        with session:
+            barrier.wait()
+            claimed[worker_id] = [row.url for row in UrlFrontier(session).claim(worker_id, shards, len(urls))]
+
+    threads = [
+        threading.Thread(target=claim, args=("worker-a", SessionLocal())),
+        threading.Thread(target=claim, args=("worker-b", Session(other_engine))),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    other_engine.dispose()
+
+    assert not set(claimed["worker-a"]) & set(claimed["worker-b"])
+    assert sorted(claimed["worker-a"] + claimed["worker-b"]) == sorted(urls)
+    leases = dict(db.execute(select(FrontierEntry.url, FrontierEntry.leased_by)).all())
+    for worker_id, worker_urls in claimed.items():
+        assert all(leases[url] == worker_id for url in worker_urls)
+
+
+def test_claimed_host_is_skipped_until_the_lease_expires(db):
+    urls = ["https://mevzuat.test/a", "https://mevzuat.test/b"]
+    frontier = UrlFrontier(db)
+    frontier.add(urls)
+    shards = [host_shard("mevzuat.test")]
+    now = datetime.utcnow()
+
+    assert [row.url for row in frontier.claim("worker-a", shards, 1, now)] == ["https://mevzuat.test/a"]
+    assert frontier.claim("worker-b", shards, 2, now) == []
+
+    later = now + timedelta(seconds=settings.crawl_lease_seconds + 1)
+    assert sorted(row.url for row in frontier.claim("worker-b", shards, 2, later)) == urls
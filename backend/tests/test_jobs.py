@@ -0,0 +1,55 @@
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app.config import settings
+from app.models import IngestJob
+from app.services import jobs
+from app.services.jobs import JOB_FAILED, JOB_RUNNING, JOB_SUCCEEDED, KIND_INGEST, JobQueue, JobWorker
+
+
+def test_running_job_blocks_second_claim(db):
+    queue = JobQueue(db)
+    queue.enqueue(KIND_INGEST, {"seed_urls": ["https://a.test/"]})
+    queue.enqueue(KIND_INGEST, {"seed_urls": ["https://b.test/"]})
+
+    assert queue.claim("worker-a") is not None
+    assert queue.claim("worker-b") is None
+
+
+def test_expired_lease_fails_job_and_frees_the_queue(db):
+    queue = JobQueue(db)
+    first = queue.enqueue(KIND_INGEST, {"seed_urls": ["https://a.test/"]}).id
+    second = queue.enqueue(KIND_INGEST, {"seed_urls": ["https://b.test/"]}).id
+    queue.claim("worker-a")
+    db.execute(update(IngestJob).where(IngestJob.id == first).values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1)))
+    db.commit()
+
+    claimed = queue.claim("worker-b")
+
+    assert claimed.id == second
+    expired = db.get(IngestJob, first)
+    assert expired.status == JOB_FAILED
+    assert expired.error == "Worker lease süresi doldu"
+
+
+def test_lease_is_renewed_while_handler_reports_no_progress(db, monkeypatch):
+    monkeypatch.setattr(settings, "job_lease_seconds", 1)
+    monkeypatch.setattr(settings, "job_heartbeat_seconds", 0.05)
+    observed = {}
+
+    def slow_handler(session, params, report):
+        time.sleep(1.5)
+        observed["second_claim"] = JobQueue(session).claim("worker-b")
+        observed["status"] = session.get(IngestJob, job_id).status
+        return {}
+
+    monkeypatch.setitem(jobs.JOB_HANDLERS, KIND_INGEST, slow_handler)
+    job_id = JobQueue(db).enqueue(KIND_INGEST, {"seed_urls": []}).id
+    db.commit()
+
+    assert JobWorker(db, worker_id="worker-a").run_next()
+    assert observed == {"second_claim": None, "status": JOB_RUNNING}
+    db.expire_all()
+    assert db.get(IngestJob, job_id).status == JOB_SUCCEEDED
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+from sqlalchemy import select
+
+from app.models import Regulation
+from app.services.extraction import extract_page
+from app.services.metadata_engine import ArticleIndex, extract_metadata, normalize_article_number
+from tests.conftest import law_html
+
+LAW = """# Sosyal Sigortalar Kanunu
+Kanun Numarası: 5510
+Resmî Gazete Tarihi: 16/6/2006 Resmî Gazete Sayısı: 26200
+
+MADDE 1 - Amaç hükmü.
+
+**Madde 2** – Kapsam hükmü.
+
+EK MADDE 3 - Ek hüküm.
+
+GEÇİCİ MADDE 1/A - Geçici hüküm.
+
+Bu madde 7 uyarınca atıf içeren cümle.
+Çalışma ve Sosyal Güvenlik Bakanlığı tarafından uygulanır.
+"""
+
+
+def test_articles_are_split_by_kind_with_offsets_into_the_markdown():
+    metadata = extract_metadata(title="Sosyal Sigortalar Kanunu", url="https://mevzuat.test/5510", markdown=LAW)
+
+    articles = metadata["articles"]
+    assert [(article["kind"], article["number"]) for article in articles] == [
+        ("madde", "1"),
+        ("madde", "2"),
+        ("ek madde", "3"),
+        ("geçici madde", "1/A"),
+    ]
+    assert [article["ordinal"] for article in articles] == [0, 1, 2, 3]
+    starts = [LAW[article["position"] :].split(" -")[0].split(" –")[0] for article in articles]
+    assert starts == ["MADDE 1", "**Madde 2**", "EK MADDE 3", "GEÇİCİ MADDE 1/A"]
+    assert metadata["article_no"] == "1"
+
+
+def test_numbers_dates_type_and_institution_are_extracted():
+    metadata = extract_metadata(title="Sosyal Sigortalar Kanunu", url="https://mevzuat.test/5510", markdown=LAW)
+
+    assert metadata["instrument_type"] == "kanun"
+    assert metadata["instrument_number"] == "5510"
+    assert metadata["gazette_number"] == "26200"
+    assert metadata["published_at"] == datetime(2006, 6, 16)
+    assert metadata["institution"] == "Çalışma ve Sosyal Güvenlik Bakanlığı"
+
+
+def test_gazette_header_wins_over_citation_and_dotted_dates_parse():
+    markdown = (
+        "Resmî Gazete: Tarih: 01.02.2020 Sayı: 31026\nİÇİŞLERİ BAKANLIĞI\nGeçici Madde 2 - Hüküm\n"
+        "31/12/2019 tarihli ve 30995 sayılı Resmî Gazete"
+    )
+    metadata = extract_metadata(title="Yönetmelik", url="https://mevzuat.test/y", markdown=markdown)
+
+    assert metadata["instrument_type"] == "yönetmelik"
+    assert metadata["gazette_number"] == "31026"
+    assert metadata["published_at"] == datetime(2020, 2, 1)
+    assert metadata["articles"][0]["kind"] == "geçici madde"
+    assert markdown[metadata["articles"][0]["position"] :].startswith("Geçici Madde 2")
+
+
+def test_citation_is_used_when_there_is_no_header_and_bad_dates_are_dropped():
+    cited = extract_metadata(
+        title="Tebliğ", url="https://mevzuat.test/t", markdown="31/12/2019 tarihli ve 30995 sayılı Resmî Gazete"
+    )
+    invalid = extract_metadata(title="Tebliğ", url="https://mevzuat.test/t", markdown="Resmî Gazete Tarihi: 31/02/2019")
+
+    assert (cited["gazette_number"], cited["published_at"]) == ("30995", datetime(2019, 12, 31))
+    assert cited["instrument_type"] == "tebliğ"
+    assert invalid["published_at"] is None
+
+
+def test_article_numbers_are_normalized():
+    assert normalize_article_number(" 1/a ") == "1/A"
+    assert normalize_article_number("3/i") == "3/İ"
+
+
+def test_whitespace_only_markdown_change_keeps_article_slices_aligned(site, db):
+    url = "https://mevzuat.test/kanun/bosluk"
+    site.pages[url] = law_html(["Birinci hüküm metni. " * 10, "İkinci hüküm metni. " * 10])
+    site.ingest([url])
+    page = extract_page(url, site.pages[url])
+    spaced = page["content_markdown"].replace("\n\n", "\n\n\n\n")
+    reformatted = {
+        **{key: value for key, value in page.items() if key not in ("timings", "fallback", "needs_render")},
+        "content_markdown": spaced,
+        "articles": extract_metadata(title=page["title"], url=url, markdown=spaced)["articles"],
+    }
+    pipeline = site.pipeline(db)
+
+    pipeline._upsert_regulations([reformatted], datetime.utcnow())
+    db.commit()
+
+    regulation_id = db.scalar(select(Regulation.id).where(Regulation.url == url))
+    articles = ArticleIndex(db).articles(regulation_id)
+    assert [article["content"].split(" -")[0] for article in articles] == ["MADDE 1", "MADDE 2"]
+    assert articles[1]["content"].endswith("İkinci hüküm metni.")
@@ -0,0 +1,21 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parents[1]
+RECORD = "from app.services.metrics import STAGE_SECONDS; STAGE_SECONDS.labels(stage='upsert', host='-').observe(0.2)"
+EXPORT = "from app.services.metrics import export_metrics; print(export_metrics()[0].decode())"
+
+
+def run(code: str, multiproc_dir: Path) -> str:
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(multiproc_dir), "PYTHONPATH": str(BACKEND)}
+    return subprocess.run([sys.executable, "-c", code], env=env, cwd=BACKEND, check=True, capture_output=True, text=True).stdout
+
+
+def test_worker_stage_metrics_reach_the_api_export(tmp_path):
+    run(RECORD, tmp_path)
+
+    exported = run(EXPORT, tmp_path)
+
+    assert 'ingest_stage_seconds_count{host="-",stage="upsert"} 1.0' in exported
@@ -0,0 +1,72 @@
+from sqlalchemy import func, select
+
+from app.models import ChangeEvent, FetchState, Regulation, RegulationVersion
+from tests.conftest import law_html
+
+URL = "https://mevzuat.test/kanun/5510"
+
+
+def articles() -> list[str]:
+    return [
+        f"Bu maddenin {number}. fıkrası uyarınca sigortalılık süresi en az 30 yıldan az olamaz ve kurum "
+        f"tarafından belirlenen esaslara göre {number} numaralı bent kapsamında uygulanır."
+        for number in range(1, 61)
+    ]
+
+
+def test_one_word_amendment_creates_version(site, db):
+    text = articles()
+    site.pages[URL] = law_html(text)
+    assert site.ingest([URL])["upserted"] == 1
+
+    text[29] = text[29].replace("30 yıldan", "40 yıldan")
+    site.pages[URL] = law_html(text)
+    summary = site.ingest([URL])
+
+    assert summary["changed"] == 1
+    regulation = db.scalar(select(Regulation).where(Regulation.url == URL))
+    assert regulation.version == 2
+    assert "40 yıldan" in regulation.content_markdown
+    assert db.scalar(select(RegulationVersion.version).order_by(RegulationVersion.version.desc())) == 2
+    assert [event.version for event in db.scalars(select(ChangeEvent).order_by(ChangeEvent.id))] == [1, 2]
+
+
+def test_cosmetic_change_keeps_version_but_saves_fetch_state(site, db):
+    text = articles()
+    site.pages[URL] = law_html(text)
+    site.etags[URL] = '"v1"'
+    site.ingest([URL])
+    stored_hash = db.scalar(select(FetchState.raw_hash).where(FetchState.url == URL))
+    db.commit()
+
+    site.pages[URL] = law_html([line.replace("uygulanır.", "uygulanır") for line in text])
+    site.etags[URL] = '"v2"'
+    summary = site.ingest([URL])
+
+    assert summary["changed"] == 0
+    assert db.scalar(select(Regulation.version).where(Regulation.url == URL)) == 1
+    state = db.scalar(select(FetchState).where(FetchState.url == URL))
+    assert state.raw_hash != stored_hash
+    assert state.etag == '"v2"'
+    db.commit()
+
+    site.requests.clear()
+    summary = site.ingest([URL])
+
+    assert site.requests[-1].headers["if-none-match"] == '"v2"'
+    assert summary["skipped_unchanged"] == 1
+    assert db.scalar(select(func.count()).select_from(RegulationVersion)) == 1
+
+
+def test_near_duplicate_url_links_to_canonical(site, db):
+    text = articles()
+    site.pages[URL] = law_html(text)
+    site.ingest([URL])
+    copy_url = URL + "?print=1"
+    site.pages[copy_url] = law_html(text + ["Yazdırma görünümü."])
+    site.ingest([copy_url])
+
+    canonical_id = db.scalar(select(Regulation.id).where(Regulation.url == URL))
+    copy = db.scalar(select(Regulation).where(Regulation.url == copy_url))
+    assert copy.duplicate_of_id == canonical_id
+    assert copy.content_markdown is None
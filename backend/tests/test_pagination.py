@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+from app.models import Regulation
+
+
+def seed_regulations(db, count: int) -> list[int]:
+    start = datetime(2026, 1, 1)
+    rows = [
+        Regulation(title=f"Yönetmelik {index}", url=f"https://mevzuat.test/{index}", last_seen_at=start + timedelta(hours=index // 3))
+        for index in range(count)
+    ]
+    db.add_all(rows)
+    db.commit()
+    return [row.id for row in sorted(rows, key=lambda row: (row.last_seen_at, row.id), reverse=True)]
+
+
+def walk(client, path: str, limit: int) -> list[int]:
+    seen, cursor = [], None
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get(path, params=params)
+        assert response.status_code == 200
+        seen.extend(row["id"] for row in response.json())
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return seen
+
+
+def test_keyset_cursor_walks_every_row_once_across_timestamp_ties(db, client):
+    expected = seed_regulations(db, 11)
+
+    assert walk(client, "/regulations", 4) == expected
+
+
+def test_updated_feed_pages_by_the_same_cursor(db, client):
+    expected = seed_regulations(db, 9)
+    db.query(Regulation).filter(Regulation.id.in_(expected[::2])).update({"version": 2})
+    db.commit()
+
+    assert walk(client, "/changes/updated", 2) == expected[::2]
+
+
+def test_keyset_cursor_is_stable_when_newer_rows_arrive(db, client):
+    expected = seed_regulations(db, 6)
+    first = client.get("/regulations", params={"limit": 3})
+    db.add(Regulation(title="Yeni", url="https://mevzuat.test/yeni", last_seen_at=datetime(2027, 1, 1)))
+    db.commit()
+
+    rest = client.get("/regulations", params={"limit": 3, "cursor": first.headers["x-next-cursor"]})
+
+    assert [row["id"] for row in first.json() + rest.json()] == expected
+
+
+def test_invalid_cursor_is_rejected(client):
+    assert client.get("/regulations", params={"cursor": "bozuk"}).status_code == 400
+
+
+def test_deprecated_offset_still_pages_and_hands_over_a_cursor(db, client):
+    expected = seed_regulations(db, 7)
+
+    response = client.get("/regulations", params={"limit": 3, "offset": 3})
+
+    assert [row["id"] for row in response.json()] == expected[3:6]
+    assert response.headers["deprecation"] == "true"
+    assert "cursor" in response.headers["warning"]
+    rest = client.get("/regulations", params={"limit": 3, "cursor": response.headers["x-next-cursor"]})
+    assert [row["id"] for row in rest.json()] == expected[6:]
+    assert client.get("/regulations", params={"offset": 1, "cursor": response.headers["x-next-cursor"]}).status_code == 400
@@ -0,0 +1,28 @@
+from collections import Counter
+from urllib.parse import urlparse
+
+from app.config import settings
+
+
+def test_render_batches_cap_each_host_at_the_host_concurrency(site, db, monkeypatch):
+    monkeypatch.setattr(settings, "render_batch_size", 4)
+    monkeypatch.setattr(settings, "render_host_concurrency", 2)
+    urls = [f"https://host{host}.test/sayfa/{page}" for host in range(3) for page in range(5)]
+
+    batches = site.pipeline(db)._render_batches(urls)
+
+    assert sorted(url for batch in batches for url in batch) == sorted(urls)
+    for batch in batches:
+        assert len(batch) <= 4
+        assert max(Counter(urlparse(url).netloc for url in batch).values()) <= 2
+
+
+def test_single_host_urls_are_batched_up_to_the_host_concurrency(site, db, monkeypatch):
+    monkeypatch.setattr(settings, "render_batch_size", 8)
+    monkeypatch.setattr(settings, "render_host_concurrency", 3)
+    urls = [f"https://www.mevzuat.gov.tr/mevzuat?no={number}" for number in range(7)]
+
+    batches = site.pipeline(db)._render_batches(urls)
+
+    assert [len(batch) for batch in batches] == [3, 3, 1]
+    assert [url for batch in batches for url in batch] == urls
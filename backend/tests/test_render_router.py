@@ -0,0 +1,80 @@
+from datetime import datetime, timedelta
+
+from app.config import settings
+from app.services.extraction import extract_page
+from app.services.render_router import MODE_RENDER, MODE_STATIC, RenderRouter, looks_dynamic, render_gained
+from tests.conftest import law_html
+
+APP_SHELL = (
+    "<html><head><title>Mevzuat</title><script src='/static/js/main.js'></script></head>"
+    "<body><noscript>Bu uygulama JavaScript gerektirir.</noscript><div id=\"root\"></div>"
+    "<p>Yükleniyor...</p></body></html>"
+)
+
+
+def observe(router: RenderRouter, urls: list[str], needed: bool) -> None:
+    for url in urls:
+        router.observe(url, needed)
+
+
+def test_app_shell_looks_dynamic_and_static_page_does_not():
+    static = law_html(["Bu Kanunun amacı kamu hizmetlerinin düzenlenmesidir. " * 10])
+    page = extract_page("https://mevzuat.test/kanun", static)
+
+    assert looks_dynamic(APP_SHELL, "Yükleniyor...")
+    assert looks_dynamic(APP_SHELL, "")
+    assert not looks_dynamic(static, page["content_text"])
+    assert page["needs_render"] is False
+    assert not looks_dynamic("<p>Kısa duyuru metni.</p>", "Kısa duyuru metni.")
+
+
+def test_render_counts_as_gained_only_for_substantially_more_text():
+    assert render_gained("", "Madde metni. " * 40)
+    assert render_gained(None, "x" * 201)
+    assert not render_gained("x" * 500, "x" * 700)
+    assert render_gained("x" * 500, "x" * 801)
+
+
+def test_decision_expires_after_ttl(db):
+    url = "https://spa.test/mevzuat/1"
+    now = datetime.utcnow()
+    router = RenderRouter(db)
+    observe(router, [url] * settings.render_decision_min_samples, needed=True)
+    router.flush(now)
+    db.commit()
+    ttl = timedelta(hours=settings.render_decision_ttl_hours)
+
+    reloaded = RenderRouter(db)
+    reloaded.load([url])
+
+    assert router.decision(url, now) == MODE_RENDER
+    assert reloaded.decision(url, now + ttl - timedelta(seconds=1)) == MODE_RENDER
+    assert reloaded.decision(url, now + ttl) is None
+
+
+def test_expired_counts_are_not_carried_into_a_new_decision(db):
+    url = "https://spa.test/mevzuat/1"
+    now = datetime.utcnow()
+    router = RenderRouter(db)
+    observe(router, [url] * 5, needed=True)
+    router.flush(now)
+
+    later = now + timedelta(hours=settings.render_decision_ttl_hours, seconds=1)
+    observe(router, [url] * settings.render_decision_min_samples, needed=False)
+    router.flush(later)
+
+    assert router.decision(url, later) == MODE_STATIC
+
+
+def test_prefix_decision_overrides_host_decision(db):
+    host = "https://karma.test"
+    router = RenderRouter(db)
+    observe(router, [f"{host}/kanun/{index}" for index in range(4)], needed=False)
+    observe(router, [f"{host}/uygulama/{index}" for index in range(3)], needed=True)
+    observe(router, [f"{host}/yeni/1"], needed=True)
+    router.flush(datetime.utcnow())
+
+    assert router.decision(f"{host}/uygulama/9") == MODE_RENDER
+    assert router.decision(f"{host}/kanun/9") == MODE_STATIC
+    assert router.decision(f"{host}/yeni/2") == MODE_STATIC
+    assert router.decision(f"{host}/") == MODE_STATIC
@@ -0,0 +1,38 @@
+from sqlalchemy import text
+
+from app.config import settings
+from app.services.response_cache import current_generation
+from tests.conftest import law_html
+
+
+def test_etag_revalidation_and_invalidation_on_ingest(site, client):
+    urls = [f"https://mevzuat.test/teblig/{number}" for number in range(3)]
+    for number, url in enumerate(urls):
+        site.pages[url] = law_html([f"Tebliğ {number} hükmü " * 30])
+    site.ingest(urls)
+
+    first = client.get("/regulations", params={"limit": 2})
+    etag = first.headers["etag"]
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "no-cache"
+    assert client.get("/regulations", params={"limit": 2}).headers["etag"] == etag
+
+    revalidated = client.get("/regulations", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+    site.pages[urls[0]] = law_html(["Tamamen yeni bir hüküm metni " * 30])
+    site.ingest([urls[0]])
+    changed = client.get("/regulations", params={"limit": 2}, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_generation_written_by_another_process_is_seen_within_ttl(db, monkeypatch):
+    monkeypatch.setattr(settings, "response_cache_generation_ttl_seconds", 0)
+    before = current_generation()
+    db.execute(text("INSERT INTO cache_generation (id, value, updated_at) VALUES (1, 41, CURRENT_TIMESTAMP)"))
+    db.commit()
+
+    assert current_generation() != before
+    assert current_generation() == "41"
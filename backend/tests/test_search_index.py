@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.db import ReadSessionLocal
+from app.models import Regulation
+from app.services.search_index import FTS_TABLE, build_match_query, search_regulations_fts
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "worker"))
+
+import rebuild_search_index as rebuild_script
+
+
+def add_regulation(db, title: str, content_text: str) -> Regulation:
+    regulation = Regulation(title=title, url=f"https://mevzuat.test/{title}", content_text=content_text)
+    db.add(regulation)
+    db.commit()
+    return regulation
+
+
+def hits(query: str) -> list[str]:
+    with ReadSessionLocal() as db:
+        return [row["title"] for row in search_regulations_fts(db, query, 10, "relevance")]
+
+
+def test_turkish_case_and_diacritics_fold_both_ways(db):
+    add_regulation(db, "İŞ SAĞLIĞI YÖNETMELİĞİ", "İşyerlerinde alınacak önlemler.")
+    add_regulation(db, "Kira Yönetmeliği", "Işık ve ısıtma giderleri kiracıya aittir.")
+
+    assert build_match_query("İş sağlığı") == '"Iş" "sağliği"*'
+    assert hits("işyerlerinde") == ["İŞ SAĞLIĞI YÖNETMELİĞİ"]
+    assert hits("is sagligi") == ["İŞ SAĞLIĞI YÖNETMELİĞİ"]
+    assert hits("ISITMA") == ["Kira Yönetmeliği"]
+    assert hits("ışık") == ["Kira Yönetmeliği"]
+
+
+def test_triggers_follow_insert_update_and_delete(db):
+    regulation = add_regulation(db, "Arşiv Yönetmeliği", "Belgeler beş yıl saklanır.")
+    assert hits("saklanır") == ["Arşiv Yönetmeliği"]
+
+    regulation.content_text = "Belgeler on yıl muhafaza edilir."
+    db.commit()
+    assert hits("saklanır") == []
+    assert hits("muhafaza") == ["Arşiv Yönetmeliği"]
+
+    regulation.title = "Kayıt Yönetmeliği"
+    db.commit()
+    assert hits("arşiv") == []
+    assert hits("kayıt") == ["Kayıt Yönetmeliği"]
+
+    db.delete(regulation)
+    db.commit()
+    assert hits("muhafaza") == []
+    assert db.scalar(text(f"SELECT count(*) FROM {FTS_TABLE}")) == 0
+
+
+def test_rebuild_script_restores_a_drifted_index(db, capsys):
+    add_regulation(db, "Gümrük Yönetmeliği", "Eşya beyanı elektronik ortamda yapılır.")
+    add_regulation(db, "Liman Yönetmeliği", "Gemiler kılavuz kaptan alır.")
+    db.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('delete-all')"))
+    db.commit()
+    assert hits("beyanı") == []
+
+    rebuild_script.main()
+
+    assert "'indexed': 2" in capsys.readouterr().out
+    assert hits("beyanı") == ["Gümrük Yönetmeliği"]
+    assert hits("KILAVUZ") == ["Liman Yönetmeliği"]
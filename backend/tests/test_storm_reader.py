@@ -0,0 +1,33 @@
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.models import FrontierEntry
+from app.services.frontier import UrlFrontier
+from app.services.storm_reader import StormUrlReader
+
+
+def test_bloom_false_positives_still_reach_the_frontier(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "storm_bloom_capacity", 1)
+    monkeypatch.setattr(settings, "storm_bloom_error_rate", 0.5)
+    urls = [f"https://mevzuat.test/{index}" for index in range(50)]
+    source = tmp_path / "discovered_urls.txt"
+    source.write_text("\n".join(urls) + "\n", encoding="utf-8")
+
+    reader = StormUrlReader(source, tmp_path / "state")
+    assert reader.feed(UrlFrontier(db)) == 50
+
+    assert set(db.scalars(select(FrontierEntry.url))) == set(urls)
+
+
+def test_appended_lines_only_count_unknown_urls(db, tmp_path):
+    source = tmp_path / "discovered_urls.txt"
+    source.write_text("https://mevzuat.test/a\nhttps://mevzuat.test/b\n", encoding="utf-8")
+    assert StormUrlReader(source, tmp_path / "state").feed(UrlFrontier(db)) == 2
+
+    with source.open("a", encoding="utf-8") as handle:
+        handle.write("https://mevzuat.test/a\nhttps://mevzuat.test/c\nhttps://mevzuat.test/d")
+    reader = StormUrlReader(source, tmp_path / "state")
+
+    assert reader.feed(UrlFrontier(db)) == 1
+    assert reader.read_lines == 2
+    assert db.scalar(select(func.count()).select_from(FrontierEntry)) == 3
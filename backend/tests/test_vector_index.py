@@ -0,0 +1,100 @@
+from sqlalchemy import func, select
+
+from app.config import settings
+from app.models import IngestJob, Regulation, RegulationChunk
+from app.routers import search as search_router
+from app.services import response_cache, vector_index
+from app.services.jobs import KIND_TRAIN_VECTORS, schedule_vector_training
+from app.services.vector_index import ChunkIndexer, VectorStore
+
+
+def add_regulations(db, count: int) -> dict[int, str]:
+    documents = {}
+    for number in range(count):
+        markdown = "\n\n".join(
+            f"MADDE {article} - {number}. yönetmeliğin {article}. maddesi izin, ceza ve denetim hükümlerini düzenler."
+            for article in range(1, 6)
+        )
+        regulation = Regulation(title=f"Yönetmelik {number}", url=f"https://mevzuat.test/y/{number}", content_markdown=markdown)
+        db.add(regulation)
+        db.flush()
+        documents[regulation.id] = markdown
+    return documents
+
+
+def test_index_leaves_training_to_a_separate_step(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "vector_ivf_min_rows", 20)
+    store = VectorStore(tmp_path)
+    indexer = ChunkIndexer(db, store)
+
+    assert indexer.index(add_regulations(db, 10)) == 50
+    db.commit()
+    assert store.centroids() is None
+    assert indexer.needs_training()
+
+    clusters = indexer.train()
+    db.commit()
+
+    assert clusters == len(store.centroids())
+    assert not indexer.needs_training()
+    assert db.scalar(select(func.count()).where(RegulationChunk.cluster.is_(None))) == 0
+
+
+def test_training_is_queued_as_a_job(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "vector_ivf_min_rows", 20)
+    monkeypatch.setattr(settings, "vector_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "chunk_index_enabled", True)
+    assert not schedule_vector_training(db)
+
+    ChunkIndexer(db).index(add_regulations(db, 10))
+    db.commit()
+
+    assert schedule_vector_training(db)
+    assert schedule_vector_training(db)
+    assert [job.kind for job in db.scalars(select(IngestJob))] == [KIND_TRAIN_VECTORS]
+
+
+def test_similarity_search_scans_every_chunk_until_centroids_exist(db, client, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "vector_ivf_min_rows", 20)
+    monkeypatch.setattr(settings, "vector_ivf_nprobe", 2)
+    monkeypatch.setattr(settings, "vector_dir", str(tmp_path))
+    documents = add_regulations(db, 10)
+    target = db.scalar(select(Regulation.id).where(Regulation.url == "https://mevzuat.test/y/7"))
+    documents[target] += "\n\nMADDE 6 - Kişisel verilerin silinmesi, yok edilmesi veya anonim hale getirilmesi."
+    indexer = ChunkIndexer(db, VectorStore(tmp_path))
+    indexer.index(documents)
+    db.commit()
+    scanned = []
+    similarity_search = vector_index.similarity_search
+
+    def counting_search(session, query, limit):
+        scanned.append(vector_index.VectorStore().centroids() is None)
+        return similarity_search(session, query, limit)
+
+    monkeypatch.setattr(search_router, "similarity_search", counting_search)
+
+    response = client.get("/search/similar", params={"q": "kişisel verilerin silinmesi", "limit": 3})
+
+    assert scanned == [True]
+    assert response.headers["x-embedding-backend"].startswith("hashing:")
+    assert response.json()[0]["id"] == target
+    assert response.json()[0]["article"].startswith("MADDE 6")
+
+    indexer.train()
+    db.commit()
+    response_cache.get_response_cache().clear()
+    trained = client.get("/search/similar", params={"q": "kişisel verilerin silinmesi", "limit": 3})
+
+    assert scanned == [True, False]
+    assert trained.json()[0]["id"] == target
+
+
+def test_semantic_route_is_a_deprecated_alias(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "vector_dir", str(tmp_path))
+
+    response = client.get("/search/semantic", params={"q": "izin"})
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert response.headers["deprecation"] == "true"
+    assert "/search/similar" in response.headers["link"]
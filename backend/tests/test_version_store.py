@@ -0,0 +1,82 @@
+from sqlalchemy import select
+
+from app.config import settings
+from app.models import Regulation, RegulationVersion
+from app.services.version_store import DELTA, KEYFRAME, VersionStore, apply_version, encode_version
+from tests.conftest import law_html
+
+URL = "https://mevzuat.test/kanun/5237"
+
+
+def test_delta_round_trips_against_previous_text():
+    previous = "\n".join(f"Satır {number} değişmeyen hüküm metni" for number in range(200))
+    current = previous.replace("Satır 17 ", "Satır 17 değişen ") + "\nYeni eklenen satır"
+
+    kind, payload, summary = encode_version(previous, current, force_keyframe=False)
+
+    assert kind == DELTA
+    assert apply_version(previous, kind, payload) == current
+    assert "+Yeni eklenen satır" in summary
+    kind, payload, _ = encode_version(previous, current, force_keyframe=True)
+    assert kind == KEYFRAME
+    assert apply_version(None, kind, payload) == current
+
+
+def ingest_versions(site, count: int) -> list[str]:
+    articles = [f"Madde {number} ilk hükmü " * 20 for number in range(1, 6)]
+    for version in range(count):
+        if version:
+            articles[version % len(articles)] = f"Madde değişikliği {version} ile yeni hüküm " * 20
+        site.pages[URL] = law_html(articles)
+        site.ingest([URL])
+    return articles
+
+
+def test_every_version_is_rebuilt_across_keyframes_and_deltas(site, db, client, monkeypatch):
+    monkeypatch.setattr(settings, "version_keyframe_interval", 3)
+    ingest_versions(site, 7)
+    regulation_id = db.scalar(select(Regulation.id).where(Regulation.url == URL))
+    stored = list(
+        db.execute(
+            select(RegulationVersion.version, RegulationVersion.payload_kind)
+            .where(RegulationVersion.regulation_id == regulation_id)
+            .order_by(RegulationVersion.version)
+        )
+    )
+    current = db.scalar(select(Regulation.content_markdown).where(Regulation.id == regulation_id))
+    db.commit()
+
+    assert [row.version for row in stored] == list(range(1, 8))
+    assert {row.payload_kind for row in stored} == {KEYFRAME, DELTA}
+    store = VersionStore(db)
+    texts = store.texts(regulation_id, 1, 7)
+    assert texts[7] == current
+    for version in range(1, 8):
+        assert store.rebuild(regulation_id, version) == texts[version]
+        response = client.get(f"/changes/{regulation_id}/versions/{version}")
+        assert response.json()["content_markdown"] == texts[version]
+    assert len(set(texts.values())) == 7
+    assert client.get(f"/changes/{regulation_id}/versions/8").status_code == 404
+
+
+def test_diff_between_versions_shows_only_the_amended_article(site, db, client, monkeypatch):
+    monkeypatch.setattr(settings, "version_keyframe_interval", 3)
+    ingest_versions(site, 4)
+    regulation_id = db.scalar(select(Regulation.id).where(Regulation.url == URL))
+    db.commit()
+
+    diff = client.get(f"/changes/{regulation_id}/diff", params={"from_version": 2, "to_version": 3}).json()["diff"]
+    added = [line for line in diff if line.startswith("+") and not line.startswith("+++")]
+    removed = [line for line in diff if line.startswith("-") and not line.startswith("---")]
+    assert diff[:2] == ["--- v2", "+++ v3"]
+    assert len(added) == 1 and "değişikliği 2" in added[0]
+    assert len(removed) == 1 and "Madde 3 ilk" in removed[0]
+
+    reverse = client.get(f"/changes/{regulation_id}/diff", params={"from_version": 3, "to_version": 2}).json()["diff"]
+    assert reverse[:2] == ["--- v3", "+++ v2"]
+    versions = client.get(f"/changes/{regulation_id}/versions", params={"with_diff": True}).json()
+    assert [item["version"] for item in versions] == [4, 3, 2, 1]
+    assert versions[-1]["diff"] is None
+    assert all(item["diff"] for item in versions[:-1])
+    missing = client.get(f"/changes/{regulation_id}/diff", params={"from_version": 1, "to_version": 9})
+    assert missing.status_code == 404
@@ -1,36 +1,242 @@
+import asyncio
+import json
+import os
+import time
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, suppress
+from typing import Literal
+from urllib.parse import urlparse
+
 from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, HttpUrl
+from fastapi import Response as HttpResponse
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, HttpUrl
+from playwright.async_api import BrowserContext, Page, Request, Route
 from playwright.async_api import TimeoutError as PlaywrightTimeoutError
-from playwright.async_api import async_playwright
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+
+from browser_pool import BrowserPool
 
 app = FastAPI(title="Render Service", version="0.1.0")
 
+pool = BrowserPool(
+    size=int(os.getenv("RENDER_POOL_SIZE", "2")),
+    max_concurrency=int(os.getenv("RENDER_MAX_CONCURRENCY", "8")),
+    pages_per_browser=int(os.getenv("RENDER_PAGES_PER_BROWSER", "200")),
+)
 
-class RenderRequest(BaseModel):
-    url: HttpUrl
-    wait_until: str = "networkidle"
+RENDER_SECONDS = Histogram(
+    "render_seconds",
+    "Page render duration in seconds",
+    ["host"],
+    buckets=(0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 45.0, 90.0),
+)
+RENDER_ERRORS = Counter("render_errors_total", "Render failures by exception type", ["error"])
+RENDER_BLOCKED = Counter("render_requests_blocked_total", "Subresource requests aborted by the blocker", ["resource_type"])
+RENDER_REQUESTS = Counter("render_subresource_requests_total", "Subresource requests issued while rendering")
+RENDER_BYTES = Counter("render_bytes_loaded_total", "Response body bytes of finished requests")
+POOL_COUNTERS = {"pages_served", "recycled", "crashes"}
+
+
+class PoolCollector:
+    def collect(self) -> Iterator[Metric]:
+        for key, value in pool.stats().items():
+            if key in POOL_COUNTERS:
+                yield CounterMetricFamily(f"render_pool_{key}", f"Browser pool {key.replace('_', ' ')}", value=value)
+            else:
+                yield GaugeMetricFamily(f"render_pool_{key}", f"Browser pool {key.replace('_', ' ')}", value=value)
+
+
+REGISTRY.register(PoolCollector())
+
+HOST_CONCURRENCY = max(1, int(os.getenv("RENDER_HOST_CONCURRENCY", "2")))
+host_slots: dict[str, tuple[asyncio.Semaphore, list[int]]] = {}
+
+
+@asynccontextmanager
+async def host_slot(url: str) -> AsyncIterator[None]:
+    host = urlparse(url).netloc.lower()
+    slots, users = host_slots.setdefault(host, (asyncio.Semaphore(HOST_CONCURRENCY), [0]))
+    users[0] += 1
+    try:
+        async with slots:
+            yield
+    finally:
+        users[0] -= 1
+        if not users[0]:
+            host_slots.pop(host, None)
+
+
+class RenderOptions(BaseModel):
+    wait_until: Literal["load", "domcontentloaded", "networkidle", "commit"] = "networkidle"
     timeout_ms: int = 45000
+    wait_for_selector: str | None = None
+    idle_ms: int | None = None
+    idle_timeout_ms: int = 5000
+    block_resource_types: list[str] = []
+    block_url_patterns: list[str] = []
+
+
+class RenderRequest(RenderOptions):
+    url: HttpUrl
+
+
+class BatchRenderRequest(RenderOptions):
+    urls: list[HttpUrl] = Field(min_length=1, max_length=100)
+
+
+class NetworkTracker:
+    def __init__(self, page: Page) -> None:
+        self.in_flight = 0
+        self.requests = 0
+        self.bytes_loaded = 0
+        self.last_activity = time.monotonic()
+        self._measuring: set[asyncio.Task] = set()
+        page.on("request", self._on_request)
+        page.on("requestfinished", self._on_finished)
+        page.on("requestfailed", self._on_done)
+
+    def _on_request(self, _request: Request) -> None:
+        self.in_flight += 1
+        self.requests += 1
+        self.last_activity = time.monotonic()
+
+    def _on_finished(self, request: Request) -> None:
+        self._on_done(request)
+        task = asyncio.ensure_future(self._measure(request))
+        self._measuring.add(task)
+        task.add_done_callback(self._measuring.discard)
+
+    def _on_done(self, _request: Request) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        self.last_activity = time.monotonic()
+
+    async def _measure(self, request: Request) -> None:
+        with suppress(Exception):
+            sizes = await request.sizes()
+            self.bytes_loaded += max(0, sizes["responseBodySize"])
+
+    async def settle(self) -> None:
+        if self._measuring:
+            await asyncio.gather(*self._measuring)
+
+    async def wait_for_idle(self, idle_ms: int, timeout_ms: int) -> None:
+        deadline = time.monotonic() + timeout_ms / 1000
+        while time.monotonic() < deadline:
+            if self.in_flight == 0 and time.monotonic() - self.last_activity >= idle_ms / 1000:
+                return
+            await asyncio.sleep(0.05)
+
+
+class ResourceBlocker:
+    def __init__(self, resource_types: list[str], url_patterns: list[str]) -> None:
+        self.resource_types = set(resource_types)
+        self.url_patterns = url_patterns
+        self.blocked = 0
+        self.blocked_by_type: dict[str, int] = {}
+
+    async def handle(self, route: Route) -> None:
+        request = route.request
+        if request.resource_type in self.resource_types or any(pattern in request.url for pattern in self.url_patterns):
+            self.blocked += 1
+            self.blocked_by_type[request.resource_type] = self.blocked_by_type.get(request.resource_type, 0) + 1
+            await route.abort()
+            return
+        await route.continue_()
+
+
+@app.on_event("startup")
+async def on_startup() -> None:
+    await pool.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    await pool.stop()
 
 
 @app.get("/health")
-async def health() -> dict[str, str]:
-    return {"status": "ok"}
+async def health() -> dict[str, object]:
+    stats = pool.stats()
+    return {"status": "ok" if stats["connected"] else "degraded", "pool": stats}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics() -> HttpResponse:
+    return HttpResponse(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
 
 
 @app.post("/render")
-async def render_page(req: RenderRequest) -> dict[str, str]:
+async def render_page(req: RenderRequest) -> dict[str, object]:
     try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(ignore_https_errors=True)
-            page = await context.new_page()
-            await page.goto(str(req.url), wait_until=req.wait_until, timeout=req.timeout_ms)
-            html = await page.content()
-            final_url = page.url
-            await context.close()
-            await browser.close()
-        return {"url": str(req.url), "final_url": final_url, "html": html}
+        async with host_slot(str(req.url)), pool.lease() as context:
+            return await render_in_context(context, str(req.url), req)
     except PlaywrightTimeoutError as exc:
+        RENDER_ERRORS.labels(error=type(exc).__name__).inc()
         raise HTTPException(status_code=504, detail=f"Render timeout: {exc}") from exc
     except Exception as exc:
+        RENDER_ERRORS.labels(error=type(exc).__name__).inc()
         raise HTTPException(status_code=500, detail=f"Render failed: {exc}") from exc
+
+
+@app.post("/render/batch")
+async def render_batch(req: BatchRenderRequest) -> StreamingResponse:
+    return StreamingResponse(stream_batch(req), media_type="application/x-ndjson")
+
+
+async def stream_batch(req: BatchRenderRequest) -> AsyncIterator[str]:
+    tasks = [asyncio.create_task(render_batch_item(index, str(url), req)) for index, url in enumerate(req.urls)]
+    try:
+        for finished in asyncio.as_completed(tasks):
+            yield json.dumps(await finished, ensure_ascii=False) + "\n"
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def render_batch_item(index: int, url: str, options: RenderOptions) -> dict[str, object]:
+    try:
+        async with host_slot(url), pool.lease() as context:
+            result = await render_in_context(context, url, options)
+    except PlaywrightTimeoutError as exc:
+        RENDER_ERRORS.labels(error=type(exc).__name__).inc()
+        result = {"url": url, "status": 504, "error": f"Render timeout: {exc}"}
+    except Exception as exc:
+        RENDER_ERRORS.labels(error=type(exc).__name__).inc()
+        result = {"url": url, "status": 500, "error": f"Render failed: {exc}"}
+    return {"index": index, **result}
+
+
+async def render_in_context(context: BrowserContext, url: str, req: RenderOptions) -> dict[str, object]:
+    started = time.perf_counter()
+    blocker = ResourceBlocker(req.block_resource_types, req.block_url_patterns)
+    if blocker.resource_types or blocker.url_patterns:
+        await context.route("**/*", blocker.handle)
+    page = await context.new_page()
+    tracker = NetworkTracker(page)
+    await page.goto(url, wait_until=req.wait_until, timeout=req.timeout_ms)
+    if req.wait_for_selector:
+        await page.wait_for_selector(req.wait_for_selector, state="attached", timeout=req.timeout_ms)
+    if req.idle_ms:
+        await tracker.wait_for_idle(req.idle_ms, req.idle_timeout_ms)
+    html = await page.content()
+    await tracker.settle()
+    render_seconds = time.perf_counter() - started
+    RENDER_SECONDS.labels(host=urlparse(url).netloc.lower()).observe(render_seconds)
+    RENDER_REQUESTS.inc(tracker.requests)
+    RENDER_BYTES.inc(tracker.bytes_loaded)
+    for resource_type, count in blocker.blocked_by_type.items():
+        RENDER_BLOCKED.labels(resource_type=resource_type).inc(count)
+    return {
+        "url": url,
+        "final_url": page.url,
+        "html": html,
+        "stats": {
+            "render_ms": round(render_seconds * 1000),
+            "requests": tracker.requests,
+            "requests_blocked": blocker.blocked,
+            "blocked_by_type": blocker.blocked_by_type,
+            "bytes_loaded": tracker.bytes_loaded,
+        },
+    }
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
+from playwright.async_api import Browser, BrowserContext, Playwright, async_playwright
+
+
+class BrowserSlot:
+    def __init__(self, browser: Browser) -> None:
+        self.browser = browser
+        self.pages_served = 0
+        self.active = 0
+        self.retired = False
+        self.closed = False
+        self.crashed = False
+        browser.on("disconnected", self._on_disconnected)
+
+    def _on_disconnected(self, _browser: Browser) -> None:
+        if not self.closed:
+            self.crashed = True
+
+    @property
+    def healthy(self) -> bool:
+        return not self.crashed and self.browser.is_connected()
+
+
+class BrowserPool:
+    def __init__(self, size: int, max_concurrency: int, pages_per_browser: int) -> None:
+        self.size = max(1, size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.pages_per_browser = max(1, pages_per_browser)
+        self.pages_served = 0
+        self.recycled = 0
+        self.crashes = 0
+        self.waiting = 0
+        self._playwright: Playwright | None = None
+        self._slots: list[BrowserSlot] = []
+        self._semaphore: asyncio.Semaphore | None = None
+        self._lock: asyncio.Lock | None = None
+
+    async def start(self) -> None:
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._lock = asyncio.Lock()
+        self._playwright = await async_playwright().start()
+        self._slots = [BrowserSlot(await self._launch()) for _ in range(self.size)]
+
+    async def stop(self) -> None:
+        for slot in self._slots:
+            await self._close(slot)
+        self._slots = []
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[BrowserContext]:
+        if self._semaphore is None:
+            raise RuntimeError("Browser pool is not started")
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.waiting -= 1
+        try:
+            slot = await self._acquire_slot()
+            slot.active += 1
+            try:
+                context = await slot.browser.new_context(ignore_https_errors=True)
+                try:
+                    yield context
+                finally:
+                    with suppress(Exception):
+                        await context.close()
+            finally:
+                slot.active -= 1
+                slot.pages_served += 1
+                self.pages_served += 1
+                await self._release_slot(slot)
+        finally:
+            self._semaphore.release()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "browsers": len(self._slots),
+            "connected": sum(1 for slot in self._slots if slot.healthy),
+            "active_contexts": sum(slot.active for slot in self._slots),
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": self.waiting,
+            "pages_served": self.pages_served,
+            "recycled": self.recycled,
+            "crashes": self.crashes,
+        }
+
+    async def _acquire_slot(self) -> BrowserSlot:
+        async with self._lock:
+            for index, slot in enumerate(self._slots):
+                if not slot.healthy:
+                    self.crashes += 1
+                    slot.retired = True
+                    await self._close(slot)
+                    self._slots[index] = BrowserSlot(await self._launch())
+            return min(self._slots, key=lambda slot: slot.active)
+
+    async def _release_slot(self, slot: BrowserSlot) -> None:
+        async with self._lock:
+            if not slot.retired and slot.pages_served >= self.pages_per_browser and slot in self._slots:
+                slot.retired = True
+                self._slots[self._slots.index(slot)] = BrowserSlot(await self._launch())
+                self.recycled += 1
+            if slot.retired and slot.active == 0:
+                await self._close(slot)
+
+    async def _launch(self) -> Browser:
+        return await self._playwright.chromium.launch(headless=True)
+
+    async def _close(self, slot: BrowserSlot) -> None:
+        if slot.closed:
+            return
+        slot.closed = True
+        with suppress(Exception):
+            await slot.browser.close()
@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import pytest
+
+import browser_pool
+
+
+class FakeContext:
+    def __init__(self, browser: "FakeBrowser") -> None:
+        self.browser = browser
+        self.closed = False
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self) -> None:
+        self.handlers: dict[str, list] = {}
+        self.connected = True
+        self.closed = False
+        self.contexts: list[FakeContext] = []
+
+    def on(self, event: str, handler) -> None:
+        self.handlers.setdefault(event, []).append(handler)
+
+    def is_connected(self) -> bool:
+        return self.connected
+
+    async def new_context(self, **_options) -> FakeContext:
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+    async def close(self) -> None:
+        self.closed = True
+        self.connected = False
+
+    def crash(self) -> None:
+        self.connected = False
+        for handler in self.handlers.get("disconnected", []):
+            handler(self)
+
+
+class FakePlaywright:
+    def __init__(self) -> None:
+        self.chromium = self
+        self.launched: list[FakeBrowser] = []
+        self.stopped = False
+
+    async def launch(self, **_options) -> FakeBrowser:
+        browser = FakeBrowser()
+        self.launched.append(browser)
+        return browser
+
+    async def start(self) -> "FakePlaywright":
+        return self
+
+    async def stop(self) -> None:
+        self.stopped = True
+
+
+@pytest.fixture
+def playwright(monkeypatch) -> FakePlaywright:
+    fake = FakePlaywright()
+    monkeypatch.setattr(browser_pool, "async_playwright", lambda: fake)
+    return fake
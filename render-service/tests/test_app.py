@@ -0,0 +1,106 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+import app as render_app
+
+
+class FakeRequest:
+    def __init__(self, body_size: int) -> None:
+        self.body_size = body_size
+
+    async def sizes(self) -> dict[str, int]:
+        await asyncio.sleep(0)
+        return {"requestBodySize": 0, "requestHeadersSize": 120, "responseBodySize": self.body_size, "responseHeadersSize": 80}
+
+
+class FakePage:
+    def __init__(self) -> None:
+        self.handlers: dict[str, object] = {}
+
+    def on(self, event: str, handler) -> None:
+        self.handlers[event] = handler
+
+    def emit(self, event: str, request: FakeRequest) -> None:
+        self.handlers[event](request)
+
+
+def post_batch(client: TestClient, urls: list[str]) -> list[dict[str, object]]:
+    response = client.post("/render/batch", json={"urls": urls})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+def test_batch_streams_each_result_as_it_finishes(playwright, monkeypatch):
+    async def fake_render(context, url, options):
+        if "zaman" in url:
+            raise PlaywrightTimeoutError("zaman aşımı")
+        await asyncio.sleep(0.2 if "yavas" in url else 0)
+        return {"url": url, "final_url": url, "html": "<html></html>", "stats": {"wait_until": options.wait_until}}
+
+    monkeypatch.setattr(render_app, "render_in_context", fake_render)
+    urls = ["https://yavas.test/", "https://hizli.test/", "https://zaman.test/"]
+    served = render_app.pool.pages_served
+
+    with TestClient(render_app.app) as client:
+        lines = post_batch(client, urls)
+
+    assert lines[-1]["index"] == 0
+    assert sorted(line["index"] for line in lines) == [0, 1, 2]
+    results = {line["index"]: line for line in lines}
+    assert results[1]["stats"] == {"wait_until": "networkidle"}
+    assert results[2]["status"] == 504
+    assert results[2]["url"] == "https://zaman.test/"
+    assert render_app.pool.pages_served == served + 3
+
+
+def test_batch_limits_concurrent_renders_per_host(playwright, monkeypatch):
+    active: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def fake_render(context, url, options):
+        host = url.split("/")[2]
+        active[host] = active.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), active[host])
+        await asyncio.sleep(0.02)
+        active[host] -= 1
+        return {"url": url, "final_url": url, "html": "", "stats": {}}
+
+    monkeypatch.setattr(render_app, "render_in_context", fake_render)
+    urls = [f"https://tek.test/{index}" for index in range(5)] + ["https://diger.test/"]
+
+    with TestClient(render_app.app) as client:
+        lines = post_batch(client, urls)
+
+    assert len(lines) == 6
+    assert peak["tek.test"] == render_app.HOST_CONCURRENCY
+    assert not render_app.host_slots
+
+
+def test_unknown_wait_until_is_rejected(playwright):
+    with TestClient(render_app.app) as client:
+        response = client.post("/render", json={"url": "https://mevzuat.test/", "wait_until": "idle"})
+
+    assert response.status_code == 422
+
+
+def test_network_tracker_counts_body_bytes_without_content_length():
+    async def scenario() -> render_app.NetworkTracker:
+        page = FakePage()
+        tracker = render_app.NetworkTracker(page)
+        finished, failed = FakeRequest(1500), FakeRequest(0)
+        page.emit("request", finished)
+        page.emit("request", failed)
+        page.emit("requestfinished", finished)
+        page.emit("requestfailed", failed)
+        await tracker.settle()
+        return tracker
+
+    tracker = asyncio.run(scenario())
+
+    assert tracker.requests == 2
+    assert tracker.in_flight == 0
+    assert tracker.bytes_loaded == 1500
@@ -0,0 +1,100 @@
+import asyncio
+
+import pytest
+
+from browser_pool import BrowserPool
+
+
+def test_browser_is_recycled_after_its_page_budget(playwright):
+    async def scenario() -> list[bool]:
+        pool = BrowserPool(size=1, max_concurrency=2, pages_per_browser=2)
+        await pool.start()
+        for _ in range(3):
+            async with pool.lease() as context:
+                assert not context.closed
+        closed = [browser.closed for browser in playwright.launched]
+        assert pool.stats()["pages_served"] == 3
+        assert pool.stats()["recycled"] == 1
+        await pool.stop()
+        return closed
+
+    assert asyncio.run(scenario()) == [True, False]
+    assert all(context.closed for browser in playwright.launched for context in browser.contexts)
+    assert playwright.stopped
+
+
+def test_retired_browser_closes_only_after_its_last_lease(playwright):
+    async def scenario() -> None:
+        pool = BrowserPool(size=1, max_concurrency=2, pages_per_browser=1)
+        await pool.start()
+        first = pool.lease()
+        second = pool.lease()
+        await first.__aenter__()
+        await second.__aenter__()
+        browser = playwright.launched[0]
+        assert pool.stats()["active_contexts"] == 2
+
+        await first.__aexit__(None, None, None)
+        assert pool.stats()["recycled"] == 1
+        assert not browser.closed
+
+        await second.__aexit__(None, None, None)
+        assert browser.closed
+        assert len(playwright.launched) == 2
+        await pool.stop()
+
+    asyncio.run(scenario())
+
+
+def test_crashed_browser_is_replaced_on_next_lease(playwright):
+    async def scenario() -> None:
+        pool = BrowserPool(size=2, max_concurrency=2, pages_per_browser=100)
+        await pool.start()
+        playwright.launched[0].crash()
+        assert pool.stats()["connected"] == 1
+
+        async with pool.lease() as context:
+            assert context.browser is not playwright.launched[0]
+
+        assert pool.stats()["crashes"] == 1
+        assert pool.stats()["connected"] == 2
+        assert playwright.launched[0].closed
+        await pool.stop()
+
+    asyncio.run(scenario())
+
+
+def test_leases_beyond_max_concurrency_wait_in_queue(playwright):
+    async def scenario() -> None:
+        pool = BrowserPool(size=1, max_concurrency=2, pages_per_browser=100)
+        await pool.start()
+        release = asyncio.Event()
+        peak = []
+
+        async def render() -> None:
+            async with pool.lease():
+                peak.append(pool.stats()["active_contexts"])
+                await release.wait()
+
+        tasks = [asyncio.create_task(render()) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        assert pool.stats()["active_contexts"] == 2
+        assert pool.stats()["queue_depth"] == 1
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert max(peak) == 2
+        assert pool.stats()["queue_depth"] == 0
+        assert pool.stats()["pages_served"] == 3
+        await pool.stop()
+
+    asyncio.run(scenario())
+
+
+def test_lease_requires_a_started_pool():
+    async def scenario() -> None:
+        async with BrowserPool(size=1, max_concurrency=1, pages_per_browser=1).lease():
+            pass
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(scenario())
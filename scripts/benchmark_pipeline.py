@@ -0,0 +1,288 @@
+import argparse
+import gzip
+import json
+import os
+import random
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+DEFAULT_CORPUS = Path("data/benchmark/corpus.jsonl.gz")
+DEFAULT_SEEDS = ["https://www.mevzuat.gov.tr/"]
+SYNTHETIC_SEED = "https://mevzuat.bench.test/"
+SYNTHETIC_HOSTS = ("mevzuat.bench.test", "resmigazete.bench.test", "kurum.bench.test", "bakanlik.bench.test")
+SYNTHETIC_WORDS = (
+    "kanun yönetmelik tebliğ genelge madde fıkra bent hüküm yürürlük bakanlık kurum başkanlık esas usul "
+    "uygulama değişiklik resmî gazete sigortalı prim vergi gümrük lisans izin denetim ceza süre başvuru "
+    "belge kayıt bildirim tarih yayım karar kurul yetki görev sorumluluk istisna muafiyet tutar oran"
+).split()
+RECORDED_HEADERS = ("content-type", "location", "etag", "last-modified")
+
+
+class RecordingTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    def __init__(self) -> None:
+        self.sync_inner = httpx.HTTPTransport()
+        self.async_inner = httpx.AsyncHTTPTransport()
+        self.entries: list[dict[str, object]] = []
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        response = self.sync_inner.handle_request(request)
+        return self._capture(request, response, response.read())
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.async_inner.handle_async_request(request)
+        return self._capture(request, response, await response.aread())
+
+    def _capture(self, request: httpx.Request, response: httpx.Response, body: bytes) -> httpx.Response:
+        headers = {key: value for key, value in response.headers.items() if key.lower() != "content-encoding"}
+        headers.pop("content-length", None)
+        decoded = httpx.Response(response.status_code, headers=response.headers, content=body, request=request)
+        text = decoded.text
+        if request.method == "GET":
+            self.entries.append(
+                {
+                    "kind": "static",
+                    "url": str(request.url),
+                    "status": response.status_code,
+                    "headers": {key: response.headers[key] for key in RECORDED_HEADERS if key in response.headers},
+                    "body": text,
+                }
+            )
+        else:
+            for line in text.splitlines():
+                if line.strip():
+                    self._capture_render(json.loads(line))
+        return httpx.Response(response.status_code, headers=headers, content=decoded.content, request=request)
+
+    def _capture_render(self, item: dict[str, object]) -> None:
+        if item.get("html"):
+            self.entries.append(
+                {
+                    "kind": "rendered",
+                    "url": item["url"],
+                    "html": item["html"],
+                    "render_ms": (item.get("stats") or {}).get("render_ms"),
+                }
+            )
+
+
+class ReplayCorpus:
+    def __init__(self, path: Path) -> None:
+        self.seeds: list[str] = []
+        self.static: dict[str, dict[str, object]] = {}
+        self.rendered: dict[str, dict[str, object]] = {}
+        with gzip.open(path, "rt", encoding="utf-8") as handle:
+            for line in handle:
+                entry = json.loads(line)
+                if entry["kind"] == "meta":
+                    self.seeds = entry["seeds"]
+                elif entry["kind"] == "static":
+                    self.static[entry["url"]] = entry
+                else:
+                    self.rendered[entry["url"]] = entry
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            payload = json.loads(request.content)
+            if request.url.path.endswith("/batch"):
+                lines = [json.dumps({"index": index, **self._render(url)}) for index, url in enumerate(payload["urls"])]
+                return httpx.Response(200, text="\n".join(lines) + "\n", headers={"content-type": "application/x-ndjson"})
+            item = self._render(payload["url"])
+            return httpx.Response(200 if "html" in item else 404, json=item)
+
+        entry = self.static.get(str(request.url))
+        if entry is None:
+            return httpx.Response(404, text="")
+        return httpx.Response(entry["status"], headers=entry["headers"], text=entry["body"])
+
+    def _render(self, url: str) -> dict[str, object]:
+        entry = self.rendered.get(url)
+        if entry is None:
+            return {"url": url, "status": 404, "error": "not recorded"}
+        return {"url": url, "html": entry["html"], "stats": {"render_ms": entry["render_ms"]}}
+
+
+def synthesize(corpus: Path, pages: int, rendered_every: int, seed: int) -> dict[str, object]:
+    rng = random.Random(seed)
+    links = [f"https://{SYNTHETIC_HOSTS[index % len(SYNTHETIC_HOSTS)]}/mevzuat/{index}" for index in range(pages)]
+    index_html = "<html><body>" + "".join(f'<a href="{url}">{url}</a>' for url in links) + "</body></html>"
+    entries: list[dict[str, object]] = [
+        {"kind": "static", "url": SYNTHETIC_SEED, "status": 200, "headers": {"content-type": "text/html"}, "body": index_html}
+    ]
+    for index, url in enumerate(links):
+        title = f"{rng.choice(('Kanun', 'Yönetmelik', 'Tebliğ'))} {index}"
+        articles = "".join(
+            f"<h3>MADDE {number}</h3><p>{' '.join(rng.choices(SYNTHETIC_WORDS, k=rng.randint(40, 160)))}.</p>"
+            for number in range(1, rng.randint(3, 30))
+        )
+        document = f"<html><head><title>{title}</title></head><body><article><h1>{title}</h1>{articles}</article></body></html>"
+        headers = {"content-type": "text/html", "etag": f'"{index}"'}
+        if rendered_every and index % rendered_every == 0:
+            shell = f'<html><head><title>{title}</title></head><body><div id="root"></div></body></html>'
+            entries.append({"kind": "static", "url": url, "status": 200, "headers": headers, "body": shell})
+            entries.append({"kind": "rendered", "url": url, "html": document, "render_ms": rng.randint(300, 1500)})
+        else:
+            entries.append({"kind": "static", "url": url, "status": 200, "headers": headers, "body": document})
+
+    corpus.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(corpus, "wt", encoding="utf-8") as handle:
+        handle.write(json.dumps({"kind": "meta", "seeds": [SYNTHETIC_SEED], "synthetic_seed": seed}) + "\n")
+        for entry in entries:
+            handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return {"corpus": str(corpus), "entries": len(entries), "pages": pages}
+
+
+def configure_environment(workdir: Path, max_pages: int, offline: bool) -> None:
+    os.environ["DATA_DIR"] = str(workdir)
+    os.environ["DATABASE_URL"] = f"sqlite:///{(workdir / 'benchmark.db').as_posix()}"
+    os.environ["ARTIFACT_DIR"] = str(workdir / "artifacts")
+    os.environ["STORM_STATE_DIR"] = str(workdir / "state")
+    os.environ["STORM_DISCOVERED_URLS_FILE"] = str(workdir / "discovered_urls.txt")
+    os.environ["MAX_PAGES_PER_RUN"] = str(max_pages)
+    if offline:
+        os.environ["REQUEST_DELAY_SECONDS"] = "0"
+
+
+def record(corpus: Path, seeds: list[str]) -> dict[str, object]:
+    from app.db import SessionLocal, init_db
+    from app.services.scrape_pipeline import RegulationScrapePipeline
+
+    init_db()
+    transport = RecordingTransport()
+    with SessionLocal() as db:
+        summary = RegulationScrapePipeline(db, transport=transport, async_transport=transport).ingest(seeds)
+
+    corpus.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(corpus, "wt", encoding="utf-8") as handle:
+        handle.write(json.dumps({"kind": "meta", "seeds": seeds, "recorded_at": time.time()}) + "\n")
+        for entry in transport.entries:
+            handle.write(json.dumps(entry, ensure_ascii=False) + "\n")
+    return {"corpus": str(corpus), "entries": len(transport.entries), **summary}
+
+
+def replay(corpus: Path, repeat: int = 1) -> dict[str, object]:
+    from app.db import init_db
+
+    archive = ReplayCorpus(corpus)
+    init_db()
+    runs = []
+    for attempt in range(max(1, repeat)):
+        if attempt:
+            reset_state()
+        runs.append(replay_once(archive))
+    return combine(runs)
+
+
+def replay_once(archive: ReplayCorpus) -> dict[str, object]:
+    from app.db import SessionLocal
+    from app.services.scrape_pipeline import RegulationScrapePipeline
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        pipeline = RegulationScrapePipeline(db, transport=archive.transport(), async_transport=archive.transport())
+        summary = pipeline.ingest(archive.seeds)
+    elapsed = time.perf_counter() - started
+    return {
+        "pages": summary["scheduled"],
+        "wall_s": round(elapsed, 3),
+        "pages_per_sec": round(summary["scheduled"] / elapsed, 2) if elapsed else 0.0,
+        "stages": pipeline.timings.summary(),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_rss_children_mb": round(resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024, 1),
+        "summary": summary,
+    }
+
+
+def reset_state() -> None:
+    from app.config import settings
+    from app.db import Base, engine
+
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
+    for directory in (settings.artifact_dir, settings.vector_dir, settings.storm_state_dir):
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def combine(runs: list[dict[str, object]]) -> dict[str, object]:
+    if len(runs) == 1:
+        return runs[0]
+    result = dict(sorted(runs, key=lambda run: run["pages_per_sec"])[len(runs) // 2])
+    result["stages"] = {
+        stage: {**stats, "p95_ms": statistics.median(run["stages"][stage]["p95_ms"] for run in runs if stage in run["stages"])}
+        for stage, stats in result["stages"].items()
+    }
+    result["runs"] = [run["pages_per_sec"] for run in runs]
+    return result
+
+
+def regressions(
+    result: dict[str, object], baseline: dict[str, object], tolerance: float, min_samples: int = 0
+) -> list[str]:
+    found = []
+    if result["pages_per_sec"] < baseline["pages_per_sec"] * (1 - tolerance):
+        found.append(f"pages_per_sec {result['pages_per_sec']} < {baseline['pages_per_sec']}")
+    for stage, stats in baseline.get("stages", {}).items():
+        current = result["stages"].get(stage)
+        if not current or min(current["count"], stats["count"]) < min_samples:
+            continue
+        if current["p95_ms"] > stats["p95_ms"] * (1 + tolerance):
+            found.append(f"{stage} p95 {current['p95_ms']}ms > {stats['p95_ms']}ms")
+    return found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Kayıtlı korpus üzerinde çevrimdışı pipeline benchmark'ı")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record", help="Canlı ingest'i çalıştırıp sayfaları korpusa kaydeder")
+    record_parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    record_parser.add_argument("--seed", action="append", dest="seeds")
+    record_parser.add_argument("--max-pages", type=int, default=200)
+    synthesize_parser = commands.add_parser("synthesize", help="Ağ gerektirmeyen deterministik sentetik korpus üretir")
+    synthesize_parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    synthesize_parser.add_argument("--pages", type=int, default=200)
+    synthesize_parser.add_argument("--rendered-every", type=int, default=10)
+    synthesize_parser.add_argument("--random-seed", type=int, default=17)
+    replay_parser = commands.add_parser("replay", help="Korpusu ağa çıkmadan pipeline'dan geçirir")
+    replay_parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    replay_parser.add_argument("--max-pages", type=int, default=1000)
+    replay_parser.add_argument("--output", type=Path)
+    replay_parser.add_argument("--baseline", type=Path)
+    replay_parser.add_argument("--tolerance", type=float, default=0.2)
+    replay_parser.add_argument("--repeat", type=int, default=1)
+    replay_parser.add_argument("--min-samples", type=int, default=20)
+    args = parser.parse_args()
+
+    corpus = args.corpus.resolve()
+    if args.command == "synthesize":
+        print(json.dumps(synthesize(corpus, args.pages, args.rendered_every, args.random_seed), ensure_ascii=False, indent=2))
+        return
+    with tempfile.TemporaryDirectory(prefix="regulation-benchmark-") as workdir:
+        configure_environment(Path(workdir), args.max_pages, offline=args.command == "replay")
+        if args.command == "record":
+            print(json.dumps(record(corpus, args.seeds or DEFAULT_SEEDS), ensure_ascii=False, indent=2))
+            return
+        result = replay(corpus, args.repeat)
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.output:
+        args.output.write_text(json.dumps(result, ensure_ascii=False, indent=2), encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        found = regressions(result, baseline, args.tolerance, args.min_samples)
+        if found:
+            print("Performans gerilemesi:", *found, sep="\n- ", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+from app.db import SessionLocal, init_db
+from app.services.response_cache import bump_generation
+from app.services.search_index import rebuild_search_index
+
+
+def main() -> None:
+    init_db()
+    with SessionLocal() as db:
+        indexed = rebuild_search_index(db)
+        bump_generation(db)
+        db.commit()
+    print({"indexed": indexed})
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import argparse
+
+from sqlalchemy import delete, exists, select
+
+from app.db import SessionLocal, init_db
+from app.models import Regulation, RegulationChunk
+from app.services.response_cache import bump_generation
+from app.services.vector_index import ChunkIndexer, VectorStore
+
+BATCH_SIZE = 200
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Madde chunk'larını ve vektör indeksini oluşturur veya bakımını yapar")
+    parser.add_argument("--reset", action="store_true", help="Tüm chunk ve vektörleri silip baştan embed eder")
+    parser.add_argument("--compact", action="store_true", help="Kullanılmayan vektör satırlarını dosyadan atar")
+    parser.add_argument("--train", action="store_true", help="IVF merkezlerini yeniden eğitir")
+    args = parser.parse_args()
+
+    init_db()
+    with SessionLocal() as db:
+        indexer = ChunkIndexer(db)
+        if args.reset:
+            db.execute(delete(RegulationChunk))
+            db.commit()
+            VectorStore().reset()
+
+        indexed = embedded = last_id = 0
+        while True:
+            stmt = (
+                select(Regulation.id, Regulation.content_markdown)
+                .where(
+                    Regulation.id > last_id,
+                    Regulation.duplicate_of_id.is_(None),
+                    Regulation.content_markdown.is_not(None),
+                    ~exists().where(RegulationChunk.regulation_id == Regulation.id),
+                )
+                .order_by(Regulation.id)
+                .limit(BATCH_SIZE)
+            )
+            documents = dict(db.execute(stmt).all())
+            if not documents:
+                break
+            embedded += indexer.index(documents)
+            indexed += len(documents)
+            last_id = max(documents)
+            db.commit()
+
+        dropped = indexer.compact() if args.compact else 0
+        clusters = indexer.train() if args.train else 0
+        bump_generation(db)
+        db.commit()
+    print({"indexed": indexed, "embedded": embedded, "compacted_rows": dropped, "clusters": clusters})
+
+
+if __name__ == "__main__":
+    main()
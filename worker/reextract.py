@@ -0,0 +1,19 @@
+import argparse
+
+from app.db import SessionLocal, init_db
+from app.services.scrape_pipeline import RegulationScrapePipeline
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Saklanan ham HTML'i ağa çıkmadan yeniden extract eder")
+    parser.add_argument("--limit", type=int, default=None)
+    args = parser.parse_args()
+
+    init_db()
+    with SessionLocal() as db:
+        result = RegulationScrapePipeline(db).reextract(limit=args.limit)
+    print(result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,22 @@
+import argparse
+import signal
+import sys
+
+from app.db import SessionLocal, init_db
+from app.services.crawl_cluster import DistributedCrawlWorker
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Frontier'ı host shard'larına göre paylaşan dağıtık crawl worker'ı")
+    parser.add_argument("--once", action="store_true", help="Sahiplenilecek URL kalmayınca çık")
+    parser.add_argument("--worker-id", default=None)
+    args = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    init_db()
+    with SessionLocal() as db:
+        DistributedCrawlWorker(db, worker_id=args.worker_id).run_forever(once=args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import argparse
+import signal
+import sys
+
+from app.config import settings
+from app.db import SessionLocal, init_db
+from app.services.crawl_cluster import CrawlResultWriter
+from app.services.storm_reader import StormUrlReader
+
+DEFAULT_SEEDS = [
+    "https://www.mevzuat.gov.tr/",
+]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Dağıtık crawl worker'larının sonuçlarını tek yazıcıdan veritabanına işler")
+    parser.add_argument("--seed", action="append", default=None, help="Başlangıçta keşfedilecek seed URL")
+    parser.add_argument("--no-seed", action="store_true", help="Seed keşfi ve Storm URL beslemesini atla")
+    parser.add_argument("--once", action="store_true", help="Sonuç kuyruğu boşalınca çık")
+    args = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    init_db()
+    with SessionLocal() as db:
+        writer = CrawlResultWriter(db)
+        if not args.no_seed:
+            storm_urls = StormUrlReader(settings.storm_discovered_urls_file).feed(writer.pipeline.frontier)
+            discovered = writer.pipeline.seed(args.seed or DEFAULT_SEEDS)
+            print({"storm_urls": storm_urls, "discovered": discovered})
+        writer.run_forever(once=args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ def main() -> None:
     init_db()
     with SessionLocal() as db:
         pipeline = RegulationScrapePipeline(db)
-        result = pipeline.run(DEFAULT_SEEDS)
+        result = pipeline.ingest(DEFAULT_SEEDS)
     print(result)
 
 
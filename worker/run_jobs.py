@@ -0,0 +1,22 @@
+import argparse
+import signal
+import sys
+
+from app.db import SessionLocal, init_db
+from app.services.jobs import JobWorker
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="ingest_jobs kuyruğundaki işleri sırayla çalıştırır")
+    parser.add_argument("--once", action="store_true", help="Kuyruk boşalınca çık")
+    parser.add_argument("--worker-id", default=None)
+    args = parser.parse_args()
+
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    init_db()
+    with SessionLocal() as db:
+        JobWorker(db, worker_id=args.worker_id).run_forever(once=args.once)
+
+
+if __name__ == "__main__":
+    main()